@@ -1,9 +1,16 @@
 from .discovery import Discovery
-from .ingestion import PyIngest
+from .ingestion import PyIngest, PyIngestAsync
 from .inputs import UserInput
 from .modeler import GraphDataModeler
 from .models import DataModel
 
-__all__ = ["Discovery", "GraphDataModeler", "PyIngest", "UserInput", "DataModel"]
+__all__ = [
+    "Discovery",
+    "GraphDataModeler",
+    "PyIngest",
+    "PyIngestAsync",
+    "UserInput",
+    "DataModel",
+]
 
 __version__ = "0.14.0"
@@ -1,3 +1,4 @@
+from .admin_import.admin_import_generator import AdminImportGenerator
 from .load_csv.load_csv_generator import LoadCSVCodeGenerator
 from .pyingest.pyingest_generator import PyIngestConfigGenerator
 from .standard.standard_cypher_generator import StandardCypherCodeGenerator
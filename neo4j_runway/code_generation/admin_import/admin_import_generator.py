@@ -0,0 +1,328 @@
+"""
+This file contains the code to generate neo4j-admin import files.
+"""
+
+import os
+from typing import List, Tuple
+
+import pandas as pd
+
+from ...exceptions import AdminImportGenerationError
+from ...ingestion.casting import cast_column
+from ...ingestion.pyingest import DataFrameSource, get_source_dataframe
+from ...models import DataModel
+from ...models.core import Node, Property, Relationship
+from ...resources.mappings import TYPES_MAP_PYTHON_TO_NEO4J_ADMIN_IMPORT
+from ...utils._utils.create_directory import create_directory
+from ..base import BaseCodeGenerator
+
+# joins the values of a composite node key into a single import ID
+ID_SEPARATOR = "|"
+
+
+class AdminImportGenerator(BaseCodeGenerator):
+    """
+    Class responsible for generating the node and relationship CSVs, header files and command for a neo4j-admin bulk import.
+    A bulk import writes a new database offline, so it is only suitable for initial loads into an empty database.
+
+    Attributes
+    ----------
+    data_model : DataModel
+        The data model to base ingestion code on.
+    dataframe : Union[pd.DataFrame, Mapping[str, pd.DataFrame], TableCollection]
+        The source data. Either a single DataFrame used for every source, a mapping of source file name to DataFrame, or a `TableCollection`.
+    file_output_directory : str, optional
+        The location that generated files should be saved to.
+    source_name : str, optional
+        The name of the data file. If more than one file is used, this arg should not be provided.
+        File names should be included within the data model.
+    import_directory : str, optional
+        The location of the generated files as seen by neo4j-admin, used in the import command.
+    database : str, optional
+        The name of the database to create.
+    array_delimiter : str, optional
+        The delimiter between the values of list properties.
+    """
+
+    def __init__(
+        self,
+        data_model: DataModel,
+        dataframe: DataFrameSource,
+        file_output_directory: str = "./",
+        source_name: str = "",
+        import_directory: str = "",
+        database: str = "neo4j",
+        array_delimiter: str = ";",
+    ):
+        """
+        Class responsible for generating the node and relationship CSVs, header files and command for a neo4j-admin bulk import.
+        Nodes are written once per node key, keeping the last row of a key as MERGE followed by SET would.
+        Relationships are written once per pair of nodes, and relationships whose nodes are missing are skipped on import.
+        Constraints are not created by neo4j-admin, so the constraints file should be run once the import completes.
+
+        Parameters
+        ----------
+        data_model : DataModel
+            The data model to base ingestion code on.
+        dataframe : Union[pd.DataFrame, Mapping[str, pd.DataFrame], TableCollection]
+            The source data. Either a single DataFrame used for every source, a mapping of source file name to DataFrame,
+            or a `TableCollection`. Each node and relationship is routed to the DataFrame matching its `source_name`.
+        file_output_directory : str, optional
+            The location that generated files should be saved to, by default "./"
+        source_name : str, optional
+            The name of the data file. If more than one file is used, this arg should not be provided.
+            File names should be included within the data model. By default = ""
+        import_directory : str, optional
+            The location of the generated files as seen by neo4j-admin, used in the import command.
+            If empty, then `file_output_directory` is used. By default ""
+        database : str, optional
+            The name of the database to create, by default "neo4j"
+        array_delimiter : str, optional
+            The delimiter between the values of list properties, by default ";"
+        """
+
+        super().__init__(
+            data_model=data_model,
+            file_output_directory=file_output_directory,
+            source_name=source_name,
+        )
+        self.dataframe = dataframe
+        self.import_dir = import_directory or self.file_output_dir
+        if not self.import_dir.endswith("/"):
+            self.import_dir += "/"
+        self.database = database
+        self.array_delimiter = array_delimiter
+
+    def _get_dataframe(self, source_name: str) -> pd.DataFrame:
+        return get_source_dataframe(
+            self.dataframe, self.source_name if self.source_name else source_name
+        )
+
+    def _get_node_file_name(self, node: Node) -> str:
+        return node.label.lower()
+
+    def _get_relationship_file_name(self, relationship: Relationship) -> str:
+        return (
+            f"{relationship.type}_{relationship.source}_{relationship.target}".lower()
+        )
+
+    def _get_header_field(self, prop: Property) -> str:
+        return f"{prop.name}:{TYPES_MAP_PYTHON_TO_NEO4J_ADMIN_IMPORT.get(prop.type, 'string')}"
+
+    def _format_column(
+        self, values: "pd.Series[object]", type: str
+    ) -> "pd.Series[object]":
+        if type in ("int", "float", "bool"):
+            # nulls would otherwise turn integer columns into decimals
+            return cast_column(values, type)
+        elif type.startswith("List"):
+            return values.map(
+                lambda v: self.array_delimiter.join(str(x) for x in v)
+                if isinstance(v, (list, tuple))
+                else v
+            )
+        return values
+
+    def _get_key_columns(
+        self, node: Node, use_alias: bool = False
+    ) -> List[Tuple[str, Property]]:
+        """
+        The (column, property) pairs identifying a node, as used by the MATCH clauses of the generated ingestion code.
+        """
+
+        if use_alias and (node.node_key_aliases or node.unique_property_aliases):
+            return [
+                (str(prop.alias), prop)
+                for prop in node.node_key_aliases or node.unique_property_aliases
+            ]
+
+        key_properties = node.node_keys or node.unique_properties
+        if not key_properties:
+            raise AdminImportGenerationError(
+                f"Node {node.label} has no unique properties or node keys to identify it in an import."
+            )
+        return [(prop.column_mapping, prop) for prop in key_properties]
+
+    def _get_ids(
+        self, dataframe: pd.DataFrame, key_columns: List[Tuple[str, Property]]
+    ) -> "pd.Series[str]":
+        """
+        Build the import ID of each row from its node key values. Rows with a missing key value get a null ID.
+        """
+
+        for column, _ in key_columns:
+            if column not in dataframe.columns:
+                raise AdminImportGenerationError(
+                    f"Column {column} is missing from the source data."
+                )
+
+        keys = pd.DataFrame(
+            {
+                column: self._format_column(dataframe[column], prop.type)
+                for column, prop in key_columns
+            }
+        )
+        values = [keys[column].astype(str) for column in keys.columns]
+        ids = (
+            values[0].str.cat(values[1:], sep=ID_SEPARATOR)
+            if len(values) > 1
+            else values[0]
+        )
+        return ids.where(keys.notna().all(axis=1))
+
+    def generate_node_dataframe(self, node: Node) -> pd.DataFrame:
+        """
+        Generate the import data of a node. Its column names are the fields of the header file.
+
+        Parameters
+        ----------
+        node : Node
+            The node.
+
+        Returns
+        -------
+        pd.DataFrame
+            The node data, with an ID column followed by a column for each property.
+        """
+
+        source = self._get_dataframe(node.source_name)
+        ids = self._get_ids(source, self._get_key_columns(node))
+
+        columns = {f":ID({node.label})": ids}
+        for prop in node.properties:
+            if prop.column_mapping in source.columns:
+                columns[self._get_header_field(prop)] = self._format_column(
+                    source[prop.column_mapping], prop.type
+                )
+
+        nodes = pd.DataFrame(columns)
+        return nodes[ids.notna()].drop_duplicates(
+            subset=f":ID({node.label})", keep="last"
+        )
+
+    def generate_relationship_dataframe(
+        self, relationship: Relationship
+    ) -> pd.DataFrame:
+        """
+        Generate the import data of a relationship. Its column names are the fields of the header file.
+
+        Parameters
+        ----------
+        relationship : Relationship
+            The relationship.
+
+        Returns
+        -------
+        pd.DataFrame
+            The relationship data, with start and end ID columns followed by a column for each property.
+        """
+
+        source_node = self.data_model.node_dict[relationship.source]
+        target_node = self.data_model.node_dict[relationship.target]
+        source_name = self.source_name if self.source_name else relationship.source_name
+
+        if source_node.label == target_node.label:
+            # the target of a relationship between nodes of the same label is found by the alias
+            use_source_alias, use_target_alias = False, True
+        else:
+            use_source_alias = source_name != source_node.source_name
+            use_target_alias = source_name != target_node.source_name
+
+        source = self._get_dataframe(relationship.source_name)
+        start_ids = self._get_ids(
+            source, self._get_key_columns(source_node, use_alias=use_source_alias)
+        )
+        end_ids = self._get_ids(
+            source, self._get_key_columns(target_node, use_alias=use_target_alias)
+        )
+
+        columns = {
+            f":START_ID({source_node.label})": start_ids,
+            f":END_ID({target_node.label})": end_ids,
+        }
+        for prop in relationship.properties:
+            if prop.column_mapping in source.columns:
+                columns[self._get_header_field(prop)] = self._format_column(
+                    source[prop.column_mapping], prop.type
+                )
+
+        relationships = pd.DataFrame(columns)
+        return relationships[start_ids.notna() & end_ids.notna()].drop_duplicates(
+            subset=list(columns)[:2], keep="last"
+        )
+
+    def _write_import_file(self, dataframe: pd.DataFrame, file_name: str) -> None:
+        create_directory(self.file_output_dir + file_name)
+
+        # the header is kept in its own file so the data file can be split or compressed independently
+        with open(f"{self.file_output_dir}{file_name}_header.csv", "w") as header:
+            header.write(",".join(dataframe.columns) + "\n")
+        dataframe.to_csv(
+            f"{self.file_output_dir}{file_name}.csv", header=False, index=False
+        )
+
+    def generate_import_files(self) -> None:
+        """
+        Generate the node and relationship CSVs and their header files.
+        """
+
+        for node in self.data_model.nodes:
+            self._write_import_file(
+                self.generate_node_dataframe(node), self._get_node_file_name(node)
+            )
+
+        for relationship in self.data_model.relationships:
+            self._write_import_file(
+                self.generate_relationship_dataframe(relationship),
+                self._get_relationship_file_name(relationship),
+            )
+
+    def generate_import_command_file(self, file_name: str = "import.sh") -> None:
+        """
+        Generate a shell script containing the neo4j-admin import command.
+
+        Parameters
+        ----------
+        file_name : str, optional
+            Name of the file, by default "import.sh"
+        """
+
+        create_directory(self.file_output_dir + file_name)
+
+        with open(f"{self.file_output_dir}{file_name}", "w") as command:
+            command.write(self.generate_import_command_string())
+        os.chmod(f"{self.file_output_dir}{file_name}", 0o755)
+
+    def generate_import_command_string(self) -> str:
+        """
+        Generate the neo4j-admin import command for the generated files.
+
+        Returns
+        -------
+        str
+            The command in String format.
+        """
+
+        arguments: List[str] = list()
+        for node in self.data_model.nodes:
+            file_name = f"{self.import_dir}{self._get_node_file_name(node)}"
+            arguments.append(
+                f"--nodes={node.label}={file_name}_header.csv,{file_name}.csv"
+            )
+
+        for relationship in self.data_model.relationships:
+            file_name = (
+                f"{self.import_dir}{self._get_relationship_file_name(relationship)}"
+            )
+            arguments.append(
+                f"--relationships={relationship.type}={file_name}_header.csv,{file_name}.csv"
+            )
+
+        arguments += [
+            f'--array-delimiter="{self.array_delimiter}"',
+            # like the MATCH clauses of the ingestion code, relationships to missing nodes are skipped
+            "--skip-bad-relationships=true",
+            self.database,
+        ]
+
+        return " \\\n    ".join(["neo4j-admin database import full", *arguments]) + "\n"
@@ -3,11 +3,15 @@ This file contains the base conde generator class. All code generation classes m
 """
 
 import os
+import warnings
 from abc import ABC
-from typing import Any, Dict
+from typing import Any, Dict, List
 
 import yaml
 
+from ..database.neo4j import Neo4jGraph
+from ..exceptions import PlanVerificationError
+from ..ingestion.estimation import get_scan_operators
 from ..models import DataModel
 from ..utils._utils.create_directory import create_directory
 from .cypher import *
@@ -45,6 +49,7 @@ class BaseCodeGenerator(ABC):
         file_output_directory: str = "./",
         source_name: str = "",
         strict_typing: bool = True,
+        client_side_typing: bool = False,
     ):
         """
         This is the base class for code generation. All code generation classes must inherit from this class.
@@ -62,6 +67,9 @@ class BaseCodeGenerator(ABC):
             File names should be included within the data model. By default = ""
         strict_typing : bool, optional
             Whether to use the types declared in the data model (True), or infer types during ingestion (False). By default True
+        client_side_typing : bool, optional
+            Whether values of the types Runway ingest casts before sending are referenced without conversion functions.
+            Other types, such as Point, are still converted in the Cypher. By default False
         """
 
         self.data_model: DataModel = data_model
@@ -71,15 +79,20 @@ class BaseCodeGenerator(ABC):
         self.file_output_dir = file_output_directory
         self.source_name = source_name
         self.strict_typing = strict_typing
+        self.client_side_typing = client_side_typing
 
         self._constraints: Dict[str, str] = dict()
         self._cypher: Dict[str, Dict[str, Any]] = dict()
 
-        self._generate_base_cypher(strict_typing=self.strict_typing)
+        self._generate_base_cypher(
+            strict_typing=self.strict_typing,
+            client_side_typing=self.client_side_typing,
+        )
 
     def _generate_base_cypher(
         self,
         strict_typing: bool = True,
+        client_side_typing: bool = False,
     ) -> None:
         for node in self.data_model.nodes:
             if len(node.unique_properties_column_mapping) > 0:
@@ -106,7 +119,9 @@ class BaseCodeGenerator(ABC):
             self._cypher[node.label] = {
                 "cypher": literal_unicode(
                     generate_merge_node_clause_standard(
-                        node=node, strict_typing=strict_typing
+                        node=node,
+                        strict_typing=strict_typing,
+                        client_side_typing=client_side_typing,
                     )
                 ),
                 "csv": f"$BASE/{self.file_dir}{node.source_name if self.source_name == '' else self.source_name}",
@@ -144,11 +159,66 @@ class BaseCodeGenerator(ABC):
                         source_node=source,
                         target_node=target,
                         strict_typing=strict_typing,
+                        client_side_typing=client_side_typing,
                     )
                 ),
                 "csv": f"$BASE/{self.file_dir}{rel.source_name if self.source_name == '' else self.source_name}",
             }
 
+    def verify_plans(
+        self, graph: Neo4jGraph, strict: bool = True
+    ) -> Dict[str, List[str]]:
+        """
+        Plan each generated ingestion statement with EXPLAIN against a database and check that it finds nodes through an index.
+        A statement that matches or merges on a property without a constraint or index falls back to scanning
+        every node of the label, or every node, for each row, so its load time grows with the size of the graph.
+        Nothing is written, but the plans depend on the schema of the database, so create the constraints first.
+
+        Parameters
+        ----------
+        graph : Neo4jGraph
+            The database to plan the statements against.
+        strict : bool, optional
+            Whether to raise an error (True) or a warning (False) when a statement scans nodes. By default True
+
+        Returns
+        -------
+        Dict[str, List[str]]
+            The scan operators, such as "NodeByLabelScan", of each statement that scans nodes, keyed by node label
+            or `TYPE_SOURCE_TARGET` for relationships. Empty if every statement seeks an index.
+
+        Raises
+        ------
+        PlanVerificationError
+            If `strict` and any statement scans nodes.
+        """
+
+        scans: Dict[str, List[str]] = dict()
+        with graph.driver.session(database=graph.database) as session:
+            for key, cypher in self._cypher.items():
+                plan = (
+                    session.run("EXPLAIN " + cypher["cypher"], dict={"rows": []})
+                    .consume()
+                    .plan
+                )
+                scan_operators = get_scan_operators(plan)
+                if scan_operators:
+                    scans[key] = scan_operators
+
+        if scans:
+            message = (
+                "The following statements scan nodes instead of seeking an index. "
+                "Check that the constraints exist in the database and that aliased columns match on unique properties. "
+                + ", ".join(
+                    f"{key}: {', '.join(operators)}" for key, operators in scans.items()
+                )
+            )
+            if strict:
+                raise PlanVerificationError(message)
+            warnings.warn(message)
+
+        return scans
+
     def generate_cypher_file(self, file_name: str = "ingest_code.cypher") -> None:
         """
         Generate a .cypher file containing the generated ingestion code.
@@ -5,21 +5,26 @@ This file contains the functions to create MATCH, MERGE and SET queries.
 from typing import List, Optional
 
 from ...exceptions import LoadCSVCypherGenerationError
+from ...ingestion.casting import is_client_side_type
 from ...models import Node, Property, Relationship
 
 
-def generate_match_node_clause(node: Node, use_alias: bool = False) -> str:
+def generate_match_node_clause(
+    node: Node, use_alias: bool = False, client_side_typing: bool = False
+) -> str:
     """
     Generate a MATCH node clause.
     """
 
     if use_alias and (node.node_key_aliases or node.unique_property_aliases):
         set_clause = generate_set_unique_property_aliases(
-            node.node_key_aliases or node.unique_property_aliases
+            node.node_key_aliases or node.unique_property_aliases,
+            client_side_typing=client_side_typing,
         )
     else:
         set_clause = generate_set_unique_property(
-            node.node_keys or node.unique_properties
+            node.node_keys or node.unique_properties,
+            client_side_typing=client_side_typing,
         )
 
     return "MATCH (n:" + node.label + " {" + f"{set_clause}" + "})"
@@ -45,7 +50,9 @@ MATCH (target:{node.label} {to_unique})"""
 
 
 def generate_set_property(
-    properties: List[Property], strict_typing: bool = True
+    properties: List[Property],
+    strict_typing: bool = True,
+    client_side_typing: bool = False,
 ) -> str:
     """
     Generate a set property string.
@@ -54,7 +61,9 @@ def generate_set_property(
     temp_set_list = []
 
     for prop in properties:
-        temp_set_list.append(f"n.{prop.name} = {cast_value(prop, strict_typing)}")
+        temp_set_list.append(
+            f"n.{prop.name} = {cast_value(prop, strict_typing, client_side_typing=client_side_typing)}"
+        )
 
     result = ", ".join(temp_set_list)
 
@@ -65,7 +74,9 @@ def generate_set_property(
 
 
 def generate_set_unique_property(
-    unique_properties: List[Property], strict_typing: bool = True
+    unique_properties: List[Property],
+    strict_typing: bool = True,
+    client_side_typing: bool = False,
 ) -> str:
     """
     Generate the unique properties to match a node on within a MERGE statement.
@@ -73,13 +84,16 @@ def generate_set_unique_property(
     """
 
     res = [
-        f"{prop.name}: {cast_value(prop, strict_typing)}" for prop in unique_properties
+        f"{prop.name}: {cast_value(prop, strict_typing, client_side_typing=client_side_typing)}"
+        for prop in unique_properties
     ]
     return ", ".join(res)
 
 
 def generate_set_unique_property_aliases(
-    unique_properties: List[Property], strict_typing: bool = True
+    unique_properties: List[Property],
+    strict_typing: bool = True,
+    client_side_typing: bool = False,
 ) -> str:
     """
     Generate the unique properties to match a node on within a MERGE statement.
@@ -88,21 +102,23 @@ def generate_set_unique_property_aliases(
     """
 
     res = [
-        f"{prop.name}: {cast_value(prop, strict_typing, use_alias=True)}"
+        f"{prop.name}: {cast_value(prop, strict_typing, use_alias=True, client_side_typing=client_side_typing)}"
         for prop in unique_properties
     ]
     return ", ".join(res)
 
 
-def generate_merge_node_clause_standard(node: Node, strict_typing: bool = True) -> str:
+def generate_merge_node_clause_standard(
+    node: Node, strict_typing: bool = True, client_side_typing: bool = False
+) -> str:
     """
     Generate a MERGE node clause.
     """
 
     return f"""WITH $dict.rows AS rows
 UNWIND rows AS row
-MERGE (n:{node.label} {{{generate_set_unique_property(node.node_keys or node.unique_properties, strict_typing)}}})
-{generate_set_property(node.nonidentifying_properties, strict_typing)}"""
+MERGE (n:{node.label} {{{generate_set_unique_property(node.node_keys or node.unique_properties, strict_typing, client_side_typing)}}})
+{generate_set_property(node.nonidentifying_properties, strict_typing, client_side_typing)}"""
 
 
 def generate_merge_node_load_csv_clause(
@@ -147,6 +163,7 @@ def generate_merge_relationship_clause_standard(
     source_node: Node,
     target_node: Node,
     strict_typing: bool = True,
+    client_side_typing: bool = False,
 ) -> str:
     """
     Generate a MERGE relationship clause.
@@ -164,14 +181,14 @@ def generate_merge_relationship_clause_standard(
 UNWIND rows as row
 {generate_match_same_node_labels_clause(node=source_node)}
 MERGE (source)-[n:{relationship.type}]->(target)
-{generate_set_property(relationship.nonidentifying_properties, strict_typing)}"""
+{generate_set_property(relationship.nonidentifying_properties, strict_typing, client_side_typing)}"""
     else:
         return f"""WITH $dict.rows AS rows
 UNWIND rows as row
-{generate_match_node_clause(source_node, use_alias=use_source_alias).replace('(n:', '(source:')}
-{generate_match_node_clause(target_node, use_alias=use_target_alias).replace('(n:', '(target:')}
+{generate_match_node_clause(source_node, use_alias=use_source_alias, client_side_typing=client_side_typing).replace('(n:', '(source:')}
+{generate_match_node_clause(target_node, use_alias=use_target_alias, client_side_typing=client_side_typing).replace('(n:', '(target:')}
 MERGE (source)-[n:{relationship.type}]->(target)
-{generate_set_property(relationship.nonidentifying_properties, strict_typing)}"""
+{generate_set_property(relationship.nonidentifying_properties, strict_typing, client_side_typing)}"""
 
 
 def generate_merge_relationship_load_csv_clause(
@@ -222,10 +239,14 @@ CALL {{
 
 
 def cast_value(
-    prop: Property, strict_typing: bool = True, use_alias: bool = False
+    prop: Property,
+    strict_typing: bool = True,
+    use_alias: bool = False,
+    client_side_typing: bool = False,
 ) -> str:
     """
     format property to be cast to correct type during ingestion.
+    If `client_side_typing`, then types that Runway ingest casts before sending are not converted again.
     """
 
     # take the first val as this is the identifying column
@@ -247,7 +268,7 @@ def cast_value(
 
     base = f"row.{column_mapping}"
 
-    if not strict_typing:
+    if not strict_typing or (client_side_typing and is_client_side_type(prop.type)):
         return base
 
     if prop.type.lower().endswith("date"):
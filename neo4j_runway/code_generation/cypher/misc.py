@@ -5,32 +5,35 @@ This file contains misc functions for Cypher generation.
 from typing import List, Union
 
 
-def format_pyingest_pre_or_post_ingest_code(data: Union[str, List[str], None]) -> str:
+def get_pyingest_pre_or_post_ingest_statements(
+    data: Union[str, List[str], None],
+) -> List[str]:
     """
-    Format the given post ingest code into a String to be injected into the
-    PyIngest yaml file.
+    Split the given pre or post ingest code into its statements.
+    The code may be a String of statements separated by `;`, a filepath to a .cypher or .cql file, or a list of statements.
     """
 
     if isinstance(data, str) and ".cypher" not in data and ".cql" not in data:
-        res = ""
-        for cql in data.split(";")[:-1]:
-            cql_formatted = cql.lstrip().replace("\n", "\n    ")
-            res += f"  - {cql_formatted}\n"
-        return res
+        return data.split(";")[:-1]
     elif isinstance(data, str) and (".cypher" in data or ".cql" in data):
         with open(data, "r") as f:
             cql_file = f.read()
-        res = ""
-        for cql in cql_file.split(";")[:-1]:
-            cql_formatted = cql.lstrip().replace("\n", "\n    ")
-            res += f"  - {cql_formatted}\n"
-        return res
+        return cql_file.split(";")[:-1]
 
     elif isinstance(data, list):
-        res = ""
-        for cql in data:
-            cql_formatted = cql.lstrip().replace("\n", "\n    ")
-            res += f"  - {cql_formatted}\n"
-        return res
+        return data
     else:
         raise ValueError(f"Unable to parse ingest code. data: {data}")
+
+
+def format_pyingest_pre_or_post_ingest_code(data: Union[str, List[str], None]) -> str:
+    """
+    Format the given post ingest code into a String to be injected into the
+    PyIngest yaml file.
+    """
+
+    res = ""
+    for cql in get_pyingest_pre_or_post_ingest_statements(data):
+        cql_formatted = cql.lstrip().replace("\n", "\n    ")
+        res += f"  - {cql_formatted}\n"
+    return res
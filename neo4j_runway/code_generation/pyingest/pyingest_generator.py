@@ -7,10 +7,20 @@ from typing import Any, Dict, List, Optional, Union
 
 import yaml
 
+from ...ingestion.casting import get_column_types
+from ...ingestion.conversion import get_referenced_columns
+from ...ingestion.indexes import (
+    get_await_indexes_cql,
+    get_lookup_keys,
+    split_index_statements,
+)
 from ...models.core import DataModel
 from ...utils._utils.create_directory import create_directory
 from ..base import BaseCodeGenerator
-from ..cypher import format_pyingest_pre_or_post_ingest_code
+from ..cypher import (
+    format_pyingest_pre_or_post_ingest_code,
+    get_pyingest_pre_or_post_ingest_statements,
+)
 
 
 class PyIngestConfigGenerator(BaseCodeGenerator):
@@ -30,6 +40,9 @@ class PyIngestConfigGenerator(BaseCodeGenerator):
         File names should be included within the data model.
     strict_typing : bool, optional
         Whether to use the types declared in the data model (True), or infer types during ingestion (False).
+    client_side_typing : bool, optional
+        Whether Runway ingest casts the columns to the types declared in the data model before sending them (True),
+        or the Cypher casts each value with conversion functions (False). Only applies when `strict_typing` is True.
     username : Union[str, None], optional
         The Neo4j username. Providing credentials here will write them into the configuration. Use with caution!
     password : Union[str, None], optional
@@ -49,6 +62,8 @@ class PyIngestConfigGenerator(BaseCodeGenerator):
         Code to be run before data is ingested. This should include any constraints or indexes that will not be auto-generated by Runway.
     post_ingest_code : Union[str, List[str], None], optional
         Code to be run after all data is ingested.
+    defer_indexes : bool, optional
+        Whether the secondary indexes of `pre_ingest_code` are moved to `post_ingest`, to be built once the data is loaded.
     """
 
     def __init__(
@@ -58,6 +73,7 @@ class PyIngestConfigGenerator(BaseCodeGenerator):
         file_output_directory: str = "./",
         source_name: str = "",
         strict_typing: bool = True,
+        client_side_typing: bool = False,
         username: Optional[str] = None,
         password: Optional[str] = None,
         uri: Optional[str] = None,
@@ -67,6 +83,7 @@ class PyIngestConfigGenerator(BaseCodeGenerator):
         pyingest_file_config: Dict[str, Any] = dict(),
         pre_ingest_code: Optional[Union[str, List[str]]] = None,
         post_ingest_code: Optional[Union[str, List[str]]] = None,
+        defer_indexes: bool = False,
     ):
         """
         Class responsible for generating the PyIngest config yaml. Output is compatible with Runway ingest as well as
@@ -85,6 +102,11 @@ class PyIngestConfigGenerator(BaseCodeGenerator):
             CSV file names should be included within the data model. By default = ""
         strict_typing : bool, optional
             Whether to use the types declared in the data model (True), or infer types during ingestion (False). By default True
+        client_side_typing : bool, optional
+            Whether Runway ingest casts the columns to the types declared in the data model before sending them (True),
+            or the Cypher casts each value with conversion functions (False). If True, the Cypher references `row.<column>` directly
+            for int, float, bool and temporal properties, still converts Point and Duration properties,
+            and each file entry declares its `column_types`. Only applies when `strict_typing` is True. By default False
         username : Union[str, None], optional
             The Neo4j username. Providing credentials here will write them into the configuration. Use with caution! By default None
         password : Union[str, None], optional
@@ -108,6 +130,11 @@ class PyIngestConfigGenerator(BaseCodeGenerator):
             Code to be run before data is ingested. This should include any constraints or indexes that will not be auto-generated by Runway. By default = None
         post_ingest_code : Union[str, List[str], None], optional
             Code to be run after all data is ingested. By default = None
+        defer_indexes : bool, optional
+            Whether the secondary indexes of `pre_ingest_code`, such as range, text and full text indexes, are moved to the start of `post_ingest`,
+            as maintaining them slows a load down. Constraints, and indexes on the label and property pairs the generated statements look nodes up by, stay in `pre_ingest`, as MERGE and MATCH seek through them,
+            followed by a `db.awaitIndexes` call so they are online before data arrives. The moved indexes are followed by another `db.awaitIndexes` call.
+            Runway ingest with `defer_indexes` builds the indexes in parallel. By default = False
 
         """
         super().__init__(
@@ -116,7 +143,10 @@ class PyIngestConfigGenerator(BaseCodeGenerator):
             file_output_directory=file_output_directory,
             source_name=source_name,
             strict_typing=strict_typing,
+            # values of the types cast before sending need no conversion functions
+            client_side_typing=strict_typing and client_side_typing,
         )
+        self.client_side_typing = client_side_typing
         self.username: Union[str, None] = username
         self.password: Union[str, None] = password
         self.uri: Union[str, None] = uri
@@ -126,6 +156,7 @@ class PyIngestConfigGenerator(BaseCodeGenerator):
         self.pyingest_file_config = pyingest_file_config
         self.pre_ingest_code = pre_ingest_code
         self.post_ingest_code = post_ingest_code
+        self.defer_indexes = defer_indexes
 
         self._config_files_list = list()
 
@@ -136,6 +167,12 @@ class PyIngestConfigGenerator(BaseCodeGenerator):
                 for k, v in self.pyingest_file_config.items()
             }
 
+        column_types = (
+            get_column_types(self.data_model)
+            if self.strict_typing and self.client_side_typing
+            else dict()
+        )
+
         # add config params to files
         for item in self._cypher:
             file_dict = dict()
@@ -143,6 +180,13 @@ class PyIngestConfigGenerator(BaseCodeGenerator):
                 file_dict["url"] = self._cypher[item]["csv"]
                 file_dict["cql"] = self._cypher[item]["cypher"]
 
+                if column_types:
+                    file_dict["column_types"] = {
+                        column: column_types[column]
+                        for column in get_referenced_columns(file_dict["cql"]) or list()
+                        if column in column_types
+                    }
+
                 # set globals
                 file_dict["chunk_size"] = self.global_batch_size
                 if self.global_field_separator:
@@ -233,19 +277,47 @@ class PyIngestConfigGenerator(BaseCodeGenerator):
             + "basepath: ./\n\n"
             + "pre_ingest:\n"
         )
-        if self.pre_ingest_code:
-            pre_ingest_code_string = format_pyingest_pre_or_post_ingest_code(
-                data=self.pre_ingest_code
+        pre_ingest_statements = (
+            get_pyingest_pre_or_post_ingest_statements(data=self.pre_ingest_code)
+            if self.pre_ingest_code
+            else list()
+        )
+        post_ingest_statements = (
+            get_pyingest_pre_or_post_ingest_statements(data=self.post_ingest_code)
+            if self.post_ingest_code
+            else list()
+        )
+        if self.defer_indexes:
+            deferred_indexes, pre_ingest_statements = split_index_statements(
+                pre_ingest_statements,
+                lookup_keys=get_lookup_keys(
+                    [cypher["cypher"] for cypher in self._cypher.values()]
+                ),
+            )
+            if deferred_indexes:
+                post_ingest_statements = [
+                    *deferred_indexes,
+                    get_await_indexes_cql(),
+                    *post_ingest_statements,
+                ]
+
+        if pre_ingest_statements:
+            to_return += format_pyingest_pre_or_post_ingest_code(
+                data=pre_ingest_statements
             )
-            to_return += pre_ingest_code_string
 
         for constraint in self._constraints:
             to_return += f"  - {self._constraints[constraint]}"
+        if self.defer_indexes:
+            # constraints must be online before MERGE and MATCH can use them
+            to_return += format_pyingest_pre_or_post_ingest_code(
+                data=[get_await_indexes_cql()]
+            )
         to_return += config_dump
 
-        if self.post_ingest_code:
+        if post_ingest_statements:
             post_ingest_code_string = format_pyingest_pre_or_post_ingest_code(
-                data=self.post_ingest_code
+                data=post_ingest_statements
             )
             to_return += "\npost_ingest:\n" + post_ingest_code_string
 
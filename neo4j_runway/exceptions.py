@@ -61,6 +61,18 @@ class LoadCSVCypherGenerationError(RunwayError):
     pass
 
 
+class AdminImportGenerationError(RunwayError):
+    """Exception raised when neo4j-admin import files can not be constructed from the data model and source data."""
+
+    pass
+
+
+class PlanVerificationError(RunwayError):
+    """Exception raised when generated ingestion code scans nodes instead of seeking them through an index."""
+
+    pass
+
+
 class PandasDataSummariesNotGeneratedError(RunwayError):
     """Exception raised when the Discovery class 'run' method is ran and Pandas data summaries are not generated."""
 
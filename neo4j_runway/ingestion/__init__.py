@@ -1,3 +1,17 @@
-from .pyingest import PyIngest
+from .estimation import IngestionEstimate, StatementEstimate
+from .metrics import BatchMetrics, IngestionMetrics, StatementMetrics
+from .options import IngestOptions
+from .pyingest import Ingestor, PyIngest
+from .pyingest_async import PyIngestAsync
 
-__all__ = ["PyIngest"]
+__all__ = [
+    "BatchMetrics",
+    "IngestionEstimate",
+    "IngestionMetrics",
+    "IngestOptions",
+    "Ingestor",
+    "PyIngest",
+    "PyIngestAsync",
+    "StatementEstimate",
+    "StatementMetrics",
+]
@@ -0,0 +1,160 @@
+"""
+This file contains the classes used by PyIngest to adapt chunk sizes to measured transaction latency.
+"""
+
+import json
+import os
+import threading
+from typing import Dict, Optional
+
+from neo4j import ResultSummary
+
+
+def get_transaction_latency(summary: ResultSummary, wall_clock_seconds: float) -> float:
+    """
+    The latency of a chunk transaction in seconds.
+    Uses the server timings of the `ResultSummary` if available, otherwise the measured wall clock time.
+    """
+
+    if summary.result_available_after is None and summary.result_consumed_after is None:
+        return wall_clock_seconds
+
+    return (
+        (summary.result_available_after or 0) + (summary.result_consumed_after or 0)
+    ) / 1000
+
+
+class AdaptiveChunkSizer:
+    """
+    Grows or shrinks the chunk size of a statement toward a target transaction latency,
+    while keeping the memory of a single chunk below a ceiling.
+
+    Attributes
+    ----------
+    chunk_size : int
+        The chunk size to use for the next chunk.
+    target_latency : float
+        The desired transaction latency in seconds.
+    min_chunk_size : int
+        The smallest chunk size allowed.
+    max_chunk_size : int
+        The largest chunk size allowed.
+    max_chunk_memory : Optional[int]
+        The maximum memory in bytes a single chunk may use. If None, memory is not considered.
+    max_growth : float
+        The largest factor the chunk size may grow or shrink by in a single step.
+    """
+
+    def __init__(
+        self,
+        chunk_size: int,
+        target_latency: float = 1.0,
+        min_chunk_size: int = 10,
+        max_chunk_size: int = 100_000,
+        max_chunk_memory: Optional[int] = None,
+        max_growth: float = 2.0,
+    ) -> None:
+        """
+        Grows or shrinks the chunk size of a statement toward a target transaction latency.
+
+        Parameters
+        ----------
+        chunk_size : int
+            The initial chunk size.
+        target_latency : float, optional
+            The desired transaction latency in seconds, by default 1.0
+        min_chunk_size : int, optional
+            The smallest chunk size allowed, by default 10
+        max_chunk_size : int, optional
+            The largest chunk size allowed, by default 100_000
+        max_chunk_memory : Optional[int], optional
+            The maximum memory in bytes a single chunk may use. If None, memory is not considered. By default None
+        max_growth : float, optional
+            The largest factor the chunk size may grow or shrink by in a single step, by default 2.0
+        """
+
+        self.target_latency = target_latency
+        self.min_chunk_size = min_chunk_size
+        self.max_chunk_size = max_chunk_size
+        self.max_chunk_memory = max_chunk_memory
+        self.max_growth = max_growth
+        self.chunk_size = self._clamp(chunk_size)
+
+    def _clamp(self, chunk_size: float) -> int:
+        return int(max(self.min_chunk_size, min(self.max_chunk_size, chunk_size)))
+
+    def get_chunk_size(self) -> int:
+        return self.chunk_size
+
+    def update(self, rows: int, latency: float, memory: Optional[int] = None) -> int:
+        """
+        Update the chunk size from the measurements of a completed chunk.
+
+        Parameters
+        ----------
+        rows : int
+            The number of rows in the chunk.
+        latency : float
+            The transaction latency of the chunk in seconds.
+        memory : Optional[int], optional
+            The memory in bytes used by the chunk, by default None
+
+        Returns
+        -------
+        int
+            The chunk size to use for the next chunk.
+        """
+
+        if rows <= 0:
+            return self.chunk_size
+
+        # scale from the per row latency, so a short final chunk is not mistaken for a fast one
+        ideal_chunk_size = rows * self.target_latency / max(latency, 1e-3)
+        new_chunk_size = max(
+            self.chunk_size / self.max_growth,
+            min(self.chunk_size * self.max_growth, ideal_chunk_size),
+        )
+
+        if self.max_chunk_memory is not None and memory:
+            new_chunk_size = min(new_chunk_size, rows * self.max_chunk_memory / memory)
+
+        self.chunk_size = self._clamp(new_chunk_size)
+
+        return self.chunk_size
+
+
+class ChunkSizeCache:
+    """
+    A JSON file recording the chunk size chosen for each statement, so later runs can start from it.
+    Safe to use from multiple threads.
+
+    Attributes
+    ----------
+    file_path : str
+        The location of the JSON file.
+    """
+
+    def __init__(self, file_path: str) -> None:
+        self.file_path = file_path
+        self._lock = threading.Lock()
+        self._sizes: Dict[str, int] = dict()
+
+        if os.path.exists(file_path):
+            with open(file_path, "r") as f:
+                self._sizes = json.load(f)
+
+    def get(self, key: str) -> Optional[int]:
+        with self._lock:
+            return self._sizes.get(key)
+
+    def set(self, key: str, chunk_size: int) -> None:
+        """
+        Record the chunk size for a statement and write the cache to disk.
+        """
+
+        with self._lock:
+            self._sizes[key] = chunk_size
+            temp_file_path = f"{self.file_path}.tmp"
+            with open(temp_file_path, "w") as f:
+                json.dump(self._sizes, f, indent=2)
+            os.replace(temp_file_path, self.file_path)
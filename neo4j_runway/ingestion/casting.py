@@ -0,0 +1,220 @@
+"""
+This file contains the client side casting of source columns used by PyIngest.
+Columns are cast to the property types declared in a `DataModel` with vectorized Pandas operations before they are sent,
+so the ingestion Cypher can reference `row.<column>` directly instead of wrapping each value in a conversion function.
+"""
+
+import datetime
+from typing import Callable, Dict, Optional, TypeVar
+
+import numpy as np
+import pandas as pd
+
+from ..models import DataModel
+
+BOOLEAN_STRINGS = {"true": True, "false": False}
+
+# integer strings are parsed exactly, as going through float64 loses precision past 2**53
+INTEGER_PATTERN = r"[+-]?\d+"
+
+T = TypeVar("T")
+
+# types cast by `cast_column`, matched on the end of the lower case type
+CLIENT_SIDE_TYPES = ("date", "datetime", "time", "int", "float", "bool")
+
+# types left to the conversion functions of the Cypher, checked first as "point" ends with "int"
+SERVER_SIDE_TYPES = ("point", "duration")
+
+
+def is_client_side_type(type: str) -> bool:
+    """
+    Whether columns of a property type are cast by `cast_column`, rather than by the conversion functions of the Cypher.
+    """
+
+    type = type.lower()
+    return not type.endswith(SERVER_SIDE_TYPES) and type.endswith(CLIENT_SIDE_TYPES)
+
+
+def get_column_types(data_model: DataModel) -> Dict[str, str]:
+    """
+    Map each source column of a data model to the type of the property it is mapped to.
+    A property's alias is mapped to the same type as its column.
+
+    Parameters
+    ----------
+    data_model : DataModel
+        The data model.
+
+    Returns
+    -------
+    Dict[str, str]
+        The type of each column, as declared on its `Property`.
+    """
+
+    column_types: Dict[str, str] = dict()
+    properties = [prop for node in data_model.nodes for prop in node.properties] + [
+        prop for rel in data_model.relationships for prop in rel.properties
+    ]
+    for prop in properties:
+        column_types[prop.column_mapping] = prop.type
+        if prop.alias:
+            column_types[prop.alias] = prop.type
+
+    return column_types
+
+
+def _parse_timestamp(value: str) -> datetime.datetime:
+    # the formats other than ISO 8601, such as "Jan 2 2020"
+    timestamp = pd.Timestamp(value)
+    if pd.isna(timestamp):
+        raise ValueError(f"{value} is not a timestamp.")
+    parsed: datetime.datetime = timestamp.to_pydatetime()
+    return parsed
+
+
+def _parse_date(value: str) -> datetime.date:
+    try:
+        return datetime.date.fromisoformat(value)
+    except ValueError:
+        return _parse_timestamp(value).date()
+
+
+def _parse_datetime(value: str) -> datetime.datetime:
+    try:
+        parsed = datetime.datetime.fromisoformat(value)
+    except ValueError:
+        parsed = _parse_timestamp(value)
+    if parsed.tzinfo is None:
+        return parsed.replace(tzinfo=datetime.timezone.utc)
+    return parsed
+
+
+def _parse_time(value: str) -> datetime.time:
+    try:
+        parsed = datetime.time.fromisoformat(value)
+    except ValueError:
+        parsed = _parse_timestamp(value).timetz()
+    if parsed.tzinfo is None:
+        return parsed.replace(tzinfo=datetime.timezone.utc)
+    return parsed
+
+
+def _parse_temporal(
+    values: "pd.Series[object]", parse: Callable[[str], T]
+) -> "pd.Series[object]":
+    """
+    Parse each distinct value of a column once. The Python temporal types keep the offset of each value
+    and the dates outside of the nanosecond range of Pandas, which `pd.to_datetime` would not.
+    """
+
+    def try_parse(value: object) -> Optional[T]:
+        try:
+            return parse(str(value).strip())
+        except (ValueError, OverflowError):
+            return None
+
+    parsed = {value: try_parse(value) for value in values.dropna().unique()}
+    return values.map(parsed, na_action="ignore").astype(object)
+
+
+def _cast_integer(values: "pd.Series[object]") -> "pd.Series[object]":
+    if pd.api.types.is_float_dtype(values):
+        # toIntegerOrNull truncates decimal values
+        return np.trunc(values.astype("Float64")).astype("Int64")
+
+    strings = values.astype("string").str.strip()
+    is_integer = strings.str.fullmatch(INTEGER_PATTERN).fillna(False).astype(bool)
+    integers = pd.to_numeric(strings.where(is_integer), errors="coerce").astype("Int64")
+    if is_integer.all():
+        return integers
+
+    # only the values with a decimal part go through float
+    decimals = np.trunc(
+        pd.to_numeric(strings.where(~is_integer), errors="coerce").astype("Float64")
+    ).astype("Int64")
+    return integers.where(is_integer, decimals)
+
+
+def cast_column(values: "pd.Series[object]", type: str) -> "pd.Series[object]":
+    """
+    Cast a column to a property type, following the conversion functions used by `cast_value` when `strict_typing` is True.
+    Values that can not be cast become null, like `toIntegerOrNull` and `toFloatOrNull`.
+    Datetimes and times keep their offset, and naive ones are read as UTC, as `datetime()` and `time()` do.
+    Point, duration and unrecognized types are returned unchanged, so the Cypher can still convert them.
+
+    Parameters
+    ----------
+    values : pd.Series
+        The column.
+    type : str
+        The property type, such as "int", "float", "bool", "date", "datetime" or "time".
+
+    Returns
+    -------
+    pd.Series
+        The cast column.
+    """
+
+    if not is_client_side_type(type):
+        return values
+
+    type = type.lower()
+    if type.endswith("date"):
+        if pd.api.types.is_datetime64_any_dtype(values):
+            return values.dt.date
+        return _parse_temporal(values, _parse_date)
+    elif type.endswith("datetime"):
+        if pd.api.types.is_datetime64_any_dtype(values):
+            return values if values.dt.tz is not None else values.dt.tz_localize("UTC")
+        return _parse_temporal(values, _parse_datetime)
+    elif type.endswith("time"):
+        return _parse_temporal(values, _parse_time)
+    elif type.endswith("int"):
+        if pd.api.types.is_integer_dtype(values):
+            return values
+        return _cast_integer(values)
+    elif type.endswith("float"):
+        if pd.api.types.is_float_dtype(values):
+            return values
+        return pd.to_numeric(values, errors="coerce").astype("Float64")
+    elif type.endswith("bool"):
+        if pd.api.types.is_bool_dtype(values):
+            return values
+        # like toBooleanOrNull, only "true" and "false" are read, ignoring case
+        return (
+            values.astype("string")
+            .str.strip()
+            .str.lower()
+            .map(BOOLEAN_STRINGS)
+            .astype("boolean")
+        )
+    return values
+
+
+def cast_columns(rows: pd.DataFrame, column_types: Dict[str, str]) -> pd.DataFrame:
+    """
+    Cast the columns of a chunk to their property types. Only the cast columns are copied,
+    and columns missing from the chunk are ignored.
+
+    Parameters
+    ----------
+    rows : pd.DataFrame
+        The chunk of rows.
+    column_types : Dict[str, str]
+        The type of each column, such as those returned by `get_column_types`.
+
+    Returns
+    -------
+    pd.DataFrame
+        The chunk with its columns cast.
+    """
+
+    cast = {
+        column: cast_column(rows[column], type)
+        for column, type in column_types.items()
+        if column in rows.columns
+    }
+    if not cast:
+        return rows
+
+    return rows.assign(**cast)
@@ -0,0 +1,107 @@
+"""
+This file contains the checkpoint used by PyIngest to resume interrupted runs.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import warnings
+from typing import Any, Dict, List
+
+
+def get_config_hash(files: List[Dict[str, Any]]) -> str:
+    """
+    A hash of the `files` entries of a PyIngest config. A checkpoint is only valid for the config it was created with.
+    """
+
+    return hashlib.sha256(
+        json.dumps(files, sort_keys=True, default=str).encode()
+    ).hexdigest()
+
+
+class Checkpoint:
+    """
+    Records the progress of a PyIngest run in a local JSON state file.
+    Progress is tracked per statement key as the number of source rows that have been committed.
+    Safe to use from multiple threads.
+
+    Attributes
+    ----------
+    file_path : str
+        The location of the state file.
+    config_hash : str
+        The hash of the config this checkpoint belongs to.
+    """
+
+    def __init__(self, file_path: str, config_hash: str, resume: bool = False) -> None:
+        """
+        Records the progress of a PyIngest run in a local JSON state file.
+
+        Parameters
+        ----------
+        file_path : str
+            The location of the state file.
+        config_hash : str
+            The hash of the config this checkpoint belongs to.
+        resume : bool, optional
+            Whether to continue from the progress already recorded in the state file.
+            Progress recorded for a different config is discarded. By default False
+        """
+
+        self.file_path = file_path
+        self.config_hash = config_hash
+        self._lock = threading.Lock()
+        self._statements: Dict[str, Dict[str, Any]] = dict()
+
+        if resume and os.path.exists(file_path):
+            with open(file_path, "r") as f:
+                state = json.load(f)
+            if state.get("config_hash") == config_hash:
+                self._statements = state.get("statements", dict())
+            else:
+                warnings.warn(
+                    f"The checkpoint at {file_path} was created for a different config. Ingestion will start from the beginning."
+                )
+
+    def is_completed(self, key: str) -> bool:
+        with self._lock:
+            return bool(self._statements.get(key, dict()).get("completed", False))
+
+    def get_committed_rows(self, key: str) -> int:
+        with self._lock:
+            return int(self._statements.get(key, dict()).get("rows", 0))
+
+    def commit(self, key: str, url: str, rows: int) -> None:
+        """
+        Record that a chunk of `rows` source rows has been committed for a statement.
+        """
+
+        with self._lock:
+            progress = self._statements.setdefault(
+                key, {"url": url, "rows": 0, "completed": False}
+            )
+            progress["rows"] += rows
+            self._save()
+
+    def complete(self, key: str, url: str) -> None:
+        """
+        Record that every row of the source has been committed for a statement.
+        """
+
+        with self._lock:
+            progress = self._statements.setdefault(
+                key, {"url": url, "rows": 0, "completed": False}
+            )
+            progress["completed"] = True
+            self._save()
+
+    def _save(self) -> None:
+        temp_file_path = f"{self.file_path}.tmp"
+        with open(temp_file_path, "w") as f:
+            json.dump(
+                {"config_hash": self.config_hash, "statements": self._statements},
+                f,
+                indent=2,
+            )
+        os.replace(temp_file_path, self.file_path)
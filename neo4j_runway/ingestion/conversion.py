@@ -0,0 +1,107 @@
+"""
+This file contains the functions that convert chunks of source data into the parameters sent with each PyIngest statement.
+"""
+
+import re
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+ROW_COLUMN_PATTERN = re.compile(r"\brow\.(`[^`]+`|\w+)")
+ROW_ALIAS_PATTERN = re.compile(r"\bAS\s+row\b", re.IGNORECASE)
+ROW_PATTERN = re.compile(r"\brow\b(?!\s*\.)")
+
+
+def get_referenced_columns(cql: str) -> Optional[List[str]]:
+    """
+    Find the columns a PyIngest statement reads via `row.<column>`.
+
+    Parameters
+    ----------
+    cql : str
+        The Cypher statement.
+
+    Returns
+    -------
+    Optional[List[str]]
+        The column names in order of first appearance.
+        None if the statement uses `row` as a whole, in which case every column must be sent.
+    """
+
+    if ROW_PATTERN.search(ROW_ALIAS_PATTERN.sub("", cql)):
+        return None
+
+    columns: List[str] = list()
+    for column in ROW_COLUMN_PATTERN.findall(cql):
+        column = column[1:-1] if column.startswith("`") else column
+        if column not in columns:
+            columns.append(column)
+
+    return columns
+
+
+def get_union_columns(columns_list: List[Optional[List[str]]]) -> Optional[List[str]]:
+    """
+    Combine the columns referenced by several statements that read the same source.
+
+    Parameters
+    ----------
+    columns_list : List[Optional[List[str]]]
+        The columns of each statement, as returned by `get_referenced_columns`.
+
+    Returns
+    -------
+    Optional[List[str]]
+        The column names in order of first appearance. None if any statement uses `row` as a whole.
+    """
+
+    union: List[str] = list()
+    for columns in columns_list:
+        if columns is None:
+            return None
+        union += [column for column in columns if column not in union]
+
+    return union
+
+
+def to_parameter_rows(
+    rows: pd.DataFrame, columns: Optional[List[str]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Convert a chunk of rows into a list of maps to be unwound by a PyIngest statement.
+    Only the requested columns are sent and null values are dropped from each map,
+    so `row.<column>` evaluates to null in Cypher. The conversion is done column by column
+    to avoid copying the chunk and building intermediate Pandas objects per row.
+
+    Parameters
+    ----------
+    rows : pd.DataFrame
+        The chunk of rows.
+    columns : Optional[List[str]], optional
+        The columns to send. Columns missing from the chunk are ignored. If None, then all columns are sent. By default None
+
+    Returns
+    -------
+    List[Dict[str, Any]]
+        The parameter maps.
+    """
+
+    if columns is None:
+        columns = list(rows.columns)
+    else:
+        columns = [column for column in columns if column in rows.columns]
+
+    if not columns:
+        return [dict() for _ in range(len(rows))]
+
+    values = [rows[column].tolist() for column in columns]
+    nulls = [rows[column].isna().tolist() for column in columns]
+
+    return [
+        {
+            column: value
+            for column, value, is_null in zip(columns, row_values, row_nulls)
+            if not is_null
+        }
+        for row_values, row_nulls in zip(zip(*values), zip(*nulls))
+    ]
@@ -0,0 +1,158 @@
+"""
+This file contains the client side de-duplication of node keys used by PyIngest.
+Rows that MERGE a node already merged from an earlier row are dropped before they are sent,
+which removes redundant MERGE work on the server for fact table sources.
+"""
+
+import re
+import warnings
+from typing import Any, List, Optional, Set, Tuple
+
+import pandas as pd
+
+from .conversion import ROW_COLUMN_PATTERN
+
+MERGE_NODE_PATTERN = re.compile(
+    r"\bMERGE\s*\(\s*\w*\s*:[^{)]*\{([^}]*)\}\s*\)", re.IGNORECASE
+)
+MERGE_PATTERN = re.compile(r"\bMERGE\b", re.IGNORECASE)
+MATCH_PATTERN = re.compile(r"\bMATCH\b", re.IGNORECASE)
+RELATIONSHIP_PATTERN = re.compile(r"-\s*\[|\]\s*-")
+
+# a rough estimate of the memory a tracked key uses besides its values
+KEY_OVERHEAD_BYTES = 100
+
+
+def get_node_key_columns(cql: str) -> Optional[List[str]]:
+    """
+    Find the columns identifying the node of a node statement, such as those generated by `generate_merge_node_clause_standard`.
+
+    Parameters
+    ----------
+    cql : str
+        The Cypher statement.
+
+    Returns
+    -------
+    Optional[List[str]]
+        The key columns. None if the statement does more than MERGE a single node,
+        in which case its rows can not be safely de-duplicated.
+    """
+
+    if (
+        len(MERGE_PATTERN.findall(cql)) != 1
+        or MATCH_PATTERN.search(cql)
+        or RELATIONSHIP_PATTERN.search(cql)
+    ):
+        return None
+
+    match = MERGE_NODE_PATTERN.search(cql)
+    if match is None:
+        return None
+
+    columns: List[str] = list()
+    for column in ROW_COLUMN_PATTERN.findall(match.group(1)):
+        column = column[1:-1] if column.startswith("`") else column
+        if column not in columns:
+            columns.append(column)
+
+    return columns or None
+
+
+class NodeKeyDeduplicator:
+    """
+    Drops the rows of a node statement whose node key has already been seen.
+
+    Attributes
+    ----------
+    key_columns : List[str]
+        The columns identifying the node.
+    keep : str
+        Which row of a key wins, "first" or "last".
+    scope : str
+        "chunk" to de-duplicate within each chunk, or "file" to also drop keys seen in earlier chunks.
+    max_memory : Optional[int]
+        The maximum memory in bytes used to track the keys of a file. If None, memory is not limited.
+    """
+
+    def __init__(
+        self,
+        key_columns: List[str],
+        keep: str = "first",
+        scope: str = "chunk",
+        max_memory: Optional[int] = None,
+    ) -> None:
+        """
+        Drops the rows of a node statement whose node key has already been seen.
+
+        Parameters
+        ----------
+        key_columns : List[str]
+            The columns identifying the node.
+        keep : str, optional
+            Which row of a key wins, "first" or "last". Its non key properties are the ones set on the node. By default "first"
+        scope : str, optional
+            "chunk" to de-duplicate within each chunk, or "file" to also drop keys seen in earlier chunks.
+            Keys of earlier chunks can only be dropped when `keep` is "first", since a later row must still be sent for "last" to win.
+            By default "chunk"
+        max_memory : Optional[int], optional
+            The maximum memory in bytes used to track the keys of a file. Once reached, only chunks are de-duplicated. By default None
+
+        Raises
+        ------
+        ValueError
+            If `keep` or `scope` is not supported.
+        """
+
+        if keep not in ("first", "last"):
+            raise ValueError(f"`keep` must be 'first' or 'last', not {keep}.")
+        if scope not in ("chunk", "file"):
+            raise ValueError(f"`scope` must be 'chunk' or 'file', not {scope}.")
+
+        self.key_columns = key_columns
+        self.keep = keep
+        self.scope = scope
+        self.max_memory = max_memory
+        self._seen: Set[Tuple[Any, ...]] = set()
+        self._seen_memory = 0
+        self._tracking = scope == "file" and keep == "first"
+
+    def deduplicate(self, rows: pd.DataFrame) -> pd.DataFrame:
+        """
+        Drop the duplicate rows of a chunk.
+
+        Parameters
+        ----------
+        rows : pd.DataFrame
+            The chunk of rows.
+
+        Returns
+        -------
+        pd.DataFrame
+            The rows to send.
+        """
+
+        if not all(column in rows.columns for column in self.key_columns):
+            return rows
+
+        rows = rows.drop_duplicates(subset=self.key_columns, keep=self.keep)
+        if not self._tracking or rows.empty:
+            return rows
+
+        keys = list(zip(*[rows[column].tolist() for column in self.key_columns]))
+        is_new = [key not in self._seen for key in keys]
+        self._seen.update(keys)
+        rows = rows[is_new]
+
+        if self.max_memory is not None:
+            self._seen_memory += int(
+                rows[self.key_columns].memory_usage(deep=True, index=False).sum()
+            ) + KEY_OVERHEAD_BYTES * len(rows)
+            if self._seen_memory > self.max_memory:
+                warnings.warn(
+                    f"Tracking node keys {self.key_columns} exceeded {self.max_memory} bytes. The rest of the file is only de-duplicated within each chunk."
+                )
+                self._tracking = False
+                self._seen.clear()
+
+        return rows
@@ -0,0 +1,217 @@
+"""
+This file contains the sampling and reporting used by PyIngest to forecast the time of an ingestion before it runs.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# operators that read nodes without an index, so their cost grows with the size of the graph
+SCAN_OPERATORS = ("AllNodesScan", "NodeByLabelScan")
+
+
+def get_plan_operators(plan: Optional[Dict[str, Any]]) -> List[str]:
+    """
+    The operator types of a query plan and all of its children, depth first.
+
+    Parameters
+    ----------
+    plan : Optional[Dict[str, Any]]
+        The plan of a `ResultSummary`, as returned by an EXPLAIN or PROFILE query.
+
+    Returns
+    -------
+    List[str]
+        The operator types, without their runtime suffix, such as "NodeUniqueIndexSeek".
+    """
+
+    if not plan:
+        return list()
+
+    # operator types may carry the runtime, such as "NodeByLabelScan@neo4j"
+    operators = [str(plan.get("operatorType", "")).split("@")[0]]
+    for child in plan.get("children", list()):
+        operators += get_plan_operators(child)
+    return operators
+
+
+def get_scan_operators(plan: Optional[Dict[str, Any]]) -> List[str]:
+    """
+    The operators of a query plan that scan nodes instead of seeking them through an index.
+    """
+
+    return [
+        operator for operator in get_plan_operators(plan) if operator in SCAN_OPERATORS
+    ]
+
+
+def sample_chunks(
+    chunks: Iterator[pd.DataFrame], sample_size: int
+) -> Tuple[pd.DataFrame, int]:
+    """
+    Read every chunk of a source and keep rows evenly spaced across it, so each part of the source is represented.
+    Every `step`-th row is kept, and the step doubles whenever more than twice `sample_size` rows are held,
+    so memory stays bounded without knowing the number of rows in advance.
+
+    Parameters
+    ----------
+    chunks : Iterator[pd.DataFrame]
+        The chunks of a source.
+    sample_size : int
+        The number of rows to sample.
+
+    Returns
+    -------
+    Tuple[pd.DataFrame, int]
+        At most `sample_size` rows, and the number of rows in the source.
+    """
+
+    step = 1
+    total_rows = 0
+    sample = pd.DataFrame()
+    for rows in chunks:
+        positions = np.arange(total_rows, total_rows + len(rows))
+        keep = positions % step == 0
+        sample = pd.concat([sample, rows[keep].set_axis(positions[keep])])
+        total_rows += len(rows)
+
+        while len(sample) > 2 * sample_size:
+            step *= 2
+            sample = sample[sample.index % step == 0]
+
+    if len(sample) > sample_size:
+        sample = sample.iloc[
+            np.linspace(0, len(sample) - 1, sample_size).round().astype(int)
+        ]
+
+    return sample.reset_index(drop=True), total_rows
+
+
+@dataclass
+class StatementEstimate:
+    """
+    The forecast of a statement run against a source, measured on a sample of its rows.
+    `read_seconds` is the measured time to read the whole source, and `server_seconds` the time to write the sample.
+    """
+
+    key: str
+    url: str
+    cql: str
+    total_rows: int = 0
+    sample_rows: int = 0
+    read_seconds: float = 0.0
+    conversion_seconds: float = 0.0
+    server_seconds: float = 0.0
+    counters: Dict[str, int] = field(default_factory=dict)
+    scan_operators: List[str] = field(default_factory=list)
+
+    @property
+    def uses_index_seeks(self) -> bool:
+        """
+        Whether the plan finds every node through an index, instead of scanning labels or all nodes.
+        """
+
+        return not self.scan_operators
+
+    @property
+    def rows_per_second(self) -> float:
+        seconds = self.conversion_seconds + self.server_seconds
+        if seconds <= 0:
+            return 0.0
+        return self.sample_rows / seconds
+
+    @property
+    def forecast_seconds(self) -> float:
+        """
+        The projected time to load every row of the source: the measured read time,
+        plus the conversion and write time of the sample scaled to the number of rows.
+        """
+
+        if self.sample_rows == 0:
+            return self.read_seconds
+        return (
+            self.read_seconds
+            + (self.conversion_seconds + self.server_seconds)
+            * self.total_rows
+            / self.sample_rows
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        A flat dictionary of the estimate.
+        """
+
+        return {
+            "total_rows": self.total_rows,
+            "sample_rows": self.sample_rows,
+            "read_seconds": self.read_seconds,
+            "conversion_seconds": self.conversion_seconds,
+            "server_seconds": self.server_seconds,
+            "rows_per_second": self.rows_per_second,
+            "forecast_seconds": self.forecast_seconds,
+            "uses_index_seeks": self.uses_index_seeks,
+            "scan_operators": self.scan_operators,
+            **self.counters,
+        }
+
+
+class IngestionEstimate:
+    """
+    The forecast of a PyIngest run, per statement.
+
+    Attributes
+    ----------
+    statements : Dict[str, StatementEstimate]
+        The estimate of each statement, keyed by statement key, in configuration order.
+    """
+
+    def __init__(self) -> None:
+        self.statements: Dict[str, StatementEstimate] = dict()
+
+    def __str__(self) -> str:
+        lines = [
+            f"{e.url} ({key}): {e.total_rows} rows, {e.rows_per_second:.0f} rows/s, forecast {e.forecast_seconds:.1f}s"
+            + (
+                ""
+                if e.uses_index_seeks
+                else f", no index seek ({', '.join(dict.fromkeys(e.scan_operators))})"
+            )
+            for key, e in self.statements.items()
+        ]
+        lines.append(f"Total forecast {self.forecast_seconds:.1f}s")
+        return "\n".join(lines)
+
+    @property
+    def forecast_seconds(self) -> float:
+        """
+        The projected time to run every statement one after another.
+        """
+
+        return sum(e.forecast_seconds for e in self.statements.values())
+
+    @property
+    def bottleneck(self) -> Optional[StatementEstimate]:
+        """
+        The statement with the longest forecast.
+        """
+
+        if not self.statements:
+            return None
+        return max(self.statements.values(), key=lambda e: e.forecast_seconds)
+
+    @property
+    def statements_without_index_seeks(self) -> List[StatementEstimate]:
+        """
+        The statements whose plans scan labels or all nodes, usually because a constraint or index is missing.
+        """
+
+        return [e for e in self.statements.values() if not e.uses_index_seeks]
+
+    def to_dict(self) -> Dict[str, Dict[str, Any]]:
+        """
+        The estimate of every statement as flat dictionaries, keyed by statement key.
+        """
+
+        return {key: e.to_dict() for key, e in self.statements.items()}
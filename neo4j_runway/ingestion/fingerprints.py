@@ -0,0 +1,335 @@
+"""
+This file contains the row fingerprints used by PyIngest for incremental ingestion.
+A local SQLite store keeps a hash of the content of each row, keyed by statement and row key,
+so later runs only send rows that are new or have changed, and can delete the rows that disappeared.
+"""
+
+import json
+import re
+import sqlite3
+import threading
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+# the maximum number of variables in a SQLite statement is 999 in older versions
+LOOKUP_BATCH_SIZE = 900
+
+MERGE_NODE_PATTERN = re.compile(
+    r"\bMERGE\s*(\(\s*(\w+)\s*:[^{)]*\{[^}]*\}\s*\))", re.IGNORECASE
+)
+MERGE_RELATIONSHIP_PATTERN = re.compile(
+    r"\bMERGE\s*(\(\s*source\s*\)\s*-\s*\[\s*(\w+)\s*:[^\]]*\]\s*->\s*\(\s*target\s*\))",
+    re.IGNORECASE,
+)
+
+
+def _to_json(value: Any) -> Any:
+    # the arrays of list columns read from Parquet and Arrow sources
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    return str(value)
+
+
+def get_row_hashes(rows: pd.DataFrame) -> List[int]:
+    """
+    Hash the content of each row. The lists and maps of JSON, JSONL, Parquet and Arrow sources can not be hashed
+    by Pandas, so these values are hashed as JSON with sorted keys, leaving the hashes of other values unchanged.
+
+    Parameters
+    ----------
+    rows : pd.DataFrame
+        The rows.
+
+    Returns
+    -------
+    List[int]
+        The hash of each row, as a signed integer, the type SQLite supports.
+    """
+
+    try:
+        hashes = pd.util.hash_pandas_object(rows, index=False)
+    except TypeError:
+        serialized = {
+            column: rows[column].map(
+                lambda value: json.dumps(value, sort_keys=True, default=_to_json)
+                if isinstance(value, (list, tuple, dict, np.ndarray))
+                else value
+            )
+            for column in rows.columns
+            if rows[column].dtype == object
+        }
+        hashes = pd.util.hash_pandas_object(rows.assign(**serialized), index=False)
+
+    row_hashes: List[int] = hashes.to_numpy().view("int64").tolist()
+    return row_hashes
+
+
+def get_row_key_columns(params: Dict[str, Any]) -> Optional[List[str]]:
+    """
+    The columns identifying the entity a row of a statement writes.
+    The node key of a node statement, or the source and target node keys of a relationship statement.
+
+    Parameters
+    ----------
+    params : Dict[str, Any]
+        The file parameters returned by `LocalServer.get_params`.
+
+    Returns
+    -------
+    Optional[List[str]]
+        The key columns. None if the statement is neither a node nor a relationship statement,
+        in which case its rows are always sent.
+    """
+
+    if params["node_keys"] is not None:
+        columns: List[str] = params["node_keys"]
+        return columns
+    if params["relationship_keys"] is not None:
+        source_columns, target_columns = params["relationship_keys"]
+        return list(dict.fromkeys(source_columns + target_columns))
+    return None
+
+
+def get_deletion_cql(cql: str) -> Optional[str]:
+    """
+    Build the statement deleting the entities a node or relationship statement writes, given the same row keys.
+    Nodes are detached and deleted, and relationships are deleted between their matched nodes.
+
+    Parameters
+    ----------
+    cql : str
+        The Cypher statement.
+
+    Returns
+    -------
+    Optional[str]
+        The deletion statement. None if the statement is neither a node nor a relationship statement.
+    """
+
+    relationship = MERGE_RELATIONSHIP_PATTERN.search(cql)
+    if relationship is not None:
+        # keep the MATCH clauses finding the source and target nodes
+        return f"{cql[: relationship.start()]}MATCH {relationship.group(1)}\nDELETE {relationship.group(2)}"
+
+    node = MERGE_NODE_PATTERN.search(cql)
+    if node is not None:
+        return f"WITH $dict.rows AS rows\nUNWIND rows AS row\nMATCH {node.group(1)}\nDETACH DELETE {node.group(2)}"
+
+    return None
+
+
+class FingerprintStore:
+    """
+    A local SQLite store of row fingerprints, used to send only the rows that changed since the last run.
+    Each run marks the keys it sees, so keys not seen by a complete run have disappeared from the source.
+    Safe to use from multiple threads.
+
+    Attributes
+    ----------
+    file_path : str
+        The location of the SQLite database.
+    run : int
+        The number of the current run.
+    """
+
+    def __init__(self, file_path: str) -> None:
+        """
+        A local SQLite store of row fingerprints. Opening the store starts a new run.
+
+        Parameters
+        ----------
+        file_path : str
+            The location of the SQLite database. It is created if it does not exist.
+        """
+
+        self.file_path = file_path
+        self._lock = threading.Lock()
+        # statements with chunks lacking their key columns, whose seen keys this run are unknown
+        self._untracked_statements: Set[str] = set()
+        self._connection = sqlite3.connect(file_path, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS fingerprints "
+                "(statement TEXT, key TEXT, hash INTEGER, run INTEGER, PRIMARY KEY (statement, key)) WITHOUT ROWID"
+            )
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS runs (run INTEGER PRIMARY KEY)"
+            )
+            self._connection.execute("INSERT INTO runs DEFAULT VALUES")
+            self.run: int = self._connection.execute(
+                "SELECT MAX(run) FROM runs"
+            ).fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    def _get_hashes(self, statement: str, keys: List[str]) -> Dict[str, int]:
+        hashes: Dict[str, int] = dict()
+        with self._lock:
+            for start in range(0, len(keys), LOOKUP_BATCH_SIZE):
+                batch = keys[start : start + LOOKUP_BATCH_SIZE]
+                hashes.update(
+                    self._connection.execute(
+                        f"SELECT key, hash FROM fingerprints WHERE statement = ? AND key IN ({','.join('?' * len(batch))})",
+                        [statement, *batch],
+                    ).fetchall()
+                )
+        return hashes
+
+    def get_changes(
+        self,
+        statement: str,
+        rows: pd.DataFrame,
+        key_columns: List[str],
+        columns: Optional[List[str]] = None,
+    ) -> Tuple[pd.DataFrame, List[Tuple[str, int]]]:
+        """
+        Find the rows of a chunk that are new or have changed since they were last recorded.
+        Rows with a missing key value can not be tracked and are always sent.
+        If the chunk lacks a key column, every row is sent and the statement is no longer `is_tracked` by this run.
+
+        Parameters
+        ----------
+        statement : str
+            The key of the statement the rows are sent to.
+        rows : pd.DataFrame
+            The chunk of rows.
+        key_columns : List[str]
+            The columns identifying the entity a row writes.
+        columns : Optional[List[str]], optional
+            The columns whose content is compared. If None, then all columns. By default None
+
+        Returns
+        -------
+        Tuple[pd.DataFrame, List[Tuple[str, int]]]
+            The rows to send, and the (key, hash) fingerprints of the tracked rows to `record` once the chunk is committed.
+        """
+
+        if rows.empty:
+            return rows, list()
+        if not all(column in rows.columns for column in key_columns):
+            with self._lock:
+                self._untracked_statements.add(statement)
+            return rows, list()
+
+        content_columns = [
+            column
+            for column in (columns if columns is not None else rows.columns)
+            if column in rows.columns
+        ]
+        row_hashes = get_row_hashes(rows[content_columns])
+        tracked = rows[key_columns].notna().all(axis=1).tolist()
+        row_keys = [
+            json.dumps(key, default=str)
+            for key in zip(*[rows[column].tolist() for column in key_columns])
+        ]
+
+        stored = self._get_hashes(
+            statement, [key for key, is_tracked in zip(row_keys, tracked) if is_tracked]
+        )
+        changed = [
+            not is_tracked or stored.get(key) != row_hash
+            for key, row_hash, is_tracked in zip(row_keys, row_hashes, tracked)
+        ]
+        fingerprints = [
+            (key, row_hash)
+            for key, row_hash, is_tracked in zip(row_keys, row_hashes, tracked)
+            if is_tracked
+        ]
+
+        return rows[changed], fingerprints
+
+    def record(
+        self,
+        statement: str,
+        fingerprints: List[Tuple[str, int]],
+        update_hashes: bool = True,
+    ) -> None:
+        """
+        Record the fingerprints of committed rows and mark their keys as seen by the current run.
+
+        Parameters
+        ----------
+        statement : str
+            The key of the statement the rows were sent to.
+        fingerprints : List[Tuple[str, int]]
+            The fingerprints returned by `get_changes`.
+        update_hashes : bool, optional
+            Whether to store the new hashes. If False, for example because some rows of the chunk were rejected,
+            known keys are only marked as seen, so changed rows are sent again by the next run. By default True
+        """
+
+        with self._lock, self._connection:
+            if update_hashes:
+                self._connection.executemany(
+                    "INSERT INTO fingerprints VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (statement, key) DO UPDATE SET hash = excluded.hash, run = excluded.run",
+                    [
+                        (statement, key, row_hash, self.run)
+                        for key, row_hash in fingerprints
+                    ],
+                )
+            else:
+                self._connection.executemany(
+                    "UPDATE fingerprints SET run = ? WHERE statement = ? AND key = ?",
+                    [(self.run, statement, key) for key, _ in fingerprints],
+                )
+
+    def is_tracked(self, statement: str) -> bool:
+        """
+        Whether every chunk of a statement sent by this run could be fingerprinted, so the keys it has not seen are missing from its source.
+        """
+
+        with self._lock:
+            return statement not in self._untracked_statements
+
+    def get_missing_keys(
+        self, statement: str, key_columns: List[str]
+    ) -> List[Dict[str, Any]]:
+        """
+        The keys recorded for a statement that the current run has not seen.
+
+        Parameters
+        ----------
+        statement : str
+            The key of the statement.
+        key_columns : List[str]
+            The columns identifying the entity a row writes.
+
+        Returns
+        -------
+        List[Dict[str, Any]]
+            The key values of each missing row, by column.
+        """
+
+        with self._lock:
+            keys = self._connection.execute(
+                "SELECT key FROM fingerprints WHERE statement = ? AND run < ?",
+                (statement, self.run),
+            ).fetchall()
+
+        return [dict(zip(key_columns, json.loads(key))) for (key,) in keys]
+
+    def remove(self, statement: str, keys: List[Dict[str, Any]]) -> None:
+        """
+        Forget the fingerprints of deleted rows.
+
+        Parameters
+        ----------
+        statement : str
+            The key of the statement.
+        keys : List[Dict[str, Any]]
+            The key values of each row, as returned by `get_missing_keys`.
+        """
+
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "DELETE FROM fingerprints WHERE statement = ? AND key = ?",
+                [
+                    (statement, json.dumps(list(key.values()), default=str))
+                    for key in keys
+                ],
+            )
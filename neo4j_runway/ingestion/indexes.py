@@ -0,0 +1,133 @@
+"""
+This file contains the classification of schema statements used by PyIngest to defer index builds until data is loaded.
+"""
+
+import re
+from typing import List, Optional, Set, Tuple
+
+CONSTRAINT_PATTERN = re.compile(
+    r"^\s*CREATE\s+(OR\s+REPLACE\s+)?CONSTRAINT\b", re.IGNORECASE
+)
+INDEX_PATTERN = re.compile(
+    r"^\s*CREATE\s+(OR\s+REPLACE\s+)?((RANGE|TEXT|POINT|FULLTEXT|VECTOR|LOOKUP|BTREE)\s+)?INDEX\b",
+    re.IGNORECASE,
+)
+# the label and properties of a node index, such as "FOR (n:Person) ON (n.name, n.age)"
+NODE_INDEX_PATTERN = re.compile(
+    r"\bFOR\s*\(\s*\w*\s*:\s*`?([^`\s:)]+)`?\s*\)\s*ON\s*\(([^)]*)\)", re.IGNORECASE
+)
+INDEX_PROPERTY_PATTERN = re.compile(r"\.\s*(?:`([^`]+)`|(\w+))")
+
+# a node pattern with a property map, such as "(source:Person {name: row.name})"
+NODE_PATTERN = re.compile(r"\(\s*`?\w*`?\s*((?::\s*`?[^`\s:{})]+`?\s*)+)\{([^}]*)\}")
+MAP_KEY_PATTERN = re.compile(r"(?:^|,)\s*(?:`([^`]+)`|(\w+))\s*:")
+
+# the default time in seconds to wait for indexes and constraints to come online
+AWAIT_INDEXES_TIMEOUT = 300
+
+
+def get_index_class(cql: str) -> str:
+    """
+    Classify a statement by its effect on a load.
+
+    Parameters
+    ----------
+    cql : str
+        The Cypher statement.
+
+    Returns
+    -------
+    str
+        "constraint" for constraints, whose indexes are needed by MERGE and MATCH lookups while loading,
+        "index" for secondary indexes, such as range, text, point, full text and vector indexes,
+        which only slow writes down while loading, and "other" for any other statement.
+    """
+
+    if CONSTRAINT_PATTERN.match(cql):
+        return "constraint"
+    if INDEX_PATTERN.match(cql):
+        return "index"
+    return "other"
+
+
+def get_lookup_keys(statements: List[str]) -> Set[Tuple[str, str]]:
+    """
+    Find the label and property pairs that statements look nodes up by, from the property maps of their node patterns,
+    such as ("Person", "name") for `MATCH (source:Person {name: row.name})`.
+
+    Parameters
+    ----------
+    statements : List[str]
+        The Cypher statements.
+
+    Returns
+    -------
+    Set[Tuple[str, str]]
+        The label and property pairs.
+    """
+
+    keys: Set[Tuple[str, str]] = set()
+    for cql in statements:
+        for labels, properties in NODE_PATTERN.findall(cql):
+            for label in labels.split(":")[1:]:
+                label = label.strip().strip("`")
+                keys.update(
+                    (label, quoted or plain)
+                    for quoted, plain in MAP_KEY_PATTERN.findall(properties)
+                )
+    return keys
+
+
+def is_lookup_index(cql: str, lookup_keys: Set[Tuple[str, str]]) -> bool:
+    """
+    Whether an index statement covers a node label and property pair that is looked up by.
+    """
+
+    match = NODE_INDEX_PATTERN.search(cql)
+    if match is None:
+        return False
+    label = match.group(1)
+    return any(
+        (label, quoted or plain) in lookup_keys
+        for quoted, plain in INDEX_PROPERTY_PATTERN.findall(match.group(2))
+    )
+
+
+def split_index_statements(
+    statements: List[str], lookup_keys: Optional[Set[Tuple[str, str]]] = None
+) -> Tuple[List[str], List[str]]:
+    """
+    Split statements into the secondary indexes that can be built after a load and all other statements, keeping their order.
+    An index on a label and property that the loaded statements look nodes up by is not secondary, as MATCH and MERGE seek through it,
+    so it stays with the other statements.
+
+    Parameters
+    ----------
+    statements : List[str]
+        The Cypher statements.
+    lookup_keys : Optional[Set[Tuple[str, str]]], optional
+        The label and property pairs looked up by the loaded statements, such as those returned by `get_lookup_keys`.
+        If None, then every index is secondary. By default None
+
+    Returns
+    -------
+    Tuple[List[str], List[str]]
+        The secondary index statements and the other statements.
+    """
+
+    def is_secondary(cql: str) -> bool:
+        return get_index_class(cql) == "index" and not is_lookup_index(
+            cql, lookup_keys or set()
+        )
+
+    indexes = [cql for cql in statements if is_secondary(cql)]
+    others = [cql for cql in statements if not is_secondary(cql)]
+    return indexes, others
+
+
+def get_await_indexes_cql(timeout: int = AWAIT_INDEXES_TIMEOUT) -> str:
+    """
+    The statement waiting for every index and constraint to come online.
+    """
+
+    return f"CALL db.awaitIndexes({timeout})"
@@ -0,0 +1,206 @@
+"""
+This file contains the metrics gathered during a PyIngest run.
+"""
+
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+from neo4j import ResultSummary
+
+COUNTER_NAMES = (
+    "nodes_created",
+    "nodes_deleted",
+    "relationships_created",
+    "relationships_deleted",
+    "properties_set",
+    "labels_added",
+)
+
+
+@dataclass
+class BatchMetrics:
+    """
+    Metrics for a single chunk run against a single statement.
+    """
+
+    key: str
+    url: str
+    rows_read: int = 0
+    rows_sent: int = 0
+    rows_rejected: int = 0
+    parse_seconds: float = 0.0
+    server_seconds: float = 0.0
+    reader_blocked_seconds: float = 0.0
+    writer_blocked_seconds: float = 0.0
+    counters: Dict[str, int] = field(default_factory=dict)
+
+    def add_summary(self, summary: ResultSummary, rows_sent: int) -> None:
+        """
+        Add the counters of a committed transaction.
+        """
+
+        self.rows_sent += rows_sent
+        for name in COUNTER_NAMES:
+            self.counters[name] = self.counters.get(name, 0) + int(
+                getattr(summary.counters, name, 0) or 0
+            )
+
+    def add(self, other: "BatchMetrics") -> None:
+        """
+        Add the rows, conversion time and counters of a part of this batch that was written separately.
+        """
+
+        self.rows_sent += other.rows_sent
+        self.rows_rejected += other.rows_rejected
+        self.parse_seconds += other.parse_seconds
+        for name, value in other.counters.items():
+            self.counters[name] = self.counters.get(name, 0) + value
+
+
+@dataclass
+class StatementMetrics:
+    """
+    Metrics for a statement run against a source.
+    `parse_seconds` covers reading and converting the source, `server_seconds` the chunk transactions.
+    When several statements share a source, its parse time is split evenly between them.
+    When chunks are prefetched, `reader_blocked_seconds` is the time the reader waited on a full queue
+    and `writer_blocked_seconds` the time the writer waited on an empty one, split the same way.
+    """
+
+    key: str
+    url: str
+    cql: str
+    batches: int = 0
+    rows_read: int = 0
+    rows_sent: int = 0
+    rows_rejected: int = 0
+    parse_seconds: float = 0.0
+    server_seconds: float = 0.0
+    reader_blocked_seconds: float = 0.0
+    writer_blocked_seconds: float = 0.0
+    counters: Dict[str, int] = field(default_factory=dict)
+    batch_latencies: List[float] = field(default_factory=list, repr=False)
+    start_time: Optional[float] = field(default=None, repr=False)
+    end_time: Optional[float] = field(default=None, repr=False)
+
+    @property
+    def elapsed_seconds(self) -> float:
+        if self.start_time is None or self.end_time is None:
+            return 0.0
+        return self.end_time - self.start_time
+
+    @property
+    def rows_per_second(self) -> float:
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return self.rows_read / self.elapsed_seconds
+
+    def latency_percentile(self, percentile: float) -> float:
+        """
+        A percentile of the batch latencies in seconds.
+        """
+
+        if not self.batch_latencies:
+            return 0.0
+        return float(np.percentile(self.batch_latencies, percentile))
+
+    @property
+    def latency_p50(self) -> float:
+        return self.latency_percentile(50)
+
+    @property
+    def latency_p95(self) -> float:
+        return self.latency_percentile(95)
+
+    @property
+    def latency_p99(self) -> float:
+        return self.latency_percentile(99)
+
+    def to_dict(self) -> Dict[str, float]:
+        """
+        A flat dictionary of the metrics, suitable for exporting to a monitoring system.
+        """
+
+        return {
+            "batches": self.batches,
+            "rows_read": self.rows_read,
+            "rows_sent": self.rows_sent,
+            "rows_rejected": self.rows_rejected,
+            "parse_seconds": self.parse_seconds,
+            "server_seconds": self.server_seconds,
+            "reader_blocked_seconds": self.reader_blocked_seconds,
+            "writer_blocked_seconds": self.writer_blocked_seconds,
+            "elapsed_seconds": self.elapsed_seconds,
+            "rows_per_second": self.rows_per_second,
+            "latency_p50": self.latency_p50,
+            "latency_p95": self.latency_p95,
+            "latency_p99": self.latency_p99,
+            **self.counters,
+        }
+
+
+class IngestionMetrics:
+    """
+    Metrics gathered during a PyIngest run, per statement. Safe to update from multiple threads.
+
+    Attributes
+    ----------
+    statements : Dict[str, StatementMetrics]
+        The metrics of each statement, keyed by statement key.
+    callback : Optional[Callable[[BatchMetrics], None]]
+        A function called with the metrics of every batch as it completes.
+    """
+
+    def __init__(
+        self, callback: Optional[Callable[[BatchMetrics], None]] = None
+    ) -> None:
+        self.statements: Dict[str, StatementMetrics] = dict()
+        self.callback = callback
+        self._lock = threading.Lock()
+
+    def __str__(self) -> str:
+        lines = [
+            f"{m.url} ({key}): {m.rows_read} rows read, {m.rows_sent} sent, {m.rows_rejected} rejected, "
+            f"{m.rows_per_second:.0f} rows/s, p50/p95/p99 {m.latency_p50:.3f}/{m.latency_p95:.3f}/{m.latency_p99:.3f}s"
+            for key, m in self.statements.items()
+        ]
+        return "\n".join(lines)
+
+    def record_batch(self, batch: BatchMetrics, cql: str) -> None:
+        """
+        Add the metrics of a completed batch to its statement and pass it to the callback.
+        """
+
+        with self._lock:
+            metrics = self.statements.setdefault(
+                batch.key, StatementMetrics(key=batch.key, url=batch.url, cql=cql)
+            )
+            now = time.perf_counter()
+            if metrics.start_time is None:
+                metrics.start_time = now - batch.parse_seconds - batch.server_seconds
+            metrics.end_time = now
+            metrics.batches += 1
+            metrics.rows_read += batch.rows_read
+            metrics.rows_sent += batch.rows_sent
+            metrics.rows_rejected += batch.rows_rejected
+            metrics.parse_seconds += batch.parse_seconds
+            metrics.server_seconds += batch.server_seconds
+            metrics.reader_blocked_seconds += batch.reader_blocked_seconds
+            metrics.writer_blocked_seconds += batch.writer_blocked_seconds
+            metrics.batch_latencies.append(batch.server_seconds)
+            for name, value in batch.counters.items():
+                metrics.counters[name] = metrics.counters.get(name, 0) + value
+
+        if self.callback is not None:
+            self.callback(batch)
+
+    def to_dict(self) -> Dict[str, Dict[str, float]]:
+        """
+        The metrics of every statement as flat dictionaries, keyed by statement key.
+        """
+
+        with self._lock:
+            return {key: m.to_dict() for key, m in self.statements.items()}
@@ -0,0 +1,129 @@
+"""
+This file contains the options of an ingestion, shared by `PyIngest` and `Ingestor.ingest`.
+"""
+
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from ..models import DataModel
+from .metrics import BatchMetrics
+from .sorting import DEFAULT_MAX_SORT_MEMORY
+
+
+@dataclass
+class IngestOptions:
+    """
+    The options of an ingestion. `PyIngest` and `Ingestor.ingest` take an `IngestOptions`,
+    and also accept each option as a keyword argument, overriding the value in `options`.
+
+    Attributes
+    ----------
+    max_workers : int
+        The number of file entries to load concurrently, each on its own session.
+        Node statements are loaded before the relationship statements that MATCH on their labels, by default 1
+    group_by_source : bool
+        Whether to read each source once for all the entries that share its `url`, running every chunk against each of these statements.
+        Statements that MATCH nodes MERGEd from the same source are run on a second read of it, once those nodes are all loaded. By default False
+    adaptive_chunk_size : bool
+        Whether to grow or shrink each entry's `chunk_size` toward `target_latency`, by default False
+    target_latency : float
+        The desired chunk transaction latency in seconds when `adaptive_chunk_size` is True, by default 1.0
+    max_chunk_memory : Optional[int]
+        The maximum memory in bytes a single chunk may use when `adaptive_chunk_size` is True, by default None
+    chunk_size_cache : Optional[str]
+        A JSON file path to record the chosen chunk sizes in. Later runs with adaptive chunk sizing start from these sizes. By default None
+    reject_file : Optional[str]
+        A JSON Lines file path to write rows that Neo4j refuses because of their data.
+        If provided, a failing chunk is bisected down to its offending rows and the rest of the file keeps loading.
+        If None, such a chunk stops the ingestion. By default None
+    checkpoint_file : Optional[str]
+        A JSON file path to record progress in after each committed chunk.
+        If None and `resume` is True, then "pyingest_checkpoint.json" is used. By default None
+    resume : bool
+        Whether to continue from the progress recorded in `checkpoint_file`.
+        Completed entries are skipped and partially loaded entries continue after their last committed row.
+        Progress recorded for a different `files` config is discarded. By default False
+    metrics_callback : Optional[Callable[[BatchMetrics], None]]
+        A function called with the metrics of every chunk as it is committed,
+        for example to export them to a monitoring system. By default None
+    parse_processes : int
+        The number of worker processes parsing each uncompressed CSV. If greater than 1, files are split into
+        byte ranges on line boundaries, so quoted values may not contain line breaks.
+        Chunks load out of file order, and reject files, adaptive chunk sizing, node de-duplication, relationship partitioning, fingerprints,
+        relationship sorting and per chunk checkpoints do not apply. A warning names any of these options that are set.
+        The workers are started with "spawn", which imports the main module again in each of them, so a script must call
+        PyIngest under an `if __name__ == "__main__":` guard, or each worker would run the ingestion too. By default 1
+    writer_threads : int
+        The number of threads writing the chunks parsed by `parse_processes`, each on its own session, by default 1
+    relationship_partitions : Optional[int]
+        If provided, each chunk of a relationship statement is split into a `relationship_partitions` square grid
+        by hashing the source and target node keys. The cells are written in rounds of `relationship_partitions`
+        concurrent transactions that touch disjoint nodes, avoiding deadlocks on hub nodes.
+        Each transaction holds about `chunk_size` / `relationship_partitions` ** 2 rows, so a larger `chunk_size` is recommended.
+        Not applied when `parse_processes` parses a CSV in parallel. By default None
+    deduplicate_nodes : Optional[str]
+        Whether to drop rows of node statements whose node key has already been sent.
+        "chunk" de-duplicates each chunk and "file" also drops keys sent in earlier chunks of the file. If None, every row is sent.
+        Not applied when `parse_processes` parses a CSV in parallel. By default None
+    deduplicate_keep : str
+        Which row of a duplicated node key sets the node's other properties, "first" or "last".
+        Keys from earlier chunks are only dropped with "first". By default "first"
+    max_deduplication_memory : Optional[int]
+        The maximum memory in bytes used to track the node keys of each file when `deduplicate_nodes` is "file".
+        Once reached, the rest of the file is de-duplicated per chunk. By default None
+    data_model : Optional[DataModel]
+        If provided, each chunk's columns are cast to the types of the properties they are mapped to before being sent,
+        with vectorized Pandas operations. Types declared in an entry's `column_types` take precedence.
+        Use with ingestion code generated with `client_side_typing`, which references `row.<column>` without conversion functions.
+        By default None
+    fingerprint_file : Optional[str]
+        If provided, ingestion is incremental. A hash of each row of a node or relationship statement is kept in this SQLite file,
+        by node key or by source and target keys, and only rows that are new or have changed since the last run are sent.
+        Not applied when `parse_processes` parses a CSV in parallel. By default None
+    delete_missing : bool
+        Whether to delete the nodes and relationships of rows recorded in `fingerprint_file` that are no longer in their source.
+        Only applied once a source has been read from its first row, so not to statements resumed from a checkpoint. By default False
+    prefetch_chunks : int
+        The number of chunks a background thread reads and casts ahead of the chunk being written, so parsing overlaps with the server.
+        0 reads each chunk once the previous one is committed. The time each side waits on the other is reported as
+        `reader_blocked_seconds` and `writer_blocked_seconds`. By default 0
+    max_prefetch_memory : Optional[int]
+        The maximum memory in bytes of the chunks read ahead. A single chunk is always read ahead, whatever its size.
+        If None, only `prefetch_chunks` limits the read ahead. By default None
+    defer_indexes : bool
+        Whether to hold back the secondary indexes of `pre_ingest`, such as range, text and full text indexes, until the data is loaded,
+        as maintaining them slows writes down. Constraints, and indexes on the label and property pairs that the `files` statements look nodes up by, are created and awaited before loading, as MERGE and MATCH seek through them.
+        The deferred indexes and those of `post_ingest` are then built in parallel and awaited before the other `post_ingest` statements. By default False
+    sort_relationships : bool
+        Whether to load the rows of relationship statements in source node key order, so consecutive MATCH lookups touch neighboring records
+        instead of jumping across the store. Sources are sorted with an external merge sort, spilling sorted runs to temporary files
+        when they exceed `max_sort_memory`. Only sources whose statements all MERGE relationships from the same source node key are sorted.
+        Not applied when `parse_processes` parses a CSV in parallel. By default False
+    max_sort_memory : int
+        The approximate memory in bytes used to sort a source before spilling to disk, by default 256 MiB
+    """
+
+    max_workers: int = 1
+    group_by_source: bool = False
+    adaptive_chunk_size: bool = False
+    target_latency: float = 1.0
+    max_chunk_memory: Optional[int] = None
+    chunk_size_cache: Optional[str] = None
+    reject_file: Optional[str] = None
+    checkpoint_file: Optional[str] = None
+    resume: bool = False
+    metrics_callback: Optional[Callable[[BatchMetrics], None]] = None
+    parse_processes: int = 1
+    writer_threads: int = 1
+    relationship_partitions: Optional[int] = None
+    deduplicate_nodes: Optional[str] = None
+    deduplicate_keep: str = "first"
+    max_deduplication_memory: Optional[int] = None
+    data_model: Optional[DataModel] = None
+    fingerprint_file: Optional[str] = None
+    delete_missing: bool = False
+    prefetch_chunks: int = 0
+    max_prefetch_memory: Optional[int] = None
+    defer_indexes: bool = False
+    sort_relationships: bool = False
+    max_sort_memory: int = DEFAULT_MAX_SORT_MEMORY
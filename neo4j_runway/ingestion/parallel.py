@@ -0,0 +1,237 @@
+"""
+This file contains the multiprocess CSV parsing used by PyIngest to scale client side parsing with cores.
+Worker processes parse byte range partitions of a CSV into parameter batches
+and hand them to the writer threads over a bounded queue.
+The workers are spawned, so scripts using them must guard their entry point with `if __name__ == "__main__":`.
+"""
+
+import io
+import multiprocessing
+import os
+import queue
+import time
+import traceback
+from dataclasses import dataclass
+from typing import Any, Dict, Generator, List, Optional, Tuple
+
+import pandas as pd
+
+from .casting import cast_columns
+from .conversion import to_parameter_rows
+
+# the largest partition a worker process holds in memory at once
+PARTITION_BYTES = 64 * 1024 * 1024
+
+
+@dataclass
+class ParsedBatch:
+    """
+    A chunk of CSV rows converted into the `$dict` parameter of every statement reading the source.
+    """
+
+    rows: int
+    parse_seconds: float
+    rows_dicts: List[Dict[str, List[Dict[str, Any]]]]
+
+
+@dataclass
+class _ParseError:
+    message: str
+
+
+def get_byte_ranges(
+    url: str, start: int = 0, partition_bytes: int = PARTITION_BYTES
+) -> List[Tuple[int, int]]:
+    """
+    Split a file into byte ranges of roughly `partition_bytes`, each ending on a line boundary.
+    Quoted values containing line breaks are not supported.
+
+    Parameters
+    ----------
+    url : str
+        The location of the file.
+    start : int, optional
+        The byte offset of the first row, for example just after the header, by default 0
+    partition_bytes : int, optional
+        The target size of each range, by default 64 MiB
+
+    Returns
+    -------
+    List[Tuple[int, int]]
+        The (start, end) byte offsets of each range.
+    """
+
+    size = os.path.getsize(url)
+    ranges: List[Tuple[int, int]] = list()
+
+    with open(url, "rb") as f:
+        while start < size:
+            f.seek(min(start + partition_bytes, size))
+            # move the end of the range to the end of the line it falls in
+            if f.tell() < size:
+                f.readline()
+            end = f.tell()
+            ranges.append((start, end))
+            start = end
+
+    return ranges
+
+
+def parse_byte_ranges(
+    url: str,
+    byte_ranges: List[Tuple[int, int]],
+    header: List[str],
+    field_sep: str,
+    columns_list: List[Optional[List[str]]],
+    chunk_size: int,
+    output: Any,
+    column_types: Optional[Dict[str, str]] = None,
+) -> None:
+    """
+    Parse byte ranges of a CSV into `ParsedBatch`es and put them on the `output` queue.
+    This is the target of each worker process. A `_ParseError` is put on the queue if parsing fails,
+    and None is always put last to signal that the process is done.
+    """
+
+    try:
+        with open(url, "rb") as f:
+            for start, end in byte_ranges:
+                f.seek(start)
+                row_chunks = pd.read_csv(
+                    io.BytesIO(f.read(end - start)),
+                    dtype=str,
+                    sep=field_sep,
+                    on_bad_lines="skip",
+                    index_col=False,
+                    names=header,
+                    low_memory=False,
+                    engine="c",
+                    header=None,
+                    chunksize=chunk_size,
+                )
+                with row_chunks:
+                    while True:
+                        parse_start = time.perf_counter()
+                        try:
+                            rows = next(row_chunks)
+                        except StopIteration:
+                            break
+                        if column_types is not None:
+                            rows = cast_columns(rows, column_types)
+                        rows_dicts = [
+                            {"rows": to_parameter_rows(rows, columns=columns)}
+                            for columns in columns_list
+                        ]
+                        output.put(
+                            ParsedBatch(
+                                rows=len(rows),
+                                parse_seconds=time.perf_counter() - parse_start,
+                                rows_dicts=rows_dicts,
+                            )
+                        )
+    except BaseException:
+        output.put(_ParseError(traceback.format_exc()))
+    finally:
+        output.put(None)
+
+
+def iter_parsed_batches(
+    params: Dict[str, Any],
+    columns_list: List[Optional[List[str]]],
+    processes: int,
+    queue_size: Optional[int] = None,
+    partition_bytes: int = PARTITION_BYTES,
+    column_types: Optional[Dict[str, str]] = None,
+) -> Generator[ParsedBatch, None, None]:
+    """
+    Parse a CSV in `processes` worker processes and yield the parsed batches as they arrive.
+    Batches are not yielded in file order. The queue between the workers and the caller holds at most
+    `queue_size` batches, so parsing waits for the writers instead of filling memory.
+    The workers are stopped if the caller stops iterating.
+
+    Parameters
+    ----------
+    params : Dict[str, Any]
+        The file parameters returned by `LocalServer.get_params`. The file must be an uncompressed CSV.
+    columns_list : List[Optional[List[str]]]
+        The referenced columns of each statement reading the file.
+    processes : int
+        The number of worker processes.
+    queue_size : Optional[int], optional
+        The maximum number of parsed batches waiting to be written. If None, then 2 * `processes`. By default None
+    partition_bytes : int, optional
+        The size of the byte ranges handed to the workers, by default 64 MiB
+    column_types : Optional[Dict[str, str]], optional
+        The type to cast each column to in the worker processes. If None, then values are sent as strings. By default None
+
+    Returns
+    -------
+    Generator[ParsedBatch, None, None]
+        The parsed batches.
+
+    Raises
+    ------
+    RuntimeError
+        If a worker process fails.
+    """
+
+    with open(params["url"], "rb") as f:
+        # the header is applied to every partition
+        header = f.readline().decode().strip().split(params["field_sep"])
+        for _ in range(params["skip_records"]):
+            f.readline()
+        start = f.tell()
+
+    byte_ranges = get_byte_ranges(
+        params["url"], start=start, partition_bytes=partition_bytes
+    )
+    processes = max(1, min(processes, len(byte_ranges)))
+    # workers start from a fresh interpreter, as forking a process running driver and writer threads can deadlock the child
+    context = multiprocessing.get_context("spawn")
+    output: Any = context.Queue(maxsize=queue_size or 2 * processes)
+    workers = [
+        context.Process(
+            target=parse_byte_ranges,
+            args=(
+                params["url"],
+                byte_ranges[i::processes],
+                header,
+                params["field_sep"],
+                columns_list,
+                params["chunk_size"],
+                output,
+                column_types,
+            ),
+            daemon=True,
+        )
+        for i in range(processes)
+    ]
+    for worker in workers:
+        worker.start()
+
+    try:
+        running = len(workers)
+        while running > 0:
+            try:
+                item = output.get(timeout=1)
+            except queue.Empty:
+                if not any(worker.is_alive() for worker in workers):
+                    raise RuntimeError(
+                        f"A worker process parsing {params['url']} exited unexpectedly."
+                    )
+                continue
+
+            if item is None:
+                running -= 1
+            elif isinstance(item, _ParseError):
+                raise RuntimeError(
+                    f"A worker process failed to parse {params['url']}.\n{item.message}"
+                )
+            else:
+                yield item
+    finally:
+        for worker in workers:
+            if worker.is_alive():
+                worker.terminate()
+            worker.join()
+        output.close()
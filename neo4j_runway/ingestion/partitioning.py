@@ -0,0 +1,124 @@
+"""
+This file contains the grid partitioning used by PyIngest to load relationships in parallel without lock contention.
+Rows are assigned to a cell of a grid by hashing their source and target node keys, in the style of "mix and batch".
+Cells that share no source bucket and no target bucket touch disjoint nodes, so they can be written concurrently.
+"""
+
+import re
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from .conversion import ROW_COLUMN_PATTERN
+
+MATCH_NODE_PATTERN = re.compile(
+    r"\bMATCH\s*\(\s*(source|target)\s*:[^{)]*\{([^}]*)\}\s*\)", re.IGNORECASE
+)
+MERGE_RELATIONSHIP_PATTERN = re.compile(
+    r"\bMERGE\s*\(\s*source\s*\)\s*-\s*\[", re.IGNORECASE
+)
+
+
+def get_relationship_key_columns(
+    cql: str,
+) -> Optional[Tuple[List[str], List[str]]]:
+    """
+    Find the columns identifying the source and target nodes of a relationship statement,
+    such as those generated by `generate_merge_relationship_clause_standard`.
+
+    Parameters
+    ----------
+    cql : str
+        The Cypher statement.
+
+    Returns
+    -------
+    Optional[Tuple[List[str], List[str]]]
+        The source key columns and the target key columns.
+        None if the statement does not MERGE a relationship between a matched `source` and `target`.
+    """
+
+    if not MERGE_RELATIONSHIP_PATTERN.search(cql):
+        return None
+
+    keys: Dict[str, List[str]] = dict()
+    for variable, properties in MATCH_NODE_PATTERN.findall(cql):
+        keys[variable.lower()] = [
+            column[1:-1] if column.startswith("`") else column
+            for column in ROW_COLUMN_PATTERN.findall(properties)
+        ]
+
+    if not keys.get("source") or not keys.get("target"):
+        return None
+
+    return keys["source"], keys["target"]
+
+
+def _get_buckets(
+    rows: pd.DataFrame, columns: List[str], partitions: int
+) -> "pd.Series[int]":
+    # the key values are hashed without their column names, so a node gets the same bucket as source and as target
+    keys = rows[columns].astype(str)
+    keys.columns = list(range(len(columns)))
+    return (pd.util.hash_pandas_object(keys, index=False) % partitions).astype(int)
+
+
+def partition_rows(
+    rows: pd.DataFrame,
+    source_columns: List[str],
+    target_columns: List[str],
+    partitions: int,
+) -> Dict[Tuple[int, int], pd.DataFrame]:
+    """
+    Assign each row to a cell of a `partitions` x `partitions` grid by hashing its source and target keys.
+
+    Parameters
+    ----------
+    rows : pd.DataFrame
+        The chunk of rows.
+    source_columns : List[str]
+        The columns identifying the source node.
+    target_columns : List[str]
+        The columns identifying the target node.
+    partitions : int
+        The number of buckets per side of the grid.
+
+    Returns
+    -------
+    Dict[Tuple[int, int], pd.DataFrame]
+        The rows of each non empty cell, keyed by (source bucket, target bucket).
+    """
+
+    source_buckets = _get_buckets(rows, source_columns, partitions)
+    target_buckets = _get_buckets(rows, target_columns, partitions)
+
+    return {
+        (int(source), int(target)): cell
+        for (source, target), cell in rows.groupby(
+            [source_buckets.to_numpy(), target_buckets.to_numpy()], sort=True
+        )
+    }
+
+
+def get_partition_rounds(partitions: int) -> List[List[Tuple[int, int]]]:
+    """
+    Order the cells of a `partitions` x `partitions` grid into rounds of non conflicting cells.
+    Round r holds the cells (i, (i + r) % partitions), so no two cells in a round share a source or a target bucket.
+    When the source and target nodes share a label, a node may be in the source bucket of one cell
+    and the target bucket of another, so contention is reduced rather than removed.
+
+    Parameters
+    ----------
+    partitions : int
+        The number of buckets per side of the grid.
+
+    Returns
+    -------
+    List[List[Tuple[int, int]]]
+        The cells of each round.
+    """
+
+    return [
+        [(i, (i + r) % partitions) for i in range(partitions)]
+        for r in range(partitions)
+    ]
@@ -0,0 +1,201 @@
+"""
+This file contains the pipeline stage used by PyIngest to read the next chunks of a source while the current chunk is written.
+"""
+
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Iterator, Optional, Tuple
+
+import pandas as pd
+
+
+@dataclass
+class PrefetchedChunk:
+    """
+    A chunk of rows read from a source, with the time spent reading it and waiting on either side of the queue.
+    """
+
+    rows: pd.DataFrame
+    parse_seconds: float = 0.0
+    reader_blocked_seconds: float = 0.0
+    writer_blocked_seconds: float = 0.0
+
+
+def iter_timed_chunks(
+    chunks: Iterator[pd.DataFrame],
+    transform: Optional[Callable[[pd.DataFrame], pd.DataFrame]] = None,
+) -> Iterator[PrefetchedChunk]:
+    """
+    Read and transform each chunk on the calling thread, timing each one.
+
+    Parameters
+    ----------
+    chunks : Iterator[pd.DataFrame]
+        The chunks of a source.
+    transform : Optional[Callable[[pd.DataFrame], pd.DataFrame]], optional
+        A function applied to each chunk once it is read, by default None
+
+    Returns
+    -------
+    Iterator[PrefetchedChunk]
+        The chunks. Nothing is ever blocked, as reading and writing alternate.
+    """
+
+    start = time.perf_counter()
+    for rows in chunks:
+        if transform is not None:
+            rows = transform(rows)
+        yield PrefetchedChunk(rows=rows, parse_seconds=time.perf_counter() - start)
+        start = time.perf_counter()
+
+
+class ChunkPrefetcher:
+    """
+    Reads the chunks of a source on a background thread into a bounded queue, so the next chunks
+    are parsed while the current chunk is written. Reading waits once the queue holds `max_chunks` chunks
+    or `max_memory` bytes, so a slow server holds back the reader instead of filling memory.
+
+    Attributes
+    ----------
+    max_chunks : int
+        The number of chunks read ahead of the writer.
+    max_memory : Optional[int]
+        The maximum memory in bytes of the queued chunks. A single chunk is always queued, whatever its size.
+        If None, memory is not considered.
+    reader_blocked_seconds : float
+        The total time the reader waited for room in the queue, because the writer was slower.
+    writer_blocked_seconds : float
+        The total time the writer waited for a chunk, because the reader was slower.
+    """
+
+    def __init__(
+        self,
+        chunks: Iterator[pd.DataFrame],
+        max_chunks: int = 2,
+        max_memory: Optional[int] = None,
+        transform: Optional[Callable[[pd.DataFrame], pd.DataFrame]] = None,
+    ) -> None:
+        """
+        Reads the chunks of a source on a background thread into a bounded queue.
+        The thread starts when iteration starts.
+
+        Parameters
+        ----------
+        chunks : Iterator[pd.DataFrame]
+            The chunks of a source.
+        max_chunks : int, optional
+            The number of chunks read ahead of the writer, by default 2
+        max_memory : Optional[int], optional
+            The maximum memory in bytes of the queued chunks. If None, memory is not considered. By default None
+        transform : Optional[Callable[[pd.DataFrame], pd.DataFrame]], optional
+            A function applied to each chunk on the background thread once it is read, by default None
+        """
+
+        self.max_chunks = max(1, max_chunks)
+        self.max_memory = max_memory
+        self.reader_blocked_seconds = 0.0
+        self.writer_blocked_seconds = 0.0
+        self._chunks = chunks
+        self._transform = transform
+        # (chunk, its memory) pairs, each chunk holding its own parse and reader blocked time
+        self._queue: Deque[Tuple[PrefetchedChunk, int]] = deque()
+        self._queued_memory = 0
+        self._condition = threading.Condition()
+        self._done = False
+        self._stopped = False
+        self._error: Optional[BaseException] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def _has_room(self, memory: int) -> bool:
+        if not self._queue:
+            return True
+        if len(self._queue) >= self.max_chunks:
+            return False
+        return (
+            self.max_memory is None or self._queued_memory + memory <= self.max_memory
+        )
+
+    def _read(self) -> None:
+        try:
+            start = time.perf_counter()
+            for rows in self._chunks:
+                if self._transform is not None:
+                    rows = self._transform(rows)
+                chunk = PrefetchedChunk(
+                    rows=rows, parse_seconds=time.perf_counter() - start
+                )
+                memory = (
+                    int(rows.memory_usage(deep=True).sum())
+                    if self.max_memory is not None
+                    else 0
+                )
+
+                blocked_start = time.perf_counter()
+                with self._condition:
+                    while not self._stopped and not self._has_room(memory):
+                        self._condition.wait()
+                    if self._stopped:
+                        return
+                    chunk.reader_blocked_seconds = time.perf_counter() - blocked_start
+                    self.reader_blocked_seconds += chunk.reader_blocked_seconds
+                    self._queue.append((chunk, memory))
+                    self._queued_memory += memory
+                    self._condition.notify_all()
+                start = time.perf_counter()
+        except BaseException as e:
+            self._error = e
+        finally:
+            # release the source from the thread that read it
+            close = getattr(self._chunks, "close", None)
+            if close is not None:
+                close()
+            with self._condition:
+                self._done = True
+                self._condition.notify_all()
+
+    def __iter__(self) -> Iterator[PrefetchedChunk]:
+        self._thread = threading.Thread(target=self._read, daemon=True)
+        self._thread.start()
+
+        try:
+            while True:
+                blocked_start = time.perf_counter()
+                with self._condition:
+                    while not self._queue and not self._done:
+                        self._condition.wait()
+                    writer_blocked_seconds = time.perf_counter() - blocked_start
+                    self.writer_blocked_seconds += writer_blocked_seconds
+                    if not self._queue:
+                        break
+                    chunk, memory = self._queue.popleft()
+                    self._queued_memory -= memory
+                    self._condition.notify_all()
+
+                chunk.writer_blocked_seconds = writer_blocked_seconds
+                yield chunk
+
+            if self._error is not None:
+                raise self._error
+        finally:
+            self.close()
+
+    def __enter__(self) -> "ChunkPrefetcher":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Stop reading and wait for the background thread to finish its current chunk.
+        """
+
+        with self._condition:
+            self._stopped = True
+            self._queue.clear()
+            self._queued_memory = 0
+            self._condition.notify_all()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
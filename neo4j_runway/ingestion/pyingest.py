@@ -1,196 +1,1548 @@
 """
-This is a modified PyIngest file for Neo4j Runway. It currently only supports Pandas DataFrame and CSV ingestion.
+This is a modified PyIngest file for Neo4j Runway. It supports Pandas DataFrame, CSV, JSON, Parquet and Arrow IPC ingestion.
 """
 
+import contextlib
 import datetime
+import hashlib
+import os
+import threading
+import time
 import warnings
-from typing import Any, Dict, Optional
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import replace
+from typing import (
+    Any,
+    Callable,
+    ContextManager,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 
 import numpy as np
 import pandas as pd
 import yaml
-from neo4j import GraphDatabase
+from neo4j import (
+    Driver,
+    GraphDatabase,
+    ManagedTransaction,
+    ResultSummary,
+    Session,
+    Transaction,
+)
+from neo4j.exceptions import Neo4jError
+
+from ..models import DataModel
+from ..utils.data.table_collection import TableCollection
+from .adaptive import (
+    AdaptiveChunkSizer,
+    ChunkSizeCache,
+    get_transaction_latency,
+)
+from .casting import cast_columns, get_column_types
+from .checkpoint import Checkpoint, get_config_hash
+from .conversion import (
+    get_referenced_columns,
+    get_union_columns,
+    to_parameter_rows,
+)
+from .deduplication import NodeKeyDeduplicator, get_node_key_columns
+from .estimation import (
+    IngestionEstimate,
+    StatementEstimate,
+    get_scan_operators,
+    sample_chunks,
+)
+from .fingerprints import FingerprintStore, get_deletion_cql, get_row_key_columns
+from .indexes import (
+    AWAIT_INDEXES_TIMEOUT,
+    get_await_indexes_cql,
+    get_lookup_keys,
+    split_index_statements,
+)
+from .metrics import BatchMetrics, IngestionMetrics
+from .options import IngestOptions
+from .parallel import ParsedBatch, iter_parsed_batches
+from .partitioning import (
+    get_partition_rounds,
+    get_relationship_key_columns,
+    partition_rows,
+)
+from .prefetch import ChunkPrefetcher, PrefetchedChunk, iter_timed_chunks
+from .readers import (
+    get_compression,
+    get_source_format,
+    open_source,
+    read_arrow_chunks,
+    read_json_chunks,
+    read_parquet_chunks,
+)
+from .rejects import RejectWriter, is_data_error
+from .scheduler import (
+    build_dependency_graph,
+    collapse_dependency_graph,
+    run_scheduled,
+    topological_order,
+)
+from .sorting import get_sort_keys, sort_chunks
 
 global_config: Dict[str, Any] = dict()
 
+DataFrameSource = Union[pd.DataFrame, Mapping[str, pd.DataFrame], TableCollection]
+
+
+def get_params(
+    file: Dict[str, Any], basepath: Optional[str] = None, verbose: bool = False
+) -> Dict[str, Any]:
+    """
+    Parse the parameters of a single `files` entry in the PyIngest config.
+    """
+
+    params = dict()
+    params["skip_records"] = file.get("skip_records") or 0
+
+    file_url = file["url"]
+    if basepath and file_url.startswith("$BASE"):
+        file_url = file_url.replace("$BASE", basepath, 1)
+    params["url"] = file_url
+    params["compression"] = file.get("compression") or get_compression(file_url)
+    params["format"] = file.get("format") or get_source_format(file_url)
+    if verbose:
+        print("File {}", params["url"])
+    params["cql"] = file["cql"]
+    params["columns"] = get_referenced_columns(file["cql"])
+    params["relationship_keys"] = get_relationship_key_columns(file["cql"])
+    params["node_keys"] = get_node_key_columns(file["cql"])
+    params["chunk_size"] = file.get("chunk_size") or 1000
+    params["field_sep"] = file.get("field_separator") or ","
+    params["flatten_separator"] = file.get("flatten_separator") or "_"
+    params["flatten_max_level"] = file.get("flatten_max_level")
+    params["column_types"] = file.get("column_types")
+    return params
+
+
+def get_statement_key(url: str, cql: str) -> str:
+    """
+    The key identifying a statement run against a source, used to record chunk sizes and progress.
+    """
+
+    return f"{url}::{hashlib.sha1(cql.encode()).hexdigest()[:12]}"
+
+
+def _run_write(
+    tx: ManagedTransaction, cql: str, rows_dict: Dict[str, Any]
+) -> ResultSummary:
+    return tx.run(cql, dict=rows_dict).consume()
+
+
+def split_dataframe(
+    dataframe: pd.DataFrame,
+    chunk_size: int,
+    get_chunk_size: Optional[Callable[[], int]] = None,
+    order: Optional["np.ndarray[Any, Any]"] = None,
+) -> Iterator[pd.DataFrame]:
+    """
+    Lazily split a Pandas DataFrame into chunks of `chunk_size` rows.
+    The chunks are positional slices of the DataFrame, so no rows are copied until a chunk is converted.
+    If `get_chunk_size` is provided, it is called before each chunk to decide its size.
+    If `order` is provided, rows are taken in the order of these positions instead, one chunk at a time.
+    """
+
+    positions = len(dataframe) if order is None else len(order)
+    start = 0
+    while start < positions:
+        stop = start + (get_chunk_size() if get_chunk_size is not None else chunk_size)
+        yield (
+            dataframe.iloc[start:stop]
+            if order is None
+            else dataframe.iloc[order[start:stop]].reset_index(drop=True)
+        )
+        start = stop
+
+
+def read_csv_chunks(
+    params: Dict[str, Any], get_chunk_size: Optional[Callable[[], int]] = None
+) -> Iterator[pd.DataFrame]:
+    """
+    Lazily read a CSV file in chunks of `params["chunk_size"]` rows.
+    Compressed files are decompressed on the fly according to `params["compression"]`.
+
+    Parameters
+    ----------
+    params : Dict[str, Any]
+        The file parameters returned by `LocalServer.get_params`.
+    get_chunk_size : Optional[Callable[[], int]], optional
+        If provided, is called before each chunk is read to decide its size, by default None
+
+    Returns
+    -------
+    Iterator[pd.DataFrame]
+        The chunks.
+    """
+
+    with open_source(params["url"], compression=params["compression"]) as openfile:
+        # Grab the header from the file and pass that to pandas.  This allow the header
+        # to be applied even if we are skipping lines of the file
+        header = str(openfile.readline()).strip().split(params["field_sep"])
+
+        # Pandas' read_csv method is highly optimized and fast :-)
+        row_chunks = pd.read_csv(
+            openfile,
+            dtype=str,
+            sep=params["field_sep"],
+            on_bad_lines="skip",
+            index_col=False,
+            skiprows=params["skip_records"],
+            names=header,
+            low_memory=False,
+            engine="c",
+            compression=None,
+            header=None,
+            chunksize=params["chunk_size"],
+        )
+
+        with row_chunks:
+            while True:
+                try:
+                    rows = row_chunks.get_chunk(
+                        get_chunk_size() if get_chunk_size is not None else None
+                    )
+                except StopIteration:
+                    return
+                yield rows
+
+
+def read_source_chunks(
+    params: Dict[str, Any], get_chunk_size: Optional[Callable[[], int]] = None
+) -> Iterator[pd.DataFrame]:
+    """
+    Lazily read a source in chunks with the reader for its `params["format"]`.
+    Parquet and Arrow IPC sources require `pyarrow`.
+    """
+
+    if params["format"] == "parquet":
+        return read_parquet_chunks(params, get_chunk_size=get_chunk_size)
+    elif params["format"] == "arrow":
+        return read_arrow_chunks(params, get_chunk_size=get_chunk_size)
+    elif params["format"] in ("json", "jsonl"):
+        return read_json_chunks(params, get_chunk_size=get_chunk_size)
+    return read_csv_chunks(params, get_chunk_size=get_chunk_size)
+
+
+def to_rows_dict(
+    rows: pd.DataFrame, columns: Optional[List[str]] = None
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Convert a chunk of rows into the `$dict` parameter expected by the PyIngest Cypher statements.
+    Only `columns` are sent, if provided, and null values are dropped.
+    """
+
+    # Chunk up the rows to enable additional fastness :-)
+    return {"rows": to_parameter_rows(rows, columns=columns)}
+
+
+def get_source_dataframe(dataframe: DataFrameSource, url: str) -> pd.DataFrame:
+    """
+    Find the DataFrame holding the data of a `files` entry.
+
+    Parameters
+    ----------
+    dataframe : DataFrameSource
+        A single DataFrame used for every entry, a mapping of source name to DataFrame, or a `TableCollection`.
+        A source is found by its full `url`, its file name or its file name without the extension.
+    url : str
+        The `url` of the entry.
+
+    Returns
+    -------
+    pd.DataFrame
+        The DataFrame of the source.
+
+    Raises
+    ------
+    ValueError
+        If no DataFrame is provided for the source.
+    """
+
+    if isinstance(dataframe, pd.DataFrame):
+        return dataframe
+
+    if isinstance(dataframe, TableCollection):
+        dataframe = {table.name: table.dataframe for table in dataframe.tables}
+
+    file_name = os.path.basename(url)
+    for key in (url, file_name, os.path.splitext(file_name)[0]):
+        if key in dataframe:
+            return dataframe[key]
+
+    raise ValueError(
+        f"No DataFrame was provided for the source {url}. Available sources are: {list(dataframe)}"
+    )
+
 
 class LocalServer(object):
     """
     Handles data ingestion.
     """
 
-    def __init__(self) -> None:
-        self._driver = GraphDatabase.driver(
-            global_config["server_uri"],
-            auth=(global_config["admin_user"], global_config["admin_pass"]),
+    def __init__(
+        self,
+        options: Optional[IngestOptions] = None,
+        checkpoint: Optional[Checkpoint] = None,
+        metrics: Optional[IngestionMetrics] = None,
+        column_types: Optional[Dict[str, str]] = None,
+        config: Optional[Dict[str, Any]] = None,
+        driver: Optional[Driver] = None,
+        fingerprints: Optional[FingerprintStore] = None,
+        max_retry_time: float = 30.0,
+        index_timeout: int = AWAIT_INDEXES_TIMEOUT,
+    ) -> None:
+        if options is None:
+            options = IngestOptions()
+        # fall back to the config loaded by `load_config`
+        self.config = config if config is not None else global_config
+        # a driver passed in is shared with its owner and is not closed by this server
+        self._owns_driver = driver is None
+        self._driver = (
+            driver
+            if driver is not None
+            else GraphDatabase.driver(
+                self.config["server_uri"],
+                auth=(self.config["admin_user"], self.config["admin_pass"]),
+                max_transaction_retry_time=max_retry_time,
+            )
         )
         self.db_config = {}
-        self.database = (
-            global_config["database"] if "database" in global_config else None
-        )
+        self.database = self.config["database"] if "database" in self.config else None
         if self.database is not None:
             self.db_config["database"] = self.database
-        self.basepath = (
-            global_config["basepath"] if "basepath" in global_config else None
+        self.basepath = self.config["basepath"] if "basepath" in self.config else None
+        self.adaptive_chunk_size = options.adaptive_chunk_size
+        self.target_latency = options.target_latency
+        self.max_chunk_memory = options.max_chunk_memory
+        self.chunk_size_cache = (
+            ChunkSizeCache(options.chunk_size_cache)
+            if options.chunk_size_cache is not None
+            else None
+        )
+        self.reject_writer = (
+            RejectWriter(options.reject_file)
+            if options.reject_file is not None
+            else None
         )
+        self.checkpoint = checkpoint
+        self.metrics = metrics if metrics is not None else IngestionMetrics()
+        self.parse_processes = options.parse_processes
+        self.writer_threads = options.writer_threads
+        self.relationship_partitions = options.relationship_partitions
+        self.deduplicate_nodes = options.deduplicate_nodes
+        self.deduplicate_keep = options.deduplicate_keep
+        self.max_deduplication_memory = options.max_deduplication_memory
+        self.column_types = column_types
+        self.fingerprints = fingerprints
+        self.delete_missing = options.delete_missing
+        self.prefetch_chunks = options.prefetch_chunks
+        self.max_prefetch_memory = options.max_prefetch_memory
+        self.defer_indexes = options.defer_indexes
+        self.index_timeout = index_timeout
+        self.sort_relationships = options.sort_relationships
+        self.max_sort_memory = options.max_sort_memory
+        # secondary indexes of `pre_ingest` that are built once the data is loaded
+        self._deferred_indexes: List[str] = list()
 
     def close(self) -> None:
-        self._driver.close()
+        if self._owns_driver:
+            self._driver.close()
 
     def get_params(self, file: Dict[str, Any], verbose: bool = False) -> Dict[str, Any]:
-        params = dict()
-        params["skip_records"] = file.get("skip_records") or 0
-        params["compression"] = file.get("compression") or "none"
-
-        file_url = file["url"]
-        if self.basepath and file_url.startswith("$BASE"):
-            file_url = file_url.replace("$BASE", self.basepath, 1)
-        params["url"] = file_url
+        return get_params(file, basepath=self.basepath, verbose=verbose)
+
+    def _get_resume_offset(
+        self, params_list: List[Dict[str, Any]], verbose: bool = False
+    ) -> Optional[int]:
+        """
+        The number of source rows already committed for the statements, according to the checkpoint.
+        None if the statements have already been completed.
+        """
+
+        if self.checkpoint is None:
+            return 0
+
+        key = self._get_statement_key(params_list)
+        if self.checkpoint.is_completed(key):
+            if verbose:
+                print("Skipping completed file", params_list[0]["url"])
+            return None
+
+        return self.checkpoint.get_committed_rows(key)
+
+    def _get_chunk_sizer(
+        self, params_list: List[Dict[str, Any]]
+    ) -> Optional[AdaptiveChunkSizer]:
+        if not self.adaptive_chunk_size:
+            return None
+
+        chunk_size = min(params["chunk_size"] for params in params_list)
+        if self.chunk_size_cache is not None:
+            chunk_size = (
+                self.chunk_size_cache.get(self._get_statement_key(params_list))
+                or chunk_size
+            )
+
+        return AdaptiveChunkSizer(
+            chunk_size=chunk_size,
+            target_latency=self.target_latency,
+            max_chunk_memory=self.max_chunk_memory,
+        )
+
+    def _get_deduplicator(
+        self, params: Dict[str, Any]
+    ) -> Optional[NodeKeyDeduplicator]:
+        if self.deduplicate_nodes is None or params["node_keys"] is None:
+            return None
+
+        return NodeKeyDeduplicator(
+            key_columns=params["node_keys"],
+            keep=self.deduplicate_keep,
+            scope=self.deduplicate_nodes,
+            max_memory=self.max_deduplication_memory,
+        )
+
+    def _get_column_types(
+        self, params_list: List[Dict[str, Any]]
+    ) -> Optional[Dict[str, str]]:
+        # types declared on a file entry take precedence over those of the data model
+        column_types = dict(self.column_types or dict())
+        for params in params_list:
+            column_types.update(params["column_types"] or dict())
+
+        return column_types or None
+
+    def _get_sort_columns(
+        self, params_list: List[Dict[str, Any]]
+    ) -> Optional[List[str]]:
+        """
+        The source node key columns to sort a source by, if `self.sort_relationships` is True.
+        Only sources whose statements all MERGE relationships from the same source node key are sorted,
+        as reordering rows would change which row last sets the properties of a node.
+        """
+
+        if not self.sort_relationships:
+            return None
+
+        source_columns = [
+            params["relationship_keys"][0]
+            if params["relationship_keys"] is not None
+            else None
+            for params in params_list
+        ]
+        if source_columns[0] is None or any(
+            columns != source_columns[0] for columns in source_columns
+        ):
+            return None
+
+        columns: List[str] = source_columns[0]
+        return columns
+
+    @staticmethod
+    def _get_statement_key(params_list: List[Dict[str, Any]]) -> str:
+        return get_statement_key(
+            params_list[0]["url"], "\n".join(params["cql"] for params in params_list)
+        )
+
+    def _write_chunk(
+        self,
+        session: Session,
+        params: Dict[str, Any],
+        rows: pd.DataFrame,
+        batch: BatchMetrics,
+    ) -> ResultSummary:
+        """
+        Write a chunk in a managed transaction and add its conversion time and counters to `batch`.
+        Transient errors, such as deadlocks and leader switches, are retried by the driver
+        with exponential backoff and jitter for up to `max_retry_time` seconds.
+        """
+
+        start = time.perf_counter()
+        rows_dict = to_rows_dict(rows, columns=params["columns"])
+        batch.parse_seconds += time.perf_counter() - start
+
+        summary: ResultSummary = session.execute_write(
+            _run_write, params["cql"], rows_dict
+        )
+        batch.add_summary(summary, rows_sent=len(rows))
+
+        return summary
+
+    def _run_chunk(
+        self, session: Session, params: Dict[str, Any], rows: pd.DataFrame
+    ) -> BatchMetrics:
+        """
+        Run a single chunk of rows against a statement.
+        If a reject file is configured, a chunk that fails because of its data is bisected
+        until the offending rows are found. These are written to the reject file and the remaining rows are loaded.
+
+        Returns
+        -------
+        BatchMetrics
+            The metrics of the chunk. `server_seconds` holds the transaction latency.
+        """
+
+        batch = BatchMetrics(
+            key=get_statement_key(params["url"], params["cql"]),
+            url=params["url"],
+            rows_read=len(rows),
+        )
+        start = time.perf_counter()
+        try:
+            summary = self._write_chunk(session, params, rows, batch=batch)
+        except Neo4jError as e:
+            if self.reject_writer is None or not is_data_error(e):
+                raise
+            self._bisect_chunk(session, params, rows, error=e, batch=batch)
+            batch.server_seconds = time.perf_counter() - start - batch.parse_seconds
+            return batch
+
+        batch.server_seconds = get_transaction_latency(
+            summary, time.perf_counter() - start - batch.parse_seconds
+        )
+        return batch
+
+    def _bisect_chunk(
+        self,
+        session: Session,
+        params: Dict[str, Any],
+        rows: pd.DataFrame,
+        error: Neo4jError,
+        batch: BatchMetrics,
+    ) -> None:
+        assert self.reject_writer is not None
+
+        if len(rows) <= 1:
+            self.reject_writer.write(params, rows, error=error)
+            batch.rows_rejected += len(rows)
+            return
+
+        middle = len(rows) // 2
+        for half in (rows.iloc[:middle], rows.iloc[middle:]):
+            try:
+                self._write_chunk(session, params, half, batch=batch)
+            except Neo4jError as e:
+                if not is_data_error(e):
+                    raise
+                self._bisect_chunk(session, params, half, error=e, batch=batch)
+
+    def _run_cell(self, params: Dict[str, Any], rows: pd.DataFrame) -> BatchMetrics:
+        with self._driver.session(**self.db_config) as session:
+            return self._run_chunk(session, params, rows)
+
+    def _run_partitioned_chunk(
+        self, params: Dict[str, Any], rows: pd.DataFrame
+    ) -> BatchMetrics:
+        """
+        Run a chunk of rows against a relationship statement as a `self.relationship_partitions` square grid.
+        Rows are assigned to cells by hashing their source and target keys, and the cells are written in rounds.
+        The cells of a round share no source and no target nodes, so they are written concurrently,
+        each on its own session, without contending for the same node locks.
+
+        Returns
+        -------
+        BatchMetrics
+            The combined metrics of the cells. `server_seconds` holds the time taken by all rounds.
+        """
+
+        assert self.relationship_partitions is not None
+        source_columns, target_columns = params["relationship_keys"]
+        cells = partition_rows(
+            rows,
+            source_columns=source_columns,
+            target_columns=target_columns,
+            partitions=self.relationship_partitions,
+        )
+
+        batch = BatchMetrics(
+            key=get_statement_key(params["url"], params["cql"]),
+            url=params["url"],
+            rows_read=len(rows),
+        )
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.relationship_partitions) as executor:
+            for partition_round in get_partition_rounds(self.relationship_partitions):
+                futures = [
+                    executor.submit(self._run_cell, params, cells[cell])
+                    for cell in partition_round
+                    if cell in cells
+                ]
+                # the next round waits until every cell of this round is committed
+                for future in futures:
+                    batch.add(future.result())
+        batch.server_seconds = time.perf_counter() - start
+
+        return batch
+
+    def _is_partitioned(self, params: Dict[str, Any], rows: pd.DataFrame) -> bool:
+        if self.relationship_partitions is None or params["relationship_keys"] is None:
+            return False
+        source_columns, target_columns = params["relationship_keys"]
+        return all(column in rows.columns for column in source_columns + target_columns)
+
+    def _load_chunks(
+        self,
+        params_list: List[Dict[str, Any]],
+        chunks: Iterator[pd.DataFrame],
+        sizer: Optional[AdaptiveChunkSizer] = None,
+        verbose: bool = False,
+    ) -> None:
+        """
+        Run each chunk against every statement in `params_list`, in the order given.
+        If `self.prefetch_chunks` is set, the next chunks are read and cast on a background thread while the current chunk is written.
+        The metrics of each statement are recorded in `self.metrics`.
+        """
+
+        deduplicators = [self._get_deduplicator(params) for params in params_list]
+        row_key_columns = [get_row_key_columns(params) for params in params_list]
+        column_types = self._get_column_types(params_list)
+
+        def cast(rows: pd.DataFrame) -> pd.DataFrame:
+            return (
+                cast_columns(rows, column_types) if column_types is not None else rows
+            )
+
+        timed_chunks: Iterator[PrefetchedChunk] = iter_timed_chunks(
+            chunks, transform=cast
+        )
+        prefetching: ContextManager[Any] = contextlib.nullcontext()
+        if self.prefetch_chunks > 0:
+            prefetcher = ChunkPrefetcher(
+                chunks,
+                max_chunks=self.prefetch_chunks,
+                max_memory=self.max_prefetch_memory,
+                transform=cast,
+            )
+            # the prefetcher is closed if a write fails, so its thread stops reading
+            timed_chunks, prefetching = iter(prefetcher), prefetcher
+        with self._driver.session(**self.db_config) as session, prefetching:
+            for i, chunk in enumerate(timed_chunks):
+                rows = chunk.rows
+                # the source is parsed once for every statement that reads it
+                parse_seconds = chunk.parse_seconds / len(params_list)
+                if verbose:
+                    print(params_list[0]["url"], i, datetime.datetime.now(), flush=True)
+                latency = 0.0
+                for params, deduplicator, key_columns in zip(
+                    params_list, deduplicators, row_key_columns
+                ):
+                    statement_rows = (
+                        deduplicator.deduplicate(rows)
+                        if deduplicator is not None
+                        else rows
+                    )
+                    fingerprints: List[Tuple[str, int]] = list()
+                    if self.fingerprints is not None and key_columns is not None:
+                        statement_rows, fingerprints = self.fingerprints.get_changes(
+                            get_statement_key(params["url"], params["cql"]),
+                            statement_rows,
+                            key_columns=key_columns,
+                            columns=params["columns"],
+                        )
+
+                    if statement_rows.empty:
+                        # nothing new to write, so no transaction is opened
+                        batch = BatchMetrics(
+                            key=get_statement_key(params["url"], params["cql"]),
+                            url=params["url"],
+                        )
+                    elif self._is_partitioned(params, statement_rows):
+                        batch = self._run_partitioned_chunk(params, statement_rows)
+                    else:
+                        batch = self._run_chunk(session, params, statement_rows)
+
+                    if self.fingerprints is not None and fingerprints:
+                        # changed rows of a chunk with rejected rows are sent again by the next run
+                        self.fingerprints.record(
+                            get_statement_key(params["url"], params["cql"]),
+                            fingerprints,
+                            update_hashes=batch.rows_rejected == 0,
+                        )
+                    batch.rows_read = len(rows)
+                    batch.parse_seconds += parse_seconds
+                    batch.reader_blocked_seconds = chunk.reader_blocked_seconds / len(
+                        params_list
+                    )
+                    batch.writer_blocked_seconds = chunk.writer_blocked_seconds / len(
+                        params_list
+                    )
+                    latency += batch.server_seconds
+                    self.metrics.record_batch(batch, cql=params["cql"])
+
+                if self.checkpoint is not None:
+                    self.checkpoint.commit(
+                        self._get_statement_key(params_list),
+                        url=params_list[0]["url"],
+                        rows=len(rows),
+                    )
+
+                if sizer is not None:
+                    sizer.update(
+                        len(rows),
+                        latency=latency,
+                        memory=(
+                            int(rows.memory_usage(deep=True).sum())
+                            if sizer.max_chunk_memory is not None
+                            else None
+                        ),
+                    )
+
+        if self.checkpoint is not None:
+            self.checkpoint.complete(
+                self._get_statement_key(params_list), url=params_list[0]["url"]
+            )
+
+        if sizer is not None and self.chunk_size_cache is not None:
+            self.chunk_size_cache.set(
+                self._get_statement_key(params_list), sizer.chunk_size
+            )
+
         if verbose:
-            print("File {}", params["url"])
-        params["cql"] = file["cql"]
-        params["chunk_size"] = file.get("chunk_size") or 1000
-        params["field_sep"] = file.get("field_separator") or ","
-        return params
+            print("{} : Completed file", datetime.datetime.now())
 
-    def load_dataframe(
-        self, file: Dict[str, Any], dataframe: pd.DataFrame, verbose: bool = False
+    def _load_parsed_batches(
+        self,
+        params_list: List[Dict[str, Any]],
+        batches: Iterator[ParsedBatch],
+        verbose: bool = False,
     ) -> None:
         """
-        Load a Pandas DataFrame directly using a PyIngest yaml global_config file.
+        Write batches parsed by worker processes with a pool of `self.writer_threads` threads, each on its own session.
+        Each batch is run against every statement in `params_list`, in the order given.
+        At most 2 * `self.writer_threads` batches are held by the pool, so the parse queue fills up
+        and the workers wait when the writers fall behind.
         """
-        with self._driver.session(**self.db_config) as session:
-            params = self.get_params(file, verbose=verbose)
 
-            partition = max(1, int(len(dataframe) / params["chunk_size"]))
+        local = threading.local()
+        sessions: List[Session] = list()
+        sessions_lock = threading.Lock()
+
+        def get_session() -> Session:
+            if not hasattr(local, "session"):
+                local.session = self._driver.session(**self.db_config)
+                with sessions_lock:
+                    sessions.append(local.session)
+            session: Session = local.session
+            return session
 
-            for i, rows in enumerate(np.array_split(dataframe, partition)):
+        def write(batch: ParsedBatch) -> None:
+            session = get_session()
+            for params, rows_dict in zip(params_list, batch.rows_dicts):
+                metrics = BatchMetrics(
+                    key=get_statement_key(params["url"], params["cql"]),
+                    url=params["url"],
+                    rows_read=batch.rows,
+                    parse_seconds=batch.parse_seconds / len(params_list),
+                )
+                start = time.perf_counter()
+                summary = session.execute_write(_run_write, params["cql"], rows_dict)
+                metrics.server_seconds = get_transaction_latency(
+                    summary, time.perf_counter() - start
+                )
+                metrics.add_summary(summary, rows_sent=batch.rows)
+                self.metrics.record_batch(metrics, cql=params["cql"])
+
+        slots = threading.Semaphore(2 * self.writer_threads)
+        futures: Set["Future[None]"] = set()
+        executor = ThreadPoolExecutor(max_workers=self.writer_threads)
+        try:
+            for i, batch in enumerate(batches):
                 if verbose:
-                    print("loading...", i, datetime.datetime.now(), flush=True)
-                # Chunk up the rows to enable additional fastness :-)
-                rows_dict = {
-                    "rows": pd.DataFrame(rows).fillna(value="").to_dict("records")
-                }
-                session.run(params["cql"], dict=rows_dict).consume()
+                    print(params_list[0]["url"], i, datetime.datetime.now(), flush=True)
+                slots.acquire()
+                future = executor.submit(write, batch)
+                future.add_done_callback(lambda _: slots.release())
+                futures.add(future)
+
+                # stop parsing as soon as a write fails
+                for done in [f for f in futures if f.done()]:
+                    futures.remove(done)
+                    done.result()
+
+            for future in futures:
+                future.result()
+        finally:
+            # pending batches are dropped if a write failed
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=True)
+            for session in sessions:
+                session.close()
+
+        if self.checkpoint is not None:
+            self.checkpoint.complete(
+                self._get_statement_key(params_list), url=params_list[0]["url"]
+            )
 
         if verbose:
             print("{} : Completed file", datetime.datetime.now())
 
+    def _delete_missing_rows(
+        self, params_list: List[Dict[str, Any]], verbose: bool = False
+    ) -> None:
+        """
+        Delete the entities written by rows that an earlier run recorded but that are no longer in the source.
+        Only called once every row of the source has been read by this run.
+        """
+
+        assert self.fingerprints is not None
+
+        for params in params_list:
+            key_columns = get_row_key_columns(params)
+            deletion_cql = get_deletion_cql(params["cql"])
+            if key_columns is None or deletion_cql is None:
+                continue
+
+            statement_key = get_statement_key(params["url"], params["cql"])
+            if not self.fingerprints.is_tracked(statement_key):
+                warnings.warn(
+                    f"Rows of {params['url']} lack the key columns {key_columns}, so no rows are deleted for its statement."
+                )
+                continue
+            keys = self.fingerprints.get_missing_keys(
+                statement_key, key_columns=key_columns
+            )
+            if verbose and keys:
+                print("Deleting", len(keys), "rows missing from", params["url"])
+
+            with self._driver.session(**self.db_config) as session:
+                for start in range(0, len(keys), params["chunk_size"]):
+                    chunk = keys[start : start + params["chunk_size"]]
+                    session.execute_write(_run_write, deletion_cql, {"rows": chunk})
+                    self.fingerprints.remove(statement_key, chunk)
+
+    def load_dataframe(
+        self, file: Dict[str, Any], dataframe: pd.DataFrame, verbose: bool = False
+    ) -> None:
+        """
+        Load a Pandas DataFrame directly using a PyIngest yaml global_config file.
+        """
+
+        self.load_dataframe_group([file], dataframe=dataframe, verbose=verbose)
+
     def load_csv(self, file: Dict[str, Any], verbose: bool = False) -> None:
-        with self._driver.session(**self.db_config) as session:
-            params = self.get_params(file, verbose=verbose)
-
-            # check if we load this file...
-            skip = params["skip_file"] if "skip_file" in params else False
-            if skip:
-                return
-            with open(params["url"]) as openfile:
-                # Grab the header from the file and pass that to pandas.  This allow the header
-                # to be applied even if we are skipping lines of the file
-                header = str(openfile.readline()).strip().split(params["field_sep"])
-
-                # Pandas' read_csv method is highly optimized and fast :-)
-                row_chunks = pd.read_csv(
-                    openfile,
-                    dtype=str,
-                    sep=params["field_sep"],
-                    on_bad_lines="skip",
-                    index_col=False,
-                    skiprows=params["skip_records"],
-                    names=header,
-                    low_memory=False,
-                    engine="c",
-                    compression="infer",
-                    header=None,
-                    chunksize=params["chunk_size"],
+        self.load_csv_group([file], verbose=verbose)
+
+    def load_dataframe_group(
+        self,
+        files: List[Dict[str, Any]],
+        dataframe: pd.DataFrame,
+        verbose: bool = False,
+    ) -> None:
+        """
+        Load a Pandas DataFrame for several file entries at once.
+        Each chunk is run against every entry's statement in the order given.
+        """
+
+        params_list = [self.get_params(file, verbose=verbose) for file in files]
+
+        offset = self._get_resume_offset(params_list, verbose=verbose)
+        if offset is None:
+            return
+
+        sizer = self._get_chunk_sizer(params_list)
+        sort_columns = self._get_sort_columns(params_list)
+        if sort_columns is not None and all(
+            column in dataframe.columns for column in sort_columns
+        ):
+            # the DataFrame is already in memory, so only its sort order is computed
+            # and the checkpoint offset counts rows in that order
+            order = np.argsort(
+                get_sort_keys(dataframe, sort_columns).to_numpy(), kind="stable"
+            )
+            chunks = split_dataframe(
+                dataframe,
+                chunk_size=min(params["chunk_size"] for params in params_list),
+                get_chunk_size=sizer.get_chunk_size if sizer is not None else None,
+                order=order[offset:],
+            )
+        else:
+            chunks = split_dataframe(
+                dataframe.iloc[offset:],
+                chunk_size=min(params["chunk_size"] for params in params_list),
+                get_chunk_size=sizer.get_chunk_size if sizer is not None else None,
+            )
+        self._load_chunks(params_list, chunks, sizer=sizer, verbose=verbose)
+
+        # a resumed run has not seen the rows loaded before it was interrupted
+        if self.fingerprints is not None and self.delete_missing and offset == 0:
+            self._delete_missing_rows(params_list, verbose=verbose)
+
+    def load_csv_group(
+        self, files: List[Dict[str, Any]], verbose: bool = False
+    ) -> None:
+        """
+        Load several file entries that share the same source file, reading the file only once.
+        Each chunk is parsed once and then run against every entry's statement in the order given.
+        The smallest `chunk_size` of the entries is used.
+        If `self.parse_processes` is greater than 1, an uncompressed CSV is parsed in worker processes
+        and written by `self.writer_threads` threads. Chunks then load out of file order, so a checkpoint
+        only records the file once it is completed, and reject files, adaptive chunk sizing, node de-duplication,
+        relationship partitioning, fingerprints and relationship sorting are not applied. A warning names any of them that are set.
+        """
+
+        params_list = [self.get_params(file, verbose=verbose) for file in files]
+
+        # check if we load this file...
+        skip = params_list[0]["skip_file"] if "skip_file" in params_list[0] else False
+        if skip:
+            return
+
+        offset = self._get_resume_offset(params_list, verbose=verbose)
+        if offset is None:
+            return
+
+        params = dict(params_list[0])
+        params["chunk_size"] = min(p["chunk_size"] for p in params_list)
+        # the source is read once for every statement, so columns are projected for all of them
+        params["columns"] = get_union_columns([p["columns"] for p in params_list])
+        sort_columns = self._get_sort_columns(params_list)
+        if sort_columns is None:
+            params["skip_records"] += offset
+
+        if (
+            self.parse_processes > 1
+            and params["format"] == "csv"
+            and params["compression"] == "none"
+        ):
+            skipped = self._get_serial_only_options()
+            if skipped:
+                warnings.warn(
+                    f"{params['url']} is parsed in parallel, so {', '.join(skipped)} are not applied to it."
                 )
+            batches = iter_parsed_batches(
+                params,
+                columns_list=[p["columns"] for p in params_list],
+                processes=self.parse_processes,
+                column_types=self._get_column_types(params_list),
+            )
+            try:
+                self._load_parsed_batches(params_list, batches, verbose=verbose)
+            finally:
+                # stops the worker processes if writing failed
+                batches.close()
+            return
+
+        sizer = self._get_chunk_sizer(params_list)
+        if sort_columns is not None:
+            # the checkpoint offset counts rows in sorted order, so they are skipped once sorted
+            chunks = sort_chunks(
+                read_source_chunks(params),
+                key_columns=sort_columns,
+                chunk_size=params["chunk_size"],
+                get_chunk_size=sizer.get_chunk_size if sizer is not None else None,
+                max_memory=self.max_sort_memory,
+                skip_rows=offset,
+            )
+        else:
+            chunks = read_source_chunks(
+                params,
+                get_chunk_size=sizer.get_chunk_size if sizer is not None else None,
+            )
+        self._load_chunks(params_list, chunks, sizer=sizer, verbose=verbose)
+
+        # a resumed run has not seen the rows loaded before it was interrupted
+        if self.fingerprints is not None and self.delete_missing and offset == 0:
+            self._delete_missing_rows(params_list, verbose=verbose)
+
+    def _get_serial_only_options(self) -> List[str]:
+        """
+        The options that are set but only applied when a source is read chunk by chunk in file order.
+        """
 
-                for i, rows in enumerate(row_chunks):
-                    if verbose:
-                        print(params["url"], i, datetime.datetime.now(), flush=True)
-                    # Chunk up the rows to enable additional fastness :-)
-                    rows_dict = {
-                        "rows": pd.DataFrame(rows).fillna(value="").to_dict("records")
-                    }
-                    session.run(params["cql"], dict=rows_dict).consume()
+        options = {
+            "reject_file": self.reject_writer is not None,
+            "adaptive_chunk_size": self.adaptive_chunk_size,
+            "deduplicate_nodes": self.deduplicate_nodes is not None,
+            "relationship_partitions": bool(
+                self.relationship_partitions and self.relationship_partitions > 1
+            ),
+            "fingerprint_file": self.fingerprints is not None,
+            "sort_relationships": self.sort_relationships,
+        }
+        return [option for option, is_set in options.items() if is_set]
 
+    def estimate(
+        self,
+        tx: Transaction,
+        file: Dict[str, Any],
+        dataframe: Optional[pd.DataFrame] = None,
+        sample_size: int = 1000,
+        verbose: bool = False,
+    ) -> StatementEstimate:
+        """
+        Estimate the time to load a `files` entry by reading its whole source and writing a sample of its rows.
+        The sample is written in `tx`, which the caller is expected to roll back, after EXPLAIN has planned the statement.
+
+        Parameters
+        ----------
+        tx : Transaction
+            The transaction to write the sample in.
+        file : Dict[str, Any]
+            The `files` entry.
+        dataframe : Optional[pd.DataFrame], optional
+            The source data. If None, then the source is read from the entry's `url`. By default None
+        sample_size : int, optional
+            The number of rows to write, evenly spaced across the source, by default 1000
+        verbose : bool, optional
+            Whether to print the progress, by default False
+
+        Returns
+        -------
+        StatementEstimate
+            The estimate of the statement.
+        """
+
+        params = self.get_params(file, verbose=verbose)
+        chunks = (
+            split_dataframe(dataframe, params["chunk_size"])
+            if dataframe is not None
+            else read_source_chunks(params)
+        )
+
+        start = time.perf_counter()
+        sample, total_rows = sample_chunks(chunks, sample_size=sample_size)
+        column_types = self._get_column_types([params])
+        if column_types is not None:
+            sample = cast_columns(sample, column_types)
+        estimate = StatementEstimate(
+            key=get_statement_key(params["url"], params["cql"]),
+            url=params["url"],
+            cql=params["cql"],
+            total_rows=total_rows,
+            sample_rows=len(sample),
+            read_seconds=time.perf_counter() - start,
+        )
+
+        batch = BatchMetrics(key=estimate.key, url=estimate.url)
+        for start_row in range(0, len(sample), params["chunk_size"]):
+            start = time.perf_counter()
+            rows_dict = to_rows_dict(
+                sample.iloc[start_row : start_row + params["chunk_size"]],
+                columns=params["columns"],
+            )
+            estimate.conversion_seconds += time.perf_counter() - start
+
+            if start_row == 0:
+                plan = tx.run("EXPLAIN " + params["cql"], dict=rows_dict).consume().plan
+                estimate.scan_operators = get_scan_operators(plan)
+
+            start = time.perf_counter()
+            summary = tx.run(params["cql"], dict=rows_dict).consume()
+            estimate.server_seconds += get_transaction_latency(
+                summary, time.perf_counter() - start
+            )
+            batch.add_summary(summary, rows_sent=len(rows_dict["rows"]))
+
+        estimate.counters = batch.counters
         if verbose:
-            print("{} : Completed file", datetime.datetime.now())
+            print(estimate.url, f"forecast {estimate.forecast_seconds:.1f}s")
+
+        return estimate
+
+    def _run_statements(self, statements: List[str]) -> None:
+        with self._driver.session(**self.db_config) as session:
+            for statement in statements:
+                session.run(statement)
+
+    def _build_indexes(self, statements: List[str], verbose: bool = False) -> None:
+        """
+        Create secondary indexes, each from its own session so their builds run in parallel, and wait for them to come online.
+        """
+
+        if verbose:
+            print("Building", len(statements), "indexes")
+
+        with ThreadPoolExecutor(max_workers=len(statements)) as executor:
+            for future in [
+                executor.submit(self._run_statements, [statement])
+                for statement in statements
+            ]:
+                future.result()
+        self._run_statements([get_await_indexes_cql(self.index_timeout)])
 
     def pre_ingest(self, verbose: bool = False) -> None:
-        if "pre_ingest" in global_config:
-            statements = global_config["pre_ingest"]
+        """
+        Run the `pre_ingest` statements.
+        If `self.defer_indexes` is True, secondary indexes are held back until `post_ingest`,
+        and the constraints and indexes needed by MERGE and MATCH lookups of the `files` statements are awaited before any data is loaded.
+        """
+
+        if "pre_ingest" in self.config:
+            statements = self.config["pre_ingest"]
             if len(statements) > 0:
-                with self._driver.session(**self.db_config) as session:
-                    for statement in statements:
-                        session.run(statement)
+                if self.defer_indexes:
+                    # indexes that MATCH and MERGE seek through are needed while loading
+                    lookup_keys = get_lookup_keys(
+                        [file["cql"] for file in self.config.get("files") or list()]
+                    )
+                    self._deferred_indexes, statements = split_index_statements(
+                        statements, lookup_keys=lookup_keys
+                    )
+                    statements = [
+                        *statements,
+                        get_await_indexes_cql(self.index_timeout),
+                    ]
+                self._run_statements(statements)
             else:
                 if verbose:
                     print("no pre ingest scripts found.")
 
     def post_ingest(self, verbose: bool = False) -> None:
-        if "post_ingest" in global_config:
-            statements = global_config["post_ingest"]
+        """
+        Run the `post_ingest` statements.
+        If `self.defer_indexes` is True, the secondary indexes of `pre_ingest` and `post_ingest` are built first, in parallel.
+        """
+
+        statements = self.config.get("post_ingest") or list()
+        if self.defer_indexes:
+            indexes, statements = split_index_statements(statements)
+            indexes = [*self._deferred_indexes, *indexes]
+            if indexes:
+                self._build_indexes(indexes, verbose=verbose)
+
+        if "post_ingest" in self.config:
             if len(statements) > 0:
-                with self._driver.session(**self.db_config) as session:
-                    for statement in statements:
-                        session.run(statement)
+                self._run_statements(statements)
             else:
                 if verbose:
                     print("no post ingest scripts found.")
 
 
+def group_files(
+    files: List[Dict[str, Any]], dependencies: Dict[int, Set[int]]
+) -> List[List[int]]:
+    """
+    Group the `files` entries that read the same source in the same way.
+    A chunk of a source is run against every statement of its group, so a statement that MATCHes nodes
+    MERGEd by another statement of the same source would miss the nodes of later chunks.
+    The entries of a source are therefore split into phases, each reading the whole source once:
+    node statements first, then the relationship statements that MATCH on them, and so on.
+    The entries within each phase keep their dependency order.
+
+    Parameters
+    ----------
+    files : List[Dict[str, Any]]
+        The `files` entries of the PyIngest config.
+    dependencies : Dict[int, Set[int]]
+        The statement dependency graph returned by `build_dependency_graph`.
+
+    Returns
+    -------
+    List[List[int]]
+        The indexes of the entries in each group, with the phases of a source as separate groups.
+    """
+
+    groups: Dict[Tuple[Any, ...], List[int]] = dict()
+    for idx, file in enumerate(files):
+        key = (
+            file["url"],
+            file.get("skip_records") or 0,
+            file.get("field_separator") or ",",
+            file.get("compression") or "none",
+            file.get("flatten_separator") or "_",
+            file.get("flatten_max_level"),
+        )
+        groups.setdefault(key, list()).append(idx)
+
+    ordered_groups: List[List[int]] = list()
+    for members in groups.values():
+        member_dependencies = {
+            pos: {members.index(dep) for dep in dependencies[idx] if dep in members}
+            for pos, idx in enumerate(members)
+        }
+        order = topological_order(member_dependencies)
+        # a statement runs in the phase after the last of the statements it depends on
+        phases: Dict[int, int] = dict()
+        for pos in order:
+            phases[pos] = max(
+                (phases[dep] + 1 for dep in member_dependencies[pos] if dep in phases),
+                default=0,
+            )
+        for phase in sorted(set(phases.values())):
+            ordered_groups.append(
+                [members[pos] for pos in order if phases[pos] == phase]
+            )
+
+    return ordered_groups
+
+
 def load_config(configuration: Any) -> None:
     global global_config
     global_config = yaml.safe_load(configuration)
 
 
+def get_config(config: Union[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Parse a PyIngest configuration. `config` may be a YAML string, a filepath to a YAML file or an already parsed configuration.
+    """
+
+    if isinstance(config, dict):
+        return config
+
+    configuration: Dict[str, Any] = yaml.safe_load(get_yaml(config))
+    return configuration
+
+
+class Ingestor:
+    """
+    Owns a Neo4j driver and its connection pool, and ingests data according to PyIngest configurations.
+    An Ingestor may be used for many ingestions, one after another or concurrently from several threads.
+    Each ingestion keeps its configuration, progress and metrics to itself, so only the driver is shared.
+
+    Attributes
+    ----------
+    uri : str
+        The Neo4j uri.
+    username : str
+        The Neo4j username.
+    database : Optional[str]
+        The database used by configurations that do not declare one.
+    """
+
+    def __init__(
+        self,
+        uri: str,
+        username: str,
+        password: str,
+        database: Optional[str] = None,
+        max_retry_time: float = 30.0,
+        **driver_config: Any,
+    ) -> None:
+        """
+        Owns a Neo4j driver and its connection pool, and ingests data according to PyIngest configurations.
+        Close the Ingestor, or use it as a context manager, to release its connections.
+
+        Parameters
+        ----------
+        uri : str
+            The Neo4j uri.
+        username : str
+            The Neo4j username.
+        password : str
+            The Neo4j password.
+        database : Optional[str], optional
+            The database used by configurations that do not declare one. If None, then the server's default database. By default None
+        max_retry_time : float, optional
+            The maximum time in seconds to retry a chunk that fails with a transient error, such as a deadlock or leader switch, by default 30.0
+        driver_config : Any
+            Additional configuration passed to `GraphDatabase.driver`, such as `max_connection_pool_size`.
+        """
+
+        self.uri = uri
+        self.username = username
+        self.database = database
+        self._driver = GraphDatabase.driver(
+            uri,
+            auth=(username, password),
+            max_transaction_retry_time=max_retry_time,
+            **driver_config,
+        )
+
+    @classmethod
+    def from_config(
+        cls, config: Union[str, Dict[str, Any]], **kwargs: Any
+    ) -> "Ingestor":
+        """
+        Create an Ingestor connected with the credentials of a PyIngest configuration.
+
+        Parameters
+        ----------
+        config : Union[str, Dict[str, Any]]
+            A string representation of the YAML file that is generated by the PyIngestConfigGenerator class,
+            a filepath to a YAML file or an already parsed configuration.
+        kwargs : Any
+            Additional args passed to the Ingestor, such as `max_retry_time`.
+
+        Returns
+        -------
+        Ingestor
+            The Ingestor.
+        """
+
+        configuration = get_config(config)
+        return cls(
+            uri=configuration["server_uri"],
+            username=configuration["admin_user"],
+            password=configuration["admin_pass"],
+            **kwargs,
+        )
+
+    def close(self) -> None:
+        """
+        Close the driver and its connections.
+        """
+
+        self._driver.close()
+
+    def __enter__(self) -> "Ingestor":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def ingest(
+        self,
+        config: Union[str, Dict[str, Any]],
+        dataframe: Optional[DataFrameSource] = None,
+        verbose: bool = False,
+        options: Optional[IngestOptions] = None,
+        **kwargs: Any,
+    ) -> IngestionMetrics:
+        """
+        Ingest data according to a PyIngest configuration. The configuration's server credentials are ignored
+        in favor of the Ingestor's driver.
+
+        Parameters
+        ----------
+        config : Union[str, Dict[str, Any]]
+            A string representation of the YAML file that is generated by the PyIngestConfigGenerator class,
+            a filepath to a YAML file or an already parsed configuration.
+        dataframe : Optional[Union[pd.DataFrame, Mapping[str, pd.DataFrame], TableCollection]], optional
+            The data to ingest in Pandas DataFrame format. Either a single DataFrame used for every entry,
+            a mapping of source file name to DataFrame, or a `TableCollection`. Each entry is routed to the DataFrame
+            matching the file name in its `url`. If None, then will search for files according to the urls in YAML config, by default None
+        verbose : bool, optional
+            Whether to print progress, by default False
+        options : Optional[IngestOptions], optional
+            The options of the ingestion, such as `max_workers` or `fingerprint_file`. If None, then the defaults of `IngestOptions`. By default None
+        kwargs : Any
+            Options that override those of `options`, such as `max_workers=4`.
+
+        Returns
+        -------
+        IngestionMetrics
+            The rows read and sent, server counters, parse and server time,
+            batch latency percentiles and throughput of each statement.
+        """
+
+        options = replace(options if options is not None else IngestOptions(), **kwargs)
+        configuration = dict(get_config(config))
+        if configuration.get("database") is None and self.database is not None:
+            configuration["database"] = self.database
+
+        checkpoint_file = options.checkpoint_file
+        if options.resume and checkpoint_file is None:
+            checkpoint_file = "pyingest_checkpoint.json"
+        checkpoint = (
+            Checkpoint(
+                checkpoint_file,
+                config_hash=get_config_hash(configuration["files"]),
+                resume=options.resume,
+            )
+            if checkpoint_file is not None
+            else None
+        )
+        file_list = configuration["files"]
+        # resolve every source before anything is written
+        dataframes = (
+            {
+                file["url"]: get_source_dataframe(dataframe, file["url"])
+                for file in file_list
+            }
+            if dataframe is not None
+            else dict()
+        )
+
+        server = LocalServer(
+            options=options,
+            checkpoint=checkpoint,
+            metrics=IngestionMetrics(callback=options.metrics_callback),
+            column_types=(
+                get_column_types(options.data_model)
+                if options.data_model is not None
+                else None
+            ),
+            config=configuration,
+            driver=self._driver,
+            fingerprints=(
+                FingerprintStore(options.fingerprint_file)
+                if options.fingerprint_file is not None
+                else None
+            ),
+        )
+        try:
+            server.pre_ingest(verbose=verbose)
+            dependencies = build_dependency_graph([file["cql"] for file in file_list])
+
+            def load_file(file: Dict[str, Any]) -> None:
+                if dataframe is not None:
+                    server.load_dataframe(
+                        file, dataframe=dataframes[file["url"]], verbose=verbose
+                    )
+                else:
+                    server.load_csv(file, verbose=verbose)
+
+            def load_group(files: List[Dict[str, Any]]) -> None:
+                if dataframe is not None:
+                    server.load_dataframe_group(
+                        files, dataframe=dataframes[files[0]["url"]], verbose=verbose
+                    )
+                else:
+                    server.load_csv_group(files, verbose=verbose)
+
+            if options.group_by_source:
+                groups = group_files(file_list, dependencies=dependencies)
+                run_scheduled(
+                    tasks=[[file_list[idx] for idx in group] for group in groups],
+                    dependencies=collapse_dependency_graph(dependencies, groups=groups),
+                    worker=load_group,
+                    max_workers=options.max_workers,
+                )
+            else:
+                run_scheduled(
+                    tasks=file_list,
+                    dependencies=dependencies,
+                    worker=load_file,
+                    max_workers=options.max_workers,
+                )
+            server.post_ingest(verbose=verbose)
+        finally:
+            # a failed statement still releases the server and the fingerprint store
+            server.close()
+            if server.fingerprints is not None:
+                server.fingerprints.close()
+
+        return server.metrics
+
+    def estimate(
+        self,
+        config: Union[str, Dict[str, Any]],
+        dataframe: Optional[DataFrameSource] = None,
+        sample_size: int = 1000,
+        data_model: Optional[DataModel] = None,
+        verbose: bool = False,
+    ) -> IngestionEstimate:
+        """
+        Forecast the time of an ingestion without changing the database.
+        Every source is read in full to count its rows and time its parsing, and a sample of rows evenly spaced
+        across it is written by each statement, in configuration order, in a single transaction that is rolled back.
+        Each statement is also planned with EXPLAIN, to flag statements that scan labels or all nodes instead of seeking an index.
+
+        The `pre_ingest` statements are not run, so run them first if the constraints they create do not exist yet.
+        A relationship statement only matches nodes in the database or in the samples of earlier statements,
+        so its forecast is low if its nodes were sampled from other rows.
+
+        Parameters
+        ----------
+        config : Union[str, Dict[str, Any]]
+            A string representation of the YAML file that is generated by the PyIngestConfigGenerator class,
+            a filepath to a YAML file or an already parsed configuration.
+        dataframe : Optional[DataFrameSource], optional
+            The data to estimate, as accepted by `ingest`. If None, then each source is read from its `url`. By default None
+        sample_size : int, optional
+            The number of rows each statement writes, by default 1000
+        data_model : Optional[DataModel], optional
+            If provided, the sample is cast to the types of the data model, as by `ingest`. By default None
+        verbose : bool, optional
+            Whether to print the progress, by default False
+
+        Returns
+        -------
+        IngestionEstimate
+            The measured throughput and forecast of each statement, and whether its plan uses index seeks.
+        """
+
+        configuration = dict(get_config(config))
+        if configuration.get("database") is None and self.database is not None:
+            configuration["database"] = self.database
+
+        server = LocalServer(
+            column_types=(
+                get_column_types(data_model) if data_model is not None else None
+            ),
+            config=configuration,
+            driver=self._driver,
+        )
+        estimate = IngestionEstimate()
+        with self._driver.session(**server.db_config) as session:
+            tx = session.begin_transaction()
+            try:
+                for file in configuration["files"]:
+                    statement = server.estimate(
+                        tx,
+                        file,
+                        dataframe=(
+                            get_source_dataframe(dataframe, file["url"])
+                            if dataframe is not None
+                            else None
+                        ),
+                        sample_size=sample_size,
+                        verbose=verbose,
+                    )
+                    estimate.statements[statement.key] = statement
+            finally:
+                tx.rollback()
+
+        return estimate
+
+
 def PyIngest(
     config: str,
-    dataframe: Optional[pd.DataFrame] = None,
+    dataframe: Optional[DataFrameSource] = None,
     verbose: bool = False,
+    options: Optional[IngestOptions] = None,
+    max_retry_time: float = 30.0,
     **kwargs: Any,
-) -> None:
+) -> IngestionMetrics:
     """
     Function to ingest data according to a configuration YAML.
     This is a modified version of the original PyIngest that focuses on loading local files.
+    A new driver is created and closed on every call. To reuse connections across loads, or to run loads concurrently, use an `Ingestor`.
 
     Parameters
     ----------
     config : str
         A string representation of the YAML file that is generated by the IngestionGenerator class.
         May also be a filepath to a YAML file.
-    dataframe : Optional[pd.DataFrame], optional
-        The data to ingest in Pandas DataFrame format.
-        If None, then will search for CSVs according to the urls in YAML config, by default None
+    dataframe : Optional[Union[pd.DataFrame, Mapping[str, pd.DataFrame], TableCollection]], optional
+        The data to ingest in Pandas DataFrame format. Either a single DataFrame used for every entry,
+        a mapping of source file name to DataFrame, or a `TableCollection`. Each entry is routed to the DataFrame
+        matching the file name in its `url`. If None, then will search for files according to the urls in YAML config, by default None
     verbose : bool, optional
         Whether to print progress, by default False
+    options : Optional[IngestOptions], optional
+        The options of the ingestion, such as `max_workers` or `fingerprint_file`. If None, then the defaults of `IngestOptions`. By default None
+    max_retry_time : float, optional
+        The maximum time in seconds to retry a chunk that fails with a transient error, such as a deadlock or leader switch, by default 30.0
     kwargs : Any
-        Additional params
+        Options that override those of `options`, such as `max_workers=4`.
+        The deprecated `yaml_string` is read in place of `config`.
+
+    Returns
+    -------
+    IngestionMetrics
+        The rows read and sent, server counters, parse and server time,
+        batch latency percentiles and throughput of each statement.
     """
 
     if "yaml_string" in kwargs:
-        load_config(get_yaml(kwargs["yaml_string"]))
+        config = kwargs.pop("yaml_string")
         warnings.warn(
             "the yaml_string parameter will be depreciated in future releases. Please use the 'config' to identify the YAML file instead."
         )
-    else:
-        load_config(get_yaml(config))
-
-    with warnings.catch_warnings():
-        warnings.simplefilter(
-            action="ignore", category=FutureWarning
-        )  # pandas throws FutureWarning on `DataFrame.swapaxes in fromnumeric.py`. Is very annoying and not our problem.
-        server = LocalServer()
-        server.pre_ingest(verbose=verbose)
-        file_list = global_config["files"]
-        for file in file_list:
-            if dataframe is not None:
-                server.load_dataframe(file, dataframe=dataframe, verbose=verbose)
-            else:
-                server.load_csv(file, verbose=verbose)
-        server.post_ingest(verbose=verbose)
-        server.close()
+    configuration = get_config(config)
+
+    with Ingestor.from_config(configuration, max_retry_time=max_retry_time) as ingestor:
+        return ingestor.ingest(
+            configuration,
+            dataframe=dataframe,
+            verbose=verbose,
+            options=options,
+            **kwargs,
+        )
 
 
 def get_yaml(data: str) -> str:
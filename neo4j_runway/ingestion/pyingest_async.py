@@ -0,0 +1,229 @@
+"""
+This file contains an asynchronous version of PyIngest built on the Neo4j AsyncDriver.
+Multiple chunk transactions are kept in flight at once, so parsing the next chunk overlaps with the server committing the previous ones.
+"""
+
+import asyncio
+import datetime
+import warnings
+from typing import Any, Dict, Iterator, Optional, Set
+
+import pandas as pd
+from neo4j import AsyncGraphDatabase, AsyncManagedTransaction, ResultSummary
+
+from . import pyingest
+from .casting import cast_columns
+from .pyingest import (
+    DataFrameSource,
+    get_config,
+    get_params,
+    get_source_dataframe,
+    read_source_chunks,
+    split_dataframe,
+    to_rows_dict,
+)
+
+
+async def _run_write(
+    tx: AsyncManagedTransaction, cql: str, rows_dict: Dict[str, Any]
+) -> ResultSummary:
+    result = await tx.run(cql, dict=rows_dict)
+    return await result.consume()
+
+
+class AsyncLocalServer(object):
+    """
+    Handles asynchronous data ingestion.
+    """
+
+    def __init__(
+        self, max_in_flight: int = 4, config: Optional[Dict[str, Any]] = None
+    ) -> None:
+        # fall back to the config loaded by `load_config`
+        self.config = config if config is not None else pyingest.global_config
+        self._driver = AsyncGraphDatabase.driver(
+            self.config["server_uri"],
+            auth=(self.config["admin_user"], self.config["admin_pass"]),
+        )
+        self.max_in_flight = max(1, max_in_flight)
+        self.db_config = {}
+        self.database = self.config["database"] if "database" in self.config else None
+        if self.database is not None:
+            self.db_config["database"] = self.database
+        self.basepath = self.config["basepath"] if "basepath" in self.config else None
+
+    async def close(self) -> None:
+        await self._driver.close()
+
+    def get_params(self, file: Dict[str, Any], verbose: bool = False) -> Dict[str, Any]:
+        return get_params(file, basepath=self.basepath, verbose=verbose)
+
+    async def _run_chunk(self, params: Dict[str, Any], rows: pd.DataFrame) -> None:
+        if params["column_types"] is not None:
+            rows = cast_columns(rows, params["column_types"])
+        async with self._driver.session(**self.db_config) as session:
+            await session.execute_write(
+                _run_write,
+                params["cql"],
+                to_rows_dict(rows, columns=params["columns"]),
+            )
+
+    async def _load_chunks(
+        self,
+        params: Dict[str, Any],
+        chunks: Iterator[pd.DataFrame],
+        verbose: bool = False,
+    ) -> None:
+        """
+        Run each chunk in its own transaction, keeping at most `max_in_flight` transactions open.
+        The next chunk is only parsed once a slot is free, which bounds client memory.
+        """
+
+        slots = asyncio.Semaphore(self.max_in_flight)
+        in_flight: Set["asyncio.Task[None]"] = set()
+
+        async def run_chunk(rows: pd.DataFrame) -> None:
+            try:
+                await self._run_chunk(params, rows)
+            finally:
+                slots.release()
+
+        i = 0
+        try:
+            while True:
+                await slots.acquire()
+
+                # surface server errors before parsing any more of the file
+                for task in [t for t in in_flight if t.done()]:
+                    in_flight.remove(task)
+                    exception = task.exception()
+                    if exception is not None:
+                        slots.release()
+                        raise exception
+
+                rows = await asyncio.to_thread(next, chunks, None)
+                if rows is None:
+                    slots.release()
+                    break
+                if verbose:
+                    print(params["url"], i, datetime.datetime.now(), flush=True)
+
+                in_flight.add(asyncio.create_task(run_chunk(rows)))
+                i += 1
+        finally:
+            # always wait on open transactions, even when raising
+            results = await asyncio.gather(*in_flight, return_exceptions=True)
+
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+
+    async def load_dataframe(
+        self, file: Dict[str, Any], dataframe: pd.DataFrame, verbose: bool = False
+    ) -> None:
+        """
+        Load a Pandas DataFrame directly using a PyIngest yaml global_config file.
+        """
+
+        params = self.get_params(file, verbose=verbose)
+        await self._load_chunks(
+            params,
+            split_dataframe(dataframe, chunk_size=params["chunk_size"]),
+            verbose=verbose,
+        )
+
+        if verbose:
+            print("{} : Completed file", datetime.datetime.now())
+
+    async def load_csv(self, file: Dict[str, Any], verbose: bool = False) -> None:
+        params = self.get_params(file, verbose=verbose)
+
+        # check if we load this file...
+        skip = params["skip_file"] if "skip_file" in params else False
+        if skip:
+            return
+
+        await self._load_chunks(params, read_source_chunks(params), verbose=verbose)
+
+        if verbose:
+            print("{} : Completed file", datetime.datetime.now())
+
+    async def _run_statements(self, key: str, verbose: bool = False) -> None:
+        if key in self.config:
+            statements = self.config[key]
+            if len(statements) > 0:
+                async with self._driver.session(**self.db_config) as session:
+                    for statement in statements:
+                        result = await session.run(statement)
+                        await result.consume()
+            else:
+                if verbose:
+                    print(f"no {key.replace('_', ' ')} scripts found.")
+
+    async def pre_ingest(self, verbose: bool = False) -> None:
+        await self._run_statements("pre_ingest", verbose=verbose)
+
+    async def post_ingest(self, verbose: bool = False) -> None:
+        await self._run_statements("post_ingest", verbose=verbose)
+
+
+async def PyIngestAsync(
+    config: str,
+    dataframe: Optional[DataFrameSource] = None,
+    verbose: bool = False,
+    max_in_flight: int = 4,
+    **kwargs: Any,
+) -> None:
+    """
+    Asynchronously ingest data according to a configuration YAML.
+    Each file entry is loaded in order, with up to `max_in_flight` chunk transactions running at once.
+    This is useful when server commit latency, rather than parsing, dominates the load time.
+    In a Python Notebook the coroutine may be awaited directly, otherwise run it with `asyncio.run`.
+
+    Parameters
+    ----------
+    config : str
+        A string representation of the YAML file that is generated by the PyIngestConfigGenerator class.
+        May also be a filepath to a YAML file.
+    dataframe : Optional[Union[pd.DataFrame, Mapping[str, pd.DataFrame], TableCollection]], optional
+        The data to ingest in Pandas DataFrame format. Either a single DataFrame used for every entry,
+        a mapping of source file name to DataFrame, or a `TableCollection`. Each entry is routed to the DataFrame
+        matching the file name in its `url`. If None, then will search for files according to the urls in YAML config, by default None
+    verbose : bool, optional
+        Whether to print progress, by default False
+    max_in_flight : int, optional
+        The maximum number of chunk transactions open at the same time, by default 4
+    kwargs : Any
+        Additional params, such as the deprecated `yaml_string`, which takes the place of `config`
+    """
+
+    if "yaml_string" in kwargs:
+        config = kwargs["yaml_string"]
+        warnings.warn(
+            "the yaml_string parameter will be depreciated in future releases. Please use the 'config' to identify the YAML file instead."
+        )
+    configuration = get_config(config)
+
+    # resolve every source before anything is written
+    dataframes = (
+        {
+            file["url"]: get_source_dataframe(dataframe, file["url"])
+            for file in configuration["files"]
+        }
+        if dataframe is not None
+        else dict()
+    )
+
+    server = AsyncLocalServer(max_in_flight=max_in_flight, config=configuration)
+    try:
+        await server.pre_ingest(verbose=verbose)
+        for file in configuration["files"]:
+            if dataframe is not None:
+                await server.load_dataframe(
+                    file, dataframe=dataframes[file["url"]], verbose=verbose
+                )
+            else:
+                await server.load_csv(file, verbose=verbose)
+        await server.post_ingest(verbose=verbose)
+    finally:
+        await server.close()
@@ -0,0 +1,415 @@
+"""
+This file contains the chunked readers for the Parquet, Arrow IPC and JSON sources supported by PyIngest,
+and the streaming decompression shared by the text based sources.
+"""
+
+import bz2
+import gzip
+import itertools
+import json
+import lzma
+from typing import IO, Any, Callable, Dict, Iterator, List, Optional
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None  # type: ignore[unused-ignore, assignment]
+    ipc = None  # type: ignore[unused-ignore, assignment]
+    pq = None  # type: ignore[unused-ignore, assignment]
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None  # type: ignore[unused-ignore, assignment]
+
+PARQUET_EXTENSIONS = (".parquet", ".pq")
+ARROW_EXTENSIONS = (".arrow", ".feather", ".ipc")
+JSONL_EXTENSIONS = (".jsonl", ".ndjson")
+JSON_EXTENSIONS = (".json",)
+COMPRESSION_EXTENSIONS = {
+    ".gz": "gzip",
+    ".gzip": "gzip",
+    ".bz2": "bz2",
+    ".xz": "xz",
+    ".zst": "zstd",
+    ".zstd": "zstd",
+}
+
+
+def get_compression(url: str) -> str:
+    """
+    The compression of a source, inferred from its file extension. One of "gzip", "bz2", "xz", "zstd" or "none".
+    """
+
+    for extension, compression in COMPRESSION_EXTENSIONS.items():
+        if url.lower().endswith(extension):
+            return compression
+    return "none"
+
+
+def get_source_format(url: str) -> str:
+    """
+    The format of a source, inferred from its file extension. One of "parquet", "arrow", "jsonl", "json" or "csv".
+    A compression extension, such as the ".gz" of "data.csv.gz", is ignored.
+    """
+
+    for extension in COMPRESSION_EXTENSIONS:
+        if url.lower().endswith(extension):
+            url = url[: -len(extension)]
+            break
+
+    if url.lower().endswith(PARQUET_EXTENSIONS):
+        return "parquet"
+    elif url.lower().endswith(ARROW_EXTENSIONS):
+        return "arrow"
+    elif url.lower().endswith(JSONL_EXTENSIONS):
+        return "jsonl"
+    elif url.lower().endswith(JSON_EXTENSIONS):
+        return "json"
+    return "csv"
+
+
+def open_source(url: str, compression: str = "none") -> IO[str]:
+    """
+    Open a text source for reading, decompressing it on the fly.
+    Nothing is decompressed to disk and only the buffers of the decompressor are held in memory.
+
+    Parameters
+    ----------
+    url : str
+        The location of the source.
+    compression : str, optional
+        One of "gzip", "bz2", "xz", "zstd" or "none". By default "none"
+
+    Returns
+    -------
+    IO[str]
+        The decompressed text stream.
+
+    Raises
+    ------
+    ValueError
+        If the compression is not supported.
+    """
+
+    if compression == "none":
+        return open(url)
+    elif compression == "gzip":
+        return gzip.open(url, "rt")
+    elif compression == "bz2":
+        return bz2.open(url, "rt")
+    elif compression == "xz":
+        return lzma.open(url, "rt")
+    elif compression == "zstd":
+        if zstandard is None:
+            raise ImportError(
+                "Could not import zstandard. "
+                "This is required to ingest zstd compressed files. "
+                "Please install it with `pip install zstandard`."
+            )
+        stream: IO[str] = zstandard.open(url, "rt")
+        return stream
+
+    raise ValueError(
+        f"Unsupported compression {compression} for {url}. Supported compressions are: gzip, bz2, xz, zstd and none."
+    )
+
+
+def _check_pyarrow() -> None:
+    if pa is None:
+        raise ImportError(
+            "Could not import pyarrow. "
+            "This is required to ingest Parquet and Arrow IPC files. "
+            "Please install it with `pip install pyarrow`."
+        )
+
+
+def _check_uncompressed(params: Dict[str, Any]) -> None:
+    # the columns of Parquet and Arrow IPC files are compressed internally, and the files are read with random access
+    if params["compression"] != "none":
+        raise ValueError(
+            f"Unsupported {params['compression']} compression for {params['url']}. "
+            "Parquet and Arrow IPC files must not be compressed as a whole, use the compression options of their writer instead."
+        )
+
+
+def _get_projection(
+    schema_names: List[str], columns: Optional[List[str]]
+) -> Optional[List[str]]:
+    # columns referenced by the statement but missing from the source are sent as null
+    if columns is None:
+        return None
+    return [column for column in schema_names if column in columns]
+
+
+def _without_decimals(type: "pa.DataType") -> "pa.DataType":
+    # the driver can not send the `decimal.Decimal` values of decimal columns, so they are sent as floats
+    if pa.types.is_decimal(type):
+        return pa.float64()
+    elif pa.types.is_list(type) or pa.types.is_large_list(type):
+        return pa.list_(_without_decimals(type.value_type))
+    elif pa.types.is_struct(type):
+        return pa.struct(
+            [field.with_type(_without_decimals(field.type)) for field in type]
+        )
+    return type
+
+
+def _to_dataframe(table: "pa.Table") -> pd.DataFrame:
+    schema = pa.schema(
+        [field.with_type(_without_decimals(field.type)) for field in table.schema]
+    )
+    if not schema.equals(table.schema):
+        table = table.cast(schema)
+    # Arrow backed columns keep their native types and nulls, so no string round trip is needed
+    return table.to_pandas(types_mapper=pd.ArrowDtype)
+
+
+def _rechunk_batches(
+    batches: Iterator["pa.RecordBatch"],
+    chunk_size: int,
+    get_chunk_size: Optional[Callable[[], int]] = None,
+    skip_records: int = 0,
+) -> Iterator[pd.DataFrame]:
+    """
+    Regroup a stream of Arrow record batches into chunks of the requested size,
+    holding no more than a single chunk and a single batch in memory.
+    """
+
+    buffered: List["pa.RecordBatch"] = list()
+    buffered_rows = 0
+    size = get_chunk_size() if get_chunk_size is not None else chunk_size
+
+    for batch in batches:
+        if skip_records >= batch.num_rows:
+            skip_records -= batch.num_rows
+            continue
+        if skip_records > 0:
+            batch = batch.slice(skip_records)
+            skip_records = 0
+
+        buffered.append(batch)
+        buffered_rows += batch.num_rows
+
+        while buffered_rows >= size:
+            table = pa.Table.from_batches(buffered)
+            yield _to_dataframe(table.slice(0, size))
+            remainder = table.slice(size)
+            buffered = remainder.to_batches()
+            buffered_rows = remainder.num_rows
+            size = get_chunk_size() if get_chunk_size is not None else chunk_size
+
+    if buffered_rows > 0:
+        yield _to_dataframe(pa.Table.from_batches(buffered))
+
+
+def read_parquet_chunks(
+    params: Dict[str, Any], get_chunk_size: Optional[Callable[[], int]] = None
+) -> Iterator[pd.DataFrame]:
+    """
+    Lazily read a Parquet file row group by row group, in chunks of `params["chunk_size"]` rows.
+    Only the columns referenced by the statement are read, and row groups that fall
+    entirely within `params["skip_records"]` are not read at all.
+
+    Parameters
+    ----------
+    params : Dict[str, Any]
+        The file parameters returned by `LocalServer.get_params`.
+    get_chunk_size : Optional[Callable[[], int]], optional
+        If provided, is called before each chunk is read to decide its size, by default None
+
+    Returns
+    -------
+    Iterator[pd.DataFrame]
+        The chunks.
+
+    Raises
+    ------
+    ValueError
+        If `params["compression"]` is not "none", as Parquet files are compressed internally.
+    """
+
+    _check_pyarrow()
+    _check_uncompressed(params)
+
+    parquet_file = pq.ParquetFile(params["url"])
+    columns = _get_projection(parquet_file.schema_arrow.names, params["columns"])
+
+    def batches() -> Iterator["pa.RecordBatch"]:
+        skip_records = params["skip_records"]
+        for i in range(parquet_file.num_row_groups):
+            num_rows = parquet_file.metadata.row_group(i).num_rows
+            if skip_records >= num_rows:
+                skip_records -= num_rows
+                continue
+            row_group = parquet_file.read_row_group(i, columns=columns)
+            if skip_records > 0:
+                row_group = row_group.slice(skip_records)
+                skip_records = 0
+            yield from row_group.to_batches()
+
+    yield from _rechunk_batches(
+        batches(), chunk_size=params["chunk_size"], get_chunk_size=get_chunk_size
+    )
+
+
+def read_arrow_chunks(
+    params: Dict[str, Any], get_chunk_size: Optional[Callable[[], int]] = None
+) -> Iterator[pd.DataFrame]:
+    """
+    Lazily read an Arrow IPC file or stream record batch by record batch, in chunks of `params["chunk_size"]` rows.
+    The file is memory mapped and only the columns referenced by the statement are converted.
+
+    Parameters
+    ----------
+    params : Dict[str, Any]
+        The file parameters returned by `LocalServer.get_params`.
+    get_chunk_size : Optional[Callable[[], int]], optional
+        If provided, is called before each chunk is read to decide its size, by default None
+
+    Returns
+    -------
+    Iterator[pd.DataFrame]
+        The chunks.
+
+    Raises
+    ------
+    ValueError
+        If `params["compression"]` is not "none", as Arrow IPC files are compressed internally.
+    """
+
+    _check_pyarrow()
+    _check_uncompressed(params)
+
+    with pa.memory_map(params["url"], "r") as source:
+        try:
+            reader = ipc.open_file(source)
+            batches: Iterator["pa.RecordBatch"] = (
+                reader.get_batch(i) for i in range(reader.num_record_batches)
+            )
+            schema = reader.schema
+        except pa.ArrowInvalid:
+            source.seek(0)
+            stream = ipc.open_stream(source)
+            batches = iter(stream)
+            schema = stream.schema
+
+        columns = _get_projection(schema.names, params["columns"])
+        if columns is not None:
+            batches = (batch.select(columns) for batch in batches)
+
+        yield from _rechunk_batches(
+            batches,
+            chunk_size=params["chunk_size"],
+            get_chunk_size=get_chunk_size,
+            skip_records=params["skip_records"],
+        )
+
+
+def flatten_record(
+    record: Dict[str, Any], separator: str = "_", max_level: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Flatten the nested objects of a JSON record into top level keys joined by `separator`.
+    For example {"owner": {"name": "Bob"}} becomes {"owner_name": "Bob"}.
+    Lists are kept as they are.
+
+    Parameters
+    ----------
+    record : Dict[str, Any]
+        The JSON record.
+    separator : str, optional
+        The string used to join nested keys, by default "_"
+    max_level : Optional[int], optional
+        The number of levels to flatten. Objects below this level are kept as maps,
+        which Cypher can still access with `row.key.nested_key`. If None, then all levels are flattened. By default None
+
+    Returns
+    -------
+    Dict[str, Any]
+        The flattened record.
+    """
+
+    flattened: Dict[str, Any] = dict()
+    for key, value in record.items():
+        if isinstance(value, dict) and (max_level is None or max_level > 0):
+            nested = flatten_record(
+                value,
+                separator=separator,
+                max_level=max_level - 1 if max_level is not None else None,
+            )
+            for nested_key, nested_value in nested.items():
+                flattened[f"{key}{separator}{nested_key}"] = nested_value
+        else:
+            flattened[key] = value
+
+    return flattened
+
+
+def _to_records_dataframe(
+    records: List[Dict[str, Any]], params: Dict[str, Any]
+) -> pd.DataFrame:
+    flattened = [
+        flatten_record(
+            record,
+            separator=params["flatten_separator"],
+            max_level=params["flatten_max_level"],
+        )
+        for record in records
+    ]
+    if params["columns"] is not None:
+        flattened = [
+            {column: record[column] for column in params["columns"] if column in record}
+            for record in flattened
+        ]
+
+    # object dtype keeps ints, bools and lists as they were parsed, even next to missing values
+    return pd.DataFrame(flattened, dtype=object)
+
+
+def read_json_chunks(
+    params: Dict[str, Any], get_chunk_size: Optional[Callable[[], int]] = None
+) -> Iterator[pd.DataFrame]:
+    """
+    Lazily read a JSON Lines file in chunks of `params["chunk_size"]` records,
+    holding no more than a single chunk in memory. A JSON file holding an array of records,
+    or a column oriented object, is read whole and then chunked. Nested objects are flattened according to `params["flatten_separator"]`
+    and `params["flatten_max_level"]`, and only the columns referenced by the statement are kept.
+
+    Parameters
+    ----------
+    params : Dict[str, Any]
+        The file parameters returned by `LocalServer.get_params`.
+    get_chunk_size : Optional[Callable[[], int]], optional
+        If provided, is called before each chunk is read to decide its size, by default None
+
+    Returns
+    -------
+    Iterator[pd.DataFrame]
+        The chunks.
+    """
+
+    with open_source(params["url"], compression=params["compression"]) as openfile:
+        if params["format"] == "json":
+            data = json.load(openfile)
+            # a column oriented object, as written by `pd.DataFrame.to_json`
+            if isinstance(data, dict):
+                data = pd.DataFrame(data).to_dict(orient="records")
+            records: Iterator[Dict[str, Any]] = iter(data)
+        else:
+            records = (json.loads(line) for line in openfile if line.strip())
+
+        records = itertools.islice(records, params["skip_records"], None)
+
+        while True:
+            size = (
+                get_chunk_size() if get_chunk_size is not None else params["chunk_size"]
+            )
+            chunk = list(itertools.islice(records, size))
+            if not chunk:
+                return
+            yield _to_records_dataframe(chunk, params)
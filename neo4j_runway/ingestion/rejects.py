@@ -0,0 +1,86 @@
+"""
+This file contains the handling of rows that Neo4j refuses to ingest.
+"""
+
+import datetime
+import json
+import threading
+from typing import Any, Dict
+
+import pandas as pd
+from neo4j.exceptions import Neo4jError
+
+from .conversion import to_parameter_rows
+
+# Errors caused by the values of individual rows, rather than by the statement or the server.
+DATA_ERROR_CODES = (
+    "Neo.ClientError.Schema.ConstraintValidationFailed",
+    "Neo.ClientError.Statement.ArgumentError",
+    "Neo.ClientError.Statement.ArithmeticError",
+    "Neo.ClientError.Statement.SemanticError",
+    "Neo.ClientError.Statement.TypeError",
+)
+
+
+def is_data_error(error: Neo4jError) -> bool:
+    """
+    Whether an error was caused by the data in a chunk, in which case retrying the same rows will not help.
+    """
+
+    return error.code is not None and error.code.startswith(DATA_ERROR_CODES)
+
+
+class RejectWriter:
+    """
+    Appends rejected rows to a JSON Lines file. Safe to use from multiple threads.
+    Each line holds the source `url`, the `cql` statement, the `error` message, the `timestamp` and the rejected `row`.
+
+    Attributes
+    ----------
+    file_path : str
+        The location of the reject file.
+    rejected_count : int
+        The number of rows written during this run.
+    """
+
+    def __init__(self, file_path: str) -> None:
+        self.file_path = file_path
+        self.rejected_count = 0
+        self._lock = threading.Lock()
+
+    def write(
+        self, params: Dict[str, Any], rows: pd.DataFrame, error: Exception
+    ) -> None:
+        """
+        Record rejected rows.
+
+        Parameters
+        ----------
+        params : Dict[str, Any]
+            The file parameters returned by `LocalServer.get_params`.
+        rows : pd.DataFrame
+            The rejected rows.
+        error : Exception
+            The error raised for the rows.
+        """
+
+        timestamp = datetime.datetime.now().isoformat()
+        lines = [
+            json.dumps(
+                {
+                    "url": params["url"],
+                    "cql": params["cql"],
+                    "error": str(error),
+                    "timestamp": timestamp,
+                    "row": row,
+                },
+                default=str,
+            )
+            for row in to_parameter_rows(rows)
+        ]
+
+        with self._lock:
+            with open(self.file_path, "a") as f:
+                for line in lines:
+                    f.write(line + "\n")
+            self.rejected_count += len(lines)
@@ -0,0 +1,204 @@
+"""
+This file contains the dependency-aware scheduler used by PyIngest to run file entries concurrently.
+"""
+
+import re
+import warnings
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Set, TypeVar
+
+T = TypeVar("T")
+
+_LABEL = r"\(\s*\w*\s*:\s*(`[^`]+`|\w+)"
+MERGE_NODE_PATTERN = re.compile(r"\bMERGE\s*" + _LABEL, re.IGNORECASE)
+MATCH_NODE_PATTERN = re.compile(r"\bMATCH\s*" + _LABEL, re.IGNORECASE)
+
+
+def _strip_backticks(label: str) -> str:
+    return label[1:-1] if label.startswith("`") else label
+
+
+def get_merged_labels(cql: str) -> Set[str]:
+    """
+    Find the node labels that are written by MERGE clauses in a Cypher statement.
+
+    Parameters
+    ----------
+    cql : str
+        The Cypher statement.
+
+    Returns
+    -------
+    Set[str]
+        The node labels.
+    """
+
+    return {_strip_backticks(x) for x in MERGE_NODE_PATTERN.findall(cql)}
+
+
+def get_matched_labels(cql: str) -> Set[str]:
+    """
+    Find the node labels that are read by MATCH clauses in a Cypher statement.
+
+    Parameters
+    ----------
+    cql : str
+        The Cypher statement.
+
+    Returns
+    -------
+    Set[str]
+        The node labels.
+    """
+
+    return {_strip_backticks(x) for x in MATCH_NODE_PATTERN.findall(cql)}
+
+
+def build_dependency_graph(statements: List[str]) -> Dict[int, Set[int]]:
+    """
+    Build a dependency graph for a list of Cypher statements.
+    A statement depends on every other statement that MERGEs a node label it MATCHes on.
+    Labels that are matched, but never merged, are assumed to already exist in the database.
+
+    Parameters
+    ----------
+    statements : List[str]
+        The Cypher statements, in configuration order.
+
+    Returns
+    -------
+    Dict[int, Set[int]]
+        A map of statement index to the indexes of the statements it depends on.
+    """
+
+    merged = [get_merged_labels(cql) for cql in statements]
+
+    dependencies: Dict[int, Set[int]] = dict()
+    for idx, cql in enumerate(statements):
+        matched = get_matched_labels(cql)
+        dependencies[idx] = {
+            other
+            for other, labels in enumerate(merged)
+            if other != idx and matched.intersection(labels)
+        }
+
+    return dependencies
+
+
+def run_scheduled(
+    tasks: List[T],
+    dependencies: Dict[int, Set[int]],
+    worker: Callable[[T], Any],
+    max_workers: int = 1,
+) -> None:
+    """
+    Run tasks on a thread pool, only starting a task once all of its dependencies have completed.
+    Ready tasks are started in list order. If a dependency cycle leaves no task ready, the first remaining task
+    is started once the running tasks have finished, as if the tasks were run in list order.
+    If a task raises an exception, no new tasks are started and the exception is raised once the running tasks have finished.
+
+    Parameters
+    ----------
+    tasks : List[T]
+        The tasks to run.
+    dependencies : Dict[int, Set[int]]
+        A map of task index to the indexes of the tasks it depends on.
+    worker : Callable[[T], Any]
+        The function to run on each task.
+    max_workers : int, optional
+        The number of tasks that may run at the same time, by default 1
+    """
+
+    pending: Set[int] = set(range(len(tasks)))
+    completed: Set[int] = set()
+    running: Dict[Future[Any], int] = dict()
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        while pending or running:
+            ready = sorted(
+                idx
+                for idx in pending
+                if dependencies.get(idx, set()).issubset(completed)
+            )
+            if not ready and not running:
+                ready = [_break_cycle(pending)]
+            for idx in ready[: max(1, max_workers) - len(running)]:
+                pending.remove(idx)
+                running[executor.submit(worker, tasks[idx])] = idx
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                idx = running.pop(future)
+                exception = future.exception()
+                if exception is not None:
+                    wait(running)
+                    raise exception
+                completed.add(idx)
+
+
+def _break_cycle(pending: Set[int]) -> int:
+    warnings.warn(
+        f"The statements {sorted(pending)} depend on each other in a cycle, so the first of them is run before its dependencies."
+    )
+    return min(pending)
+
+
+def topological_order(dependencies: Dict[int, Set[int]]) -> List[int]:
+    """
+    Order the indexes of a dependency graph so that every index comes after its dependencies.
+    Ties are broken by index order, and a dependency cycle is broken by taking its first remaining index.
+
+    Parameters
+    ----------
+    dependencies : Dict[int, Set[int]]
+        A map of index to the indexes it depends on.
+
+    Returns
+    -------
+    List[int]
+        The ordered indexes.
+    """
+
+    ordered: List[int] = list()
+    pending = set(dependencies.keys())
+    while pending:
+        ready = sorted(idx for idx in pending if dependencies[idx].issubset(ordered))
+        if not ready:
+            ready = [_break_cycle(pending)]
+        ordered.append(ready[0])
+        pending.remove(ready[0])
+
+    return ordered
+
+
+def collapse_dependency_graph(
+    dependencies: Dict[int, Set[int]], groups: List[List[int]]
+) -> Dict[int, Set[int]]:
+    """
+    Collapse a statement dependency graph into a dependency graph between groups of statements.
+    A group depends on another group if any of its statements depends on a statement in the other group.
+
+    Parameters
+    ----------
+    dependencies : Dict[int, Set[int]]
+        A map of statement index to the indexes of the statements it depends on.
+    groups : List[List[int]]
+        The statement indexes that belong to each group.
+
+    Returns
+    -------
+    Dict[int, Set[int]]
+        A map of group index to the indexes of the groups it depends on.
+    """
+
+    group_of = {idx: group for group, members in enumerate(groups) for idx in members}
+
+    return {
+        group: {
+            group_of[dependency]
+            for idx in members
+            for dependency in dependencies.get(idx, set())
+            if group_of[dependency] != group
+        }
+        for group, members in enumerate(groups)
+    }
@@ -0,0 +1,207 @@
+"""
+This file contains the external sort used by PyIngest to load relationship rows in source node key order.
+Consecutive rows then look up neighboring source nodes, so the batches of a relationship statement touch fewer pages of the store.
+Windows of rows that fit in a memory budget are sorted and spilled to temporary files, which are then merged block by block.
+"""
+
+import os
+import pickle
+import tempfile
+from typing import Callable, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# the default memory in bytes used to sort a source before spilling sorted runs to disk
+DEFAULT_MAX_SORT_MEMORY = 256 * 1024**2
+
+# joins the values of a composite key, so keys compare column by column
+SORT_KEY_SEPARATOR = "\x1f"
+
+SortedBlock = Tuple[pd.DataFrame, "pd.Series[str]"]
+
+
+def get_sort_keys(rows: pd.DataFrame, key_columns: List[str]) -> "pd.Series[str]":
+    """
+    The sort key of each row, its key values as a single string.
+    Any consistent order groups the rows of a node together, so values are compared as strings whatever their type.
+
+    Parameters
+    ----------
+    rows : pd.DataFrame
+        The rows.
+    key_columns : List[str]
+        The columns to sort by.
+
+    Returns
+    -------
+    pd.Series[str]
+        The sort keys, with the index of `rows`.
+    """
+
+    values = [rows[column].astype(str) for column in key_columns]
+    if len(values) == 1:
+        return values[0]
+    return values[0].str.cat(values[1:], sep=SORT_KEY_SEPARATOR)
+
+
+def _sort_window(frames: List[pd.DataFrame], key_columns: List[str]) -> SortedBlock:
+    rows = pd.concat(frames, ignore_index=True)
+    keys = get_sort_keys(rows, key_columns)
+    # a stable sort keeps rows of the same key in source order, so later rows still overwrite earlier ones
+    order = np.argsort(keys.to_numpy(), kind="stable")
+    return rows.iloc[order], keys.iloc[order]
+
+
+def _write_run(block: SortedBlock, file_path: str, block_rows: int) -> None:
+    rows, keys = block
+    with open(file_path, "wb") as run:
+        for start in range(0, len(rows), block_rows):
+            pickle.dump(
+                (
+                    rows.iloc[start : start + block_rows],
+                    keys.iloc[start : start + block_rows],
+                ),
+                run,
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )
+
+
+def _read_run(file_path: str) -> Iterator[SortedBlock]:
+    with open(file_path, "rb") as run:
+        while True:
+            try:
+                block: SortedBlock = pickle.load(run)
+            except EOFError:
+                return
+            yield block
+
+
+def _merge_runs(file_paths: List[str]) -> Iterator[pd.DataFrame]:
+    """
+    Merge sorted runs, holding a single block of each run in memory.
+    Every round emits the rows up to the smallest last key of the held blocks, which no later block can precede.
+    Rows sharing that key are emitted in run order, and runs after the first one that may hold more of them wait,
+    so rows of the same key keep their source order.
+    """
+
+    readers = [_read_run(file_path) for file_path in file_paths]
+    blocks: List[Optional[SortedBlock]] = [next(reader, None) for reader in readers]
+
+    while True:
+        held = [(i, block) for i, block in enumerate(blocks) if block is not None]
+        if not held:
+            return
+
+        frontier = min(keys.iloc[-1] for _, (_, keys) in held)
+        # the first run whose block ends on the frontier may continue with it in its next block
+        waiting_from = min(i for i, (_, keys) in held if keys.iloc[-1] == frontier)
+
+        parts: List[SortedBlock] = list()
+        for i, (rows, keys) in held:
+            take = (
+                keys <= frontier if i <= waiting_from else keys < frontier
+            ).to_numpy()
+            parts.append((rows[take], keys[take]))
+            blocks[i] = (
+                next(readers[i], None) if take.all() else (rows[~take], keys[~take])
+            )
+
+        rows = pd.concat([part[0] for part in parts])
+        keys = pd.concat([part[1] for part in parts])
+        yield rows.iloc[np.argsort(keys.to_numpy(), kind="stable")]
+
+
+def _rechunk(
+    frames: Iterator[pd.DataFrame],
+    chunk_size: int,
+    get_chunk_size: Optional[Callable[[], int]] = None,
+    skip_rows: int = 0,
+) -> Iterator[pd.DataFrame]:
+    def next_size() -> int:
+        return get_chunk_size() if get_chunk_size is not None else chunk_size
+
+    buffer: List[pd.DataFrame] = list()
+    buffered = 0
+    size = next_size()
+    for frame in frames:
+        if skip_rows > 0:
+            skipped = min(skip_rows, len(frame))
+            frame = frame.iloc[skipped:]
+            skip_rows -= skipped
+        buffer.append(frame)
+        buffered += len(frame)
+
+        while buffered >= size:
+            rows = pd.concat(buffer) if len(buffer) > 1 else buffer[0]
+            yield rows.iloc[:size].reset_index(drop=True)
+            buffer = [rows.iloc[size:]]
+            buffered -= size
+            size = next_size()
+
+    if buffered > 0:
+        yield pd.concat(buffer).reset_index(drop=True)
+
+
+def sort_chunks(
+    chunks: Iterator[pd.DataFrame],
+    key_columns: List[str],
+    chunk_size: int,
+    get_chunk_size: Optional[Callable[[], int]] = None,
+    max_memory: int = DEFAULT_MAX_SORT_MEMORY,
+    skip_rows: int = 0,
+    spill_directory: Optional[str] = None,
+) -> Iterator[pd.DataFrame]:
+    """
+    Lazily sort the chunks of a source by key with an external merge sort, and split the sorted rows into chunks again.
+    A source that fits in `max_memory` is sorted in memory. Otherwise each window of `max_memory` bytes is sorted
+    and spilled to a temporary file, and the files are merged holding a block of `chunk_size` rows of each.
+    Sorting is stable, so rows of the same key keep their source order.
+
+    Parameters
+    ----------
+    chunks : Iterator[pd.DataFrame]
+        The chunks of a source, in source order.
+    key_columns : List[str]
+        The columns to sort by.
+    chunk_size : int
+        The number of rows of each sorted chunk.
+    get_chunk_size : Optional[Callable[[], int]], optional
+        If provided, is called before each sorted chunk to decide its size, by default None
+    max_memory : int, optional
+        The approximate memory in bytes of the rows held while sorting a window. By default 256 MiB
+    skip_rows : int, optional
+        The number of sorted rows to skip, such as those committed before a run was resumed, by default 0
+    spill_directory : Optional[str], optional
+        Where the sorted windows are spilled. If None, then the system temporary directory. By default None
+
+    Returns
+    -------
+    Iterator[pd.DataFrame]
+        The chunks, in key order.
+    """
+
+    with tempfile.TemporaryDirectory(dir=spill_directory) as directory:
+        runs: List[str] = list()
+        window: List[pd.DataFrame] = list()
+        window_memory = 0
+        for rows in chunks:
+            window.append(rows)
+            window_memory += int(rows.memory_usage(deep=True).sum())
+            if window_memory >= max_memory:
+                runs.append(os.path.join(directory, f"run_{len(runs)}.pkl"))
+                _write_run(_sort_window(window, key_columns), runs[-1], chunk_size)
+                window, window_memory = list(), 0
+
+        if runs and window:
+            runs.append(os.path.join(directory, f"run_{len(runs)}.pkl"))
+            _write_run(_sort_window(window, key_columns), runs[-1], chunk_size)
+
+        if runs:
+            frames = _merge_runs(runs)
+        else:
+            frames = iter([_sort_window(window, key_columns)[0]] if window else [])
+
+        yield from _rechunk(
+            frames, chunk_size, get_chunk_size=get_chunk_size, skip_rows=skip_rows
+        )
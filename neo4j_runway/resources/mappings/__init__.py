@@ -1,6 +1,7 @@
 from .type_mappings import (
     TYPES_MAP_NEO4J_TO_PYTHON,
     TYPES_MAP_PYTHON_TO_NEO4J,
+    TYPES_MAP_PYTHON_TO_NEO4J_ADMIN_IMPORT,
     TYPES_MAP_PYTHON_TO_SOLUTIONS_WORKBENCH,
     TYPES_MAP_SOLUTIONS_WORKBENCH_TO_PYTHON,
     PythonTypeEnum,
@@ -9,6 +10,7 @@ from .type_mappings import (
 __all__ = [
     "TYPES_MAP_NEO4J_TO_PYTHON",
     "TYPES_MAP_PYTHON_TO_NEO4J",
+    "TYPES_MAP_PYTHON_TO_NEO4J_ADMIN_IMPORT",
     "TYPES_MAP_SOLUTIONS_WORKBENCH_TO_PYTHON",
     "TYPES_MAP_PYTHON_TO_SOLUTIONS_WORKBENCH",
     "PythonTypeEnum",
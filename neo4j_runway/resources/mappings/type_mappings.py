@@ -86,3 +86,30 @@ TYPES_MAP_SOLUTIONS_WORKBENCH_TO_PYTHON = {
 TYPES_MAP_PYTHON_TO_SOLUTIONS_WORKBENCH = {
     v: k for k, v in TYPES_MAP_SOLUTIONS_WORKBENCH_TO_PYTHON.items()
 }
+
+# header types of the neo4j-admin import tool. Types without an equivalent are imported as strings
+TYPES_MAP_PYTHON_TO_NEO4J_ADMIN_IMPORT = {
+    "List": "string[]",
+    "Dict": "string",
+    "bool": "boolean",
+    "int": "long",
+    "float": "double",
+    "str": "string",
+    "bytearray": "string",
+    "Date": "date",
+    "Time": "time",
+    "DateTime": "datetime",
+    "Duration": "duration",
+    "Point": "point",
+    "CartesianPoint": "point",
+    "WGS84Point": "point",
+    "unknown": "string",
+    "List[bool]": "boolean[]",
+    "List[int]": "long[]",
+    "List[float]": "double[]",
+    "List[str]": "string[]",
+    "List[Date]": "date[]",
+    "List[DateTime]": "datetime[]",
+    "List[Duration]": "duration[]",
+    "List[Point]": "point[]",
+}
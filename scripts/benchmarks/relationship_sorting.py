@@ -0,0 +1,156 @@
+"""
+Benchmark loading relationship rows in file order against loading them sorted by source node key.
+
+Generates a synthetic power-law graph: source nodes are drawn from a Zipf distribution, so a few hub nodes
+own most relationships, as in many real graphs, and rows are shuffled as they would be in an export.
+Without a database, reports the client cost of the external sort and the locality of each batch:
+the distinct source nodes a batch looks up and the span of node IDs it touches.
+With --uri, also loads the nodes and then the relationships twice, in file order and sorted, and reports rows/s.
+Nodes are created in key order, so nodes with neighboring keys are stored in neighboring records.
+
+Usage: python3 scripts/benchmarks/relationship_sorting.py --nodes=100000 --relationships=1000000 --chunk_size=1000
+       python3 scripts/benchmarks/relationship_sorting.py --uri=bolt://localhost:7687 --user=neo4j --password=password
+"""
+
+import argparse
+import time
+from typing import Any, Dict, Iterator
+
+import numpy as np
+import pandas as pd
+from neo4j import GraphDatabase
+
+from neo4j_runway.ingestion import Ingestor
+from neo4j_runway.ingestion.pyingest import split_dataframe
+from neo4j_runway.ingestion.sorting import sort_chunks
+
+NODE_CQL = """WITH $dict.rows AS rows
+UNWIND rows AS row
+MERGE (n:Account {id: row.id})"""
+
+RELATIONSHIP_CQL = """WITH $dict.rows AS rows
+UNWIND rows AS row
+MATCH (source:Account {id: row.source})
+MATCH (target:Account {id: row.target})
+MERGE (source)-[n:TRANSFERRED_TO]->(target)"""
+
+
+def create_data(
+    num_nodes: int, num_relationships: int, exponent: float
+) -> pd.DataFrame:
+    rng = np.random.default_rng(42)
+    # zero padded, so the string order of keys is the order the nodes are created in
+    width = len(str(num_nodes))
+    sources = (rng.zipf(exponent, num_relationships) - 1) % num_nodes
+    targets = rng.integers(0, num_nodes, num_relationships)
+    return pd.DataFrame(
+        {
+            "source": pd.Series(sources).astype(str).str.zfill(width),
+            "target": pd.Series(targets).astype(str).str.zfill(width),
+        }
+    )
+
+
+def report_locality(name: str, chunks: Iterator[pd.DataFrame]) -> None:
+    start = time.perf_counter()
+    distinct = list()
+    spans = list()
+    for chunk in chunks:
+        ids = chunk["source"].astype(int)
+        distinct.append(ids.nunique())
+        spans.append(ids.max() - ids.min())
+    seconds = time.perf_counter() - start
+
+    print(
+        f"{name:<10} client: {seconds:6.2f} s   distinct sources / batch: {np.mean(distinct):8.1f}   "
+        f"source ID span / batch: {np.mean(spans):10.0f}"
+    )
+
+
+def get_config(args: argparse.Namespace, cql: str, url: str) -> Dict[str, Any]:
+    return {
+        "server_uri": args.uri,
+        "admin_user": args.user,
+        "admin_pass": args.password,
+        "database": args.database,
+        "files": [{"url": url, "cql": cql, "chunk_size": args.chunk_size}],
+    }
+
+
+def load(
+    args: argparse.Namespace,
+    name: str,
+    nodes: pd.DataFrame,
+    relationships: pd.DataFrame,
+    sort_relationships: bool,
+    max_sort_memory: int,
+) -> None:
+    with GraphDatabase.driver(args.uri, auth=(args.user, args.password)) as driver:
+        with driver.session(database=args.database) as session:
+            session.run(
+                "MATCH (n:Account) CALL { WITH n DETACH DELETE n } IN TRANSACTIONS"
+            ).consume()
+            session.run(
+                "CREATE CONSTRAINT account_id IF NOT EXISTS FOR (n:Account) REQUIRE n.id IS UNIQUE"
+            ).consume()
+            session.run("CALL db.awaitIndexes(300)").consume()
+
+    with Ingestor(
+        args.uri, args.user, args.password, database=args.database
+    ) as ingestor:
+        ingestor.ingest(get_config(args, NODE_CQL, "accounts.csv"), dataframe=nodes)
+        metrics = ingestor.ingest(
+            get_config(args, RELATIONSHIP_CQL, "transfers.csv"),
+            dataframe=relationships,
+            sort_relationships=sort_relationships,
+            max_sort_memory=max_sort_memory,
+        )
+
+    (statement,) = metrics.statements.values()
+    print(
+        f"{name:<10} load: {statement.elapsed_seconds:8.2f} s   {statement.rows_per_second:10.0f} rows/s   "
+        f"p95 batch latency: {statement.latency_p95:6.3f} s"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--nodes", type=int, default=100_000)
+    parser.add_argument("--relationships", type=int, default=1_000_000)
+    parser.add_argument("--exponent", type=float, default=1.5)
+    parser.add_argument("--chunk_size", type=int, default=1000)
+    parser.add_argument("--max_sort_memory", type=int, default=16 * 1024**2)
+    parser.add_argument("--uri", type=str, default=None)
+    parser.add_argument("--user", type=str, default="neo4j")
+    parser.add_argument("--password", type=str, default="password")
+    parser.add_argument("--database", type=str, default=None)
+    args = parser.parse_args()
+
+    relationships = create_data(args.nodes, args.relationships, args.exponent)
+    print(
+        f"{args.nodes} nodes, {args.relationships} relationships, Zipf exponent {args.exponent}, "
+        f"{args.max_sort_memory / 1024**2:.0f} MiB sort budget"
+    )
+    report_locality("file order", split_dataframe(relationships, args.chunk_size))
+    # sorting from chunks of the source, as when reading a file, so the external sort spills to disk
+    report_locality(
+        "sorted",
+        sort_chunks(
+            split_dataframe(relationships, 100_000),
+            key_columns=["source"],
+            chunk_size=args.chunk_size,
+            max_memory=args.max_sort_memory,
+        ),
+    )
+
+    if args.uri is not None:
+        width = len(str(args.nodes))
+        nodes = pd.DataFrame(
+            {"id": pd.Series(range(args.nodes)).astype(str).str.zfill(width)}
+        )
+        load(args, "file order", nodes, relationships, False, args.max_sort_memory)
+        load(args, "sorted", nodes, relationships, True, args.max_sort_memory)
+
+
+if __name__ == "__main__":
+    main()
@@ -12,6 +12,7 @@ from neo4j_runway import (
     UserInput,
 )
 from neo4j_runway.code_generation import (
+    AdminImportGenerator,
     LoadCSVCodeGenerator,
     PyIngestConfigGenerator,
     StandardCypherCodeGenerator,
@@ -90,6 +91,11 @@ CLASS_DIR = [
         "file_path": "api/code_generator/load_csv_code_generator.md",
         "summary_file_path": "load_csv_code_generator.md",
     },
+    {
+        "class": AdminImportGenerator,
+        "file_path": "api/code_generator/admin_import_generator.md",
+        "summary_file_path": "admin_import_generator.md",
+    },
     {
         "class": StandardCypherCodeGenerator,
         "file_path": "api/code_generator/standard_cypher_code_generator.md",
@@ -0,0 +1,170 @@
+import os
+import tempfile
+import unittest
+
+import pandas as pd
+
+from neo4j_runway.code_generation import AdminImportGenerator
+from neo4j_runway.exceptions import AdminImportGenerationError
+from neo4j_runway.models import DataModel, Node, Property, Relationship
+
+people = pd.DataFrame(
+    {
+        "name": ["Bob", "Ben", "Bob", None],
+        "age": [25, None, 26, 30],
+        "pet_name": ["Benny", "Spike", "Benny", "Mia"],
+        "knows": ["Ben", "Bob", "Ben", "Bob"],
+    }
+)
+pets = pd.DataFrame(
+    {"pet_name": ["Benny", "Spike", "Mia"], "tags": [["a", "b"], ["c"], list()]}
+)
+
+nodes = [
+    Node(
+        label="Person",
+        properties=[
+            Property(
+                name="name",
+                type="str",
+                column_mapping="name",
+                alias="knows",
+                is_unique=True,
+            ),
+            Property(name="age", type="int", column_mapping="age"),
+        ],
+        source_name="people.csv",
+    ),
+    Node(
+        label="Pet",
+        properties=[
+            Property(
+                name="name",
+                type="str",
+                column_mapping="pet_name",
+                is_unique=True,
+            ),
+            Property(name="tags", type="List[str]", column_mapping="tags"),
+        ],
+        source_name="pets.csv",
+    ),
+]
+relationships = [
+    Relationship(
+        type="HAS_PET",
+        source="Person",
+        target="Pet",
+        source_name="people.csv",
+    ),
+    Relationship(
+        type="KNOWS",
+        source="Person",
+        target="Person",
+        source_name="people.csv",
+    ),
+]
+
+data_model = DataModel(nodes=nodes, relationships=relationships)
+
+
+class TestAdminImportGeneration(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.gen = AdminImportGenerator(
+            data_model=data_model,
+            dataframe={"people.csv": people, "pets.csv": pets},
+            file_output_directory="output/",
+            import_directory="/import",
+        )
+
+    def test_node_dataframe(self) -> None:
+        nodes = self.gen.generate_node_dataframe(data_model.node_dict["Person"])
+
+        self.assertEqual(
+            list(nodes.columns), [":ID(Person)", "name:string", "age:long"]
+        )
+        # the last row of a key wins and rows without a key are dropped
+        self.assertEqual(nodes[":ID(Person)"].tolist(), ["Ben", "Bob"])
+        self.assertEqual(nodes["age:long"].isna().tolist(), [True, False])
+        self.assertEqual(nodes["age:long"].iloc[1], 26)
+
+    def test_list_properties_use_array_delimiter(self) -> None:
+        nodes = self.gen.generate_node_dataframe(data_model.node_dict["Pet"])
+
+        self.assertEqual(nodes["tags:string[]"].tolist(), ["a;b", "c", ""])
+
+    def test_relationship_dataframe(self) -> None:
+        has_pet = self.gen.generate_relationship_dataframe(relationships[0])
+        knows = self.gen.generate_relationship_dataframe(relationships[1])
+
+        self.assertEqual(
+            has_pet.values.tolist(),
+            [["Ben", "Spike"], ["Bob", "Benny"]],
+        )
+        self.assertEqual(list(knows.columns), [":START_ID(Person)", ":END_ID(Person)"])
+        self.assertEqual(knows.values.tolist(), [["Ben", "Bob"], ["Bob", "Ben"]])
+
+    def test_import_command(self) -> None:
+        self.assertEqual(
+            self.gen.generate_import_command_string(),
+            """neo4j-admin database import full \\
+    --nodes=Person=/import/person_header.csv,/import/person.csv \\
+    --nodes=Pet=/import/pet_header.csv,/import/pet.csv \\
+    --relationships=HAS_PET=/import/has_pet_person_pet_header.csv,/import/has_pet_person_pet.csv \\
+    --relationships=KNOWS=/import/knows_person_person_header.csv,/import/knows_person_person.csv \\
+    --array-delimiter=";" \\
+    --skip-bad-relationships=true \\
+    neo4j
+""",
+        )
+
+    def test_generate_import_files(self) -> None:
+        with tempfile.TemporaryDirectory() as output:
+            gen = AdminImportGenerator(
+                data_model=data_model,
+                dataframe={"people.csv": people, "pets.csv": pets},
+                file_output_directory=output,
+            )
+            gen.generate_import_files()
+
+            with open(os.path.join(output, "person_header.csv")) as header:
+                self.assertEqual(header.read(), ":ID(Person),name:string,age:long\n")
+            with open(os.path.join(output, "person.csv")) as data:
+                self.assertEqual(data.read(), "Ben,Ben,\nBob,Bob,26\n")
+
+    def test_integer_keys_keep_precision(self) -> None:
+        account = Node(
+            label="Account",
+            properties=[
+                Property(name="id", type="int", column_mapping="id", is_unique=True)
+            ],
+            source_name="accounts.csv",
+        )
+        gen = AdminImportGenerator(
+            data_model=DataModel(nodes=[account], relationships=list()),
+            dataframe={
+                "accounts.csv": pd.DataFrame(
+                    {"id": ["1234567890123456789", "1234567890123456788"]}
+                )
+            },
+        )
+
+        nodes = gen.generate_node_dataframe(account)
+
+        self.assertEqual(
+            nodes[":ID(Account)"].tolist(),
+            ["1234567890123456789", "1234567890123456788"],
+        )
+
+    def test_missing_key_column_raises(self) -> None:
+        gen = AdminImportGenerator(
+            data_model=data_model,
+            dataframe={"people.csv": people[["age"]], "pets.csv": pets},
+        )
+
+        with self.assertRaises(AdminImportGenerationError):
+            gen.generate_node_dataframe(data_model.node_dict["Person"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+import unittest
+
+import yaml
+
+from neo4j_runway.code_generation import PyIngestConfigGenerator
+from neo4j_runway.models import DataModel, Node, Property, Relationship
+
+nodes = [
+    Node(
+        label="Person",
+        properties=[
+            Property(name="name", type="str", column_mapping="name", is_unique=True),
+            Property(name="age", type="int", column_mapping="age"),
+            Property(name="home", type="Point", column_mapping="home"),
+        ],
+        source_name="people.csv",
+    ),
+    Node(
+        label="Pet",
+        properties=[
+            Property(
+                name="name", type="str", column_mapping="pet_name", is_unique=True
+            ),
+            Property(name="weight", type="float", column_mapping="weight"),
+        ],
+        source_name="people.csv",
+    ),
+]
+rel = Relationship(
+    type="HAS_PET",
+    source="Person",
+    target="Pet",
+    properties=[Property(name="since", type="Date", column_mapping="since")],
+    source_name="people.csv",
+)
+
+data_model = DataModel(nodes=nodes, relationships=[rel])
+
+
+class TestPyIngestClientSideTyping(unittest.TestCase):
+    def test_client_side_typing(self) -> None:
+        gen = PyIngestConfigGenerator(data_model=data_model, client_side_typing=True)
+        config = yaml.safe_load(gen.generate_config_string())
+
+        for file in config["files"]:
+            self.assertNotIn("toIntegerOrNull", file["cql"])
+            self.assertNotIn("toFloatOrNull", file["cql"])
+            self.assertNotIn("date(", file["cql"])
+        # points are not cast before sending, so the Cypher still converts them
+        self.assertIn("point(row.home)", config["files"][0]["cql"])
+
+        self.assertEqual(
+            [file["column_types"] for file in config["files"]],
+            [
+                {"name": "str", "age": "int", "home": "Point"},
+                {"pet_name": "str", "weight": "float"},
+                {"name": "str", "pet_name": "str", "since": "Date"},
+            ],
+        )
+
+    def test_client_side_typing_relationship_match(self) -> None:
+        employee = Node(
+            label="Employee",
+            properties=[
+                Property(
+                    name="id",
+                    type="int",
+                    column_mapping="id",
+                    alias="employee_id",
+                    is_unique=True,
+                )
+            ],
+            source_name="employees.csv",
+        )
+        company = Node(
+            label="Company",
+            properties=[
+                Property(
+                    name="id",
+                    type="int",
+                    column_mapping="company_id",
+                    is_unique=True,
+                )
+            ],
+            source_name="companies.csv",
+        )
+        works_at = Relationship(
+            type="WORKS_AT",
+            source="Employee",
+            target="Company",
+            source_name="jobs.csv",
+        )
+        gen = PyIngestConfigGenerator(
+            data_model=DataModel(nodes=[employee, company], relationships=[works_at]),
+            client_side_typing=True,
+        )
+        config = yaml.safe_load(gen.generate_config_string())
+
+        # the keys of both MATCH clauses, including aliases, are cast before sending
+        self.assertIn(
+            "(source:Employee {id: row.employee_id})", config["files"][2]["cql"]
+        )
+        self.assertIn(
+            "(target:Company {id: row.company_id})", config["files"][2]["cql"]
+        )
+
+    def test_server_side_typing(self) -> None:
+        gen = PyIngestConfigGenerator(data_model=data_model)
+        config = yaml.safe_load(gen.generate_config_string())
+
+        self.assertIn("toIntegerOrNull(row.age)", config["files"][0]["cql"])
+        for file in config["files"]:
+            self.assertNotIn("column_types", file)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import unittest
+
+import yaml
+
+from neo4j_runway.code_generation import PyIngestConfigGenerator
+from neo4j_runway.models import DataModel, Node, Property
+
+nodes = [
+    Node(
+        label="Person",
+        properties=[
+            Property(name="name", type="str", column_mapping="name", is_unique=True),
+            Property(name="bio", type="str", column_mapping="bio"),
+        ],
+        source_name="people.csv",
+    ),
+]
+
+data_model = DataModel(nodes=nodes, relationships=[])
+
+pre_ingest = [
+    "CREATE TEXT INDEX person_bio IF NOT EXISTS FOR (n:Person) ON (n.bio)",
+    "CREATE CONSTRAINT person_email IF NOT EXISTS FOR (n:Person) REQUIRE n.email IS UNIQUE",
+    "CREATE INDEX person_age IF NOT EXISTS FOR (n:Person) ON (n.age)",
+    "MATCH (n:Temporary) DETACH DELETE n",
+]
+
+
+class TestPyIngestDeferIndexes(unittest.TestCase):
+    def test_defer_indexes(self) -> None:
+        gen = PyIngestConfigGenerator(
+            data_model=data_model,
+            pre_ingest_code=pre_ingest,
+            post_ingest_code=["MATCH (n:Person) SET n:Loaded"],
+            defer_indexes=True,
+        )
+        config = yaml.safe_load(gen.generate_config_string())
+
+        self.assertEqual(
+            config["pre_ingest"],
+            [
+                "CREATE CONSTRAINT person_email IF NOT EXISTS FOR (n:Person) REQUIRE n.email IS UNIQUE",
+                "MATCH (n:Temporary) DETACH DELETE n",
+                "CREATE CONSTRAINT person_name IF NOT EXISTS FOR (n:Person) REQUIRE n.name IS UNIQUE;",
+                "CALL db.awaitIndexes(300)",
+            ],
+        )
+        self.assertEqual(
+            config["post_ingest"],
+            [
+                "CREATE TEXT INDEX person_bio IF NOT EXISTS FOR (n:Person) ON (n.bio)",
+                "CREATE INDEX person_age IF NOT EXISTS FOR (n:Person) ON (n.age)",
+                "CALL db.awaitIndexes(300)",
+                "MATCH (n:Person) SET n:Loaded",
+            ],
+        )
+
+    def test_lookup_indexes_stay_in_pre_ingest(self) -> None:
+        name_index = "CREATE INDEX person_name IF NOT EXISTS FOR (n:Person) ON (n.name)"
+        gen = PyIngestConfigGenerator(
+            data_model=data_model,
+            pre_ingest_code=[name_index, pre_ingest[0]],
+            defer_indexes=True,
+        )
+        config = yaml.safe_load(gen.generate_config_string())
+
+        # the generated MERGE looks Person nodes up by name, so that index is needed while loading
+        self.assertEqual(config["pre_ingest"][0], name_index)
+        self.assertEqual(
+            config["post_ingest"], [pre_ingest[0], "CALL db.awaitIndexes(300)"]
+        )
+
+    def test_indexes_stay_in_pre_ingest_by_default(self) -> None:
+        gen = PyIngestConfigGenerator(data_model=data_model, pre_ingest_code=pre_ingest)
+        config = yaml.safe_load(gen.generate_config_string())
+
+        self.assertEqual(
+            config["pre_ingest"],
+            pre_ingest
+            + [
+                "CREATE CONSTRAINT person_name IF NOT EXISTS FOR (n:Person) REQUIRE n.name IS UNIQUE;"
+            ],
+        )
+        self.assertNotIn("post_ingest", config)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,10 @@
 import os
 import unittest
+from typing import Any, Dict, Optional
+from unittest.mock import MagicMock
 
 from neo4j_runway.code_generation import StandardCypherCodeGenerator
+from neo4j_runway.exceptions import PlanVerificationError
 from neo4j_runway.models import DataModel, Node, Property, Relationship
 
 nodes = [
@@ -113,5 +116,63 @@ class TestStandardCypherCodeGeneration(unittest.TestCase):
             print("No constraints file data model created.")
 
 
+def create_graph(scans: Dict[str, str]) -> MagicMock:
+    """
+    A graph whose EXPLAIN plans scan with the given operator when the statement contains the given label.
+    """
+
+    def run(cql: str, **params: Any) -> MagicMock:
+        operator: Optional[str] = next(
+            (op for label, op in scans.items() if f":{label} " in cql), None
+        )
+        child = {"operatorType": operator or "NodeUniqueIndexSeek", "children": []}
+        result = MagicMock()
+        result.consume.return_value.plan = {
+            "operatorType": "ProduceResults@neo4j",
+            "children": [child],
+        }
+        return result
+
+    graph = MagicMock()
+    graph.database = "neo4j"
+    session = graph.driver.session.return_value.__enter__.return_value
+    session.run.side_effect = run
+    return graph
+
+
+class TestVerifyPlans(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.gen = StandardCypherCodeGenerator(data_model=data_model)
+
+    def test_verify_plans_with_index_seeks(self) -> None:
+        graph = create_graph(scans=dict())
+
+        self.assertEqual(self.gen.verify_plans(graph), dict())
+
+        session = graph.driver.session.return_value.__enter__.return_value
+        statements = [c.args[0] for c in session.run.call_args_list]
+        self.assertEqual(len(statements), 4)
+        self.assertTrue(all(cql.startswith("EXPLAIN ") for cql in statements))
+        graph.driver.session.assert_called_once_with(database="neo4j")
+
+    def test_verify_plans_raises_on_scan(self) -> None:
+        graph = create_graph(scans={"NodeC": "NodeByLabelScan@neo4j"})
+
+        with self.assertRaises(PlanVerificationError) as context:
+            self.gen.verify_plans(graph)
+
+        self.assertIn("NodeC: NodeByLabelScan", str(context.exception))
+        self.assertIn("REL_AC_NodeA_NodeC: NodeByLabelScan", str(context.exception))
+
+    def test_verify_plans_warns_on_scan(self) -> None:
+        graph = create_graph(scans={"NodeB": "AllNodesScan"})
+
+        with self.assertWarns(UserWarning):
+            scans = self.gen.verify_plans(graph, strict=False)
+
+        self.assertEqual(scans, {"NodeB": ["AllNodesScan"]})
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,178 @@
+import asyncio
+import warnings
+from typing import Any, Callable, Dict, Generator, List, Optional, Set, Tuple
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from neo4j import SummaryCounters
+from neo4j.exceptions import Neo4jError
+
+from neo4j_runway.ingestion import pyingest
+from neo4j_runway.ingestion.pyingest import LocalServer
+
+mock_config = {
+    "server_uri": "bolt://localhost:7687",
+    "admin_user": "neo4j",
+    "admin_pass": "password",
+    "database": "neo4j",
+    "basepath": "./",
+}
+
+
+def create_neo4j_error(code: str, message: str) -> Neo4jError:
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", category=DeprecationWarning)
+        return Neo4jError.hydrate(code=code, message=message)
+
+
+def _create_result(
+    counters: Optional[Dict[str, int]] = None, **summary: Any
+) -> MagicMock:
+    result = MagicMock()
+    result.consume.return_value = MagicMock(
+        **{
+            "result_available_after": 0,
+            "result_consumed_after": 0,
+            "counters": SummaryCounters(counters or dict()),
+            **summary,
+        }
+    )
+    return result
+
+
+def _create_session(run: Callable[..., MagicMock]) -> MagicMock:
+    tx = MagicMock()
+    tx.run.side_effect = run
+
+    session = MagicMock()
+    session.__enter__.return_value = session
+    session.run.side_effect = run
+    session.begin_transaction.return_value = tx
+    session.execute_write.side_effect = lambda fn, *args, **kwargs: fn(
+        tx, *args, **kwargs
+    )
+    return session
+
+
+class FakeAsyncSession:
+    """
+    An async session recording the rows it is sent and the number of statements running at once.
+    """
+
+    def __init__(self, state: Dict[str, Any]) -> None:
+        self.state = state
+
+    async def __aenter__(self) -> "FakeAsyncSession":
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        pass
+
+    async def run(self, cql: str, **params: Any) -> "FakeAsyncSession":
+        self.state["open"] += 1
+        self.state["max_open"] = max(self.state["max_open"], self.state["open"])
+        self.state["rows"].extend(params["dict"]["rows"])
+        await asyncio.sleep(0.01)
+        self.state["open"] -= 1
+        if self.state.get("fail"):
+            raise RuntimeError("server error")
+        return self
+
+    async def consume(self) -> None:
+        pass
+
+    async def execute_write(self, fn: Any, *args: Any) -> Any:
+        return await fn(self, *args)
+
+
+@pytest.fixture(scope="function")
+def create_result() -> Callable[..., MagicMock]:
+    """
+    Create the result of a mocked statement, whose summary has the `counters` and any other `summary` attributes.
+    """
+    return _create_result
+
+
+@pytest.fixture(scope="function")
+def create_session() -> Callable[[Callable[..., MagicMock]], MagicMock]:
+    """
+    Create a mocked session running its statements, and those of its transactions, with `run`.
+    """
+    return _create_session
+
+
+@pytest.fixture(scope="function")
+def mock_graph_database() -> Generator[MagicMock, None, None]:
+    """
+    The GraphDatabase used by PyIngest, whose driver sends nothing to Neo4j.
+    """
+
+    with patch("neo4j_runway.ingestion.pyingest.GraphDatabase") as mock_graph_database:
+        yield mock_graph_database
+
+
+@pytest.fixture(scope="function")
+def async_state() -> Dict[str, Any]:
+    """
+    The state shared by the sessions of the mocked async driver. Setting "fail" makes every statement raise.
+    """
+    return {"open": 0, "max_open": 0, "rows": list()}
+
+
+@pytest.fixture(scope="function")
+def mock_async_graph_database(
+    async_state: Dict[str, Any],
+) -> Generator[MagicMock, None, None]:
+    """
+    The AsyncGraphDatabase used by PyIngestAsync, whose driver creates `FakeAsyncSession`s.
+    """
+
+    pyingest.global_config = dict(mock_config)
+    with patch(
+        "neo4j_runway.ingestion.pyingest_async.AsyncGraphDatabase"
+    ) as mock_graph_database:
+        driver = MagicMock()
+        driver.session.side_effect = lambda **kwargs: FakeAsyncSession(async_state)
+        driver.close = AsyncMock()
+        mock_graph_database.driver.return_value = driver
+        yield mock_graph_database
+
+
+@pytest.fixture(scope="function")
+def executed() -> List[Tuple[str, Dict[str, Any]]]:
+    """
+    The (cql, parameters) pairs successfully sent to the mocked driver.
+    """
+    return list()
+
+
+@pytest.fixture(scope="function")
+def fail_on() -> Set[Any]:
+    """
+    Row values that make the mocked driver raise a data error for the whole chunk.
+    """
+    return set()
+
+
+@pytest.fixture(scope="function")
+def local_server(
+    mock_graph_database: MagicMock,
+    executed: List[Tuple[str, Dict[str, Any]]],
+    fail_on: Set[Any],
+) -> LocalServer:
+    """
+    A LocalServer whose driver records every statement instead of sending it to Neo4j.
+    """
+
+    def run(cql: str, **params: Any) -> MagicMock:
+        rows = params.get("dict", {}).get("rows", list())
+        if any(value in fail_on for row in rows for value in row.values()):
+            raise create_neo4j_error(
+                "Neo.ClientError.Statement.SemanticError", "bad row"
+            )
+        executed.append((cql, params))
+        return _create_result({"nodes-created": len(rows)})
+
+    mock_graph_database.driver.return_value.session.return_value = _create_session(run)
+    pyingest.global_config = dict(mock_config)
+    return LocalServer()
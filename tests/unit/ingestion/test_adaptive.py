@@ -0,0 +1,84 @@
+from typing import Any, Dict, List, Tuple
+from unittest.mock import MagicMock
+
+from neo4j_runway.ingestion.adaptive import (
+    AdaptiveChunkSizer,
+    ChunkSizeCache,
+    get_transaction_latency,
+)
+from neo4j_runway.ingestion.pyingest import LocalServer, get_statement_key
+
+
+def test_sizer_grows_when_fast() -> None:
+    sizer = AdaptiveChunkSizer(chunk_size=100, target_latency=1.0)
+
+    assert sizer.update(rows=100, latency=0.1) == 200
+    assert sizer.update(rows=200, latency=0.5) == 400
+
+
+def test_sizer_shrinks_when_slow() -> None:
+    sizer = AdaptiveChunkSizer(chunk_size=1000, target_latency=1.0)
+
+    assert sizer.update(rows=1000, latency=1.25) == 800
+    assert sizer.update(rows=800, latency=10.0) == 400
+
+
+def test_sizer_short_chunk() -> None:
+    sizer = AdaptiveChunkSizer(chunk_size=1000, target_latency=1.0)
+
+    # 10 rows at 0.01s is the same per row latency as 1000 rows at 1s
+    assert sizer.update(rows=10, latency=0.01) == 1000
+
+
+def test_sizer_memory_ceiling_and_bounds() -> None:
+    sizer = AdaptiveChunkSizer(
+        chunk_size=1000,
+        target_latency=1.0,
+        max_chunk_memory=50_000,
+        max_chunk_size=1500,
+    )
+
+    assert sizer.update(rows=1000, latency=0.1, memory=100_000) == 500
+    assert sizer.update(rows=500, latency=0.1) == 1000
+    assert sizer.update(rows=1000, latency=0.1) == 1500
+
+
+def test_get_transaction_latency() -> None:
+    summary = MagicMock(result_available_after=200, result_consumed_after=300)
+    assert get_transaction_latency(summary, 2.0) == 0.5
+
+    summary = MagicMock(result_available_after=None, result_consumed_after=None)
+    assert get_transaction_latency(summary, 2.0) == 2.0
+
+
+def test_chunk_size_cache(tmp_path: Any) -> None:
+    file_path = str(tmp_path / "chunk_sizes.json")
+    key = get_statement_key("a.csv", "MERGE (n:A {id: row.id})")
+
+    cache = ChunkSizeCache(file_path)
+    assert cache.get(key) is None
+    cache.set(key, 1234)
+
+    assert ChunkSizeCache(file_path).get(key) == 1234
+
+
+def test_load_csv_adaptive_chunk_size(
+    local_server: LocalServer,
+    executed: List[Tuple[str, Dict[str, Any]]],
+    tmp_path: Any,
+) -> None:
+    local_server.adaptive_chunk_size = True
+    local_server.chunk_size_cache = ChunkSizeCache(str(tmp_path / "sizes.json"))
+
+    file = {
+        "url": "$BASE/tests/resources/data/pets.csv",
+        "cql": "WITH $dict.rows AS rows UNWIND rows AS row MERGE (n:Pet {name: row.pet_name})",
+        "chunk_size": 1,
+    }
+    local_server.load_csv(file)
+
+    # the mocked server responds instantly, so each chunk doubles in size, bounded by the minimum size
+    assert [len(params["dict"]["rows"]) for _, params in executed] == [9]
+
+    key = local_server._get_statement_key([local_server.get_params(file)])
+    assert local_server.chunk_size_cache.get(key) == 20
@@ -0,0 +1,155 @@
+import datetime
+from typing import Any, Dict, List, Tuple
+
+import pandas as pd
+
+from neo4j_runway.ingestion.casting import cast_columns, get_column_types
+from neo4j_runway.ingestion.pyingest import LocalServer
+from neo4j_runway.models import DataModel, Node, Property, Relationship
+
+
+def test_get_column_types() -> None:
+    data_model = DataModel(
+        nodes=[
+            Node(
+                label="Person",
+                properties=[
+                    Property(
+                        name="name",
+                        type="str",
+                        column_mapping="name",
+                        alias="owner",
+                        is_unique=True,
+                    ),
+                    Property(name="age", type="int", column_mapping="age"),
+                ],
+                source_name="people.csv",
+            ),
+        ],
+        relationships=[
+            Relationship(
+                type="KNOWS",
+                source="Person",
+                target="Person",
+                properties=[
+                    Property(
+                        name="since", type="neo4j.time.Date", column_mapping="since"
+                    )
+                ],
+                source_name="people.csv",
+            )
+        ],
+    )
+
+    assert get_column_types(data_model) == {
+        "name": "str",
+        "owner": "str",
+        "age": "int",
+        "since": "Date",
+    }
+
+
+def test_cast_columns() -> None:
+    rows = pd.DataFrame(
+        {
+            "int": ["1", "2.7", "x", None],
+            "float": ["1.5", "3", "y", None],
+            "bool": ["True", "false", "maybe", None],
+            "date": ["2020-01-02", "2021-03-04", "bad", None],
+            "datetime": [
+                "2020-01-02T10:00:00",
+                "2020-01-02T10:00:00+01:00",
+                "bad",
+                None,
+            ],
+            "time": ["12:00:00", "01:02:03", "bad", None],
+            "str": ["a", "b", "c", "d"],
+        }
+    )
+    types = {column: column for column in rows.columns}
+    types["missing"] = "int"
+
+    cast = cast_columns(rows, types)
+
+    assert cast["int"].tolist()[:2] == [1, 2]
+    assert cast["float"].tolist()[:2] == [1.5, 3.0]
+    assert cast["bool"].tolist()[:2] == [True, False]
+    assert cast["date"][0] == datetime.date(2020, 1, 2)
+    assert cast["datetime"][1] == pd.Timestamp("2020-01-02T09:00:00", tz="UTC")
+    assert cast["time"][0] == datetime.time(12, tzinfo=datetime.timezone.utc)
+    assert cast["str"].tolist() == rows["str"].tolist()
+    # values that can not be cast become null, as with the `OrNull` conversion functions
+    for column in ("int", "float", "bool", "date", "datetime", "time"):
+        assert cast[column].isna().tolist()[2:] == [True, True]
+    assert "missing" not in cast.columns
+    # the source chunk is left untouched
+    assert rows["int"][0] == "1"
+
+
+def test_cast_columns_keeps_integer_precision() -> None:
+    rows = pd.DataFrame({"id": ["1234567890123456789", " -42 ", "9.9", None]})
+
+    cast = cast_columns(rows, {"id": "int"})
+
+    assert cast["id"].tolist()[:3] == [1234567890123456789, -42, 9]
+    assert cast["id"].isna().tolist() == [False, False, False, True]
+
+
+def test_cast_columns_keeps_offsets_and_dates_out_of_pandas_range() -> None:
+    offset = datetime.timezone(datetime.timedelta(hours=2))
+    rows = pd.DataFrame(
+        {
+            "time": ["10:00:00+02:00", "10:00:00"],
+            "datetime": ["2020-01-02T10:00:00+02:00", "0001-01-01T00:00:00"],
+            "date": ["0001-01-01", "9999-12-31"],
+        }
+    )
+
+    cast = cast_columns(rows, {column: column for column in rows.columns})
+
+    assert cast["time"][0].utcoffset() == offset.utcoffset(None)
+    assert cast["time"][1] == datetime.time(10, tzinfo=datetime.timezone.utc)
+    assert cast["datetime"][0] == datetime.datetime(2020, 1, 2, 10, tzinfo=offset)
+    assert cast["datetime"][0].utcoffset() == offset.utcoffset(None)
+    assert cast["datetime"][1] == datetime.datetime(
+        1, 1, 1, tzinfo=datetime.timezone.utc
+    )
+    assert cast["date"].tolist() == [
+        datetime.date(1, 1, 1),
+        datetime.date(9999, 12, 31),
+    ]
+
+
+def test_cast_columns_leaves_point_and_duration() -> None:
+    rows = pd.DataFrame(
+        {
+            "point": ["latitude:1, longitude:2", "latitude:3, longitude:4"],
+            "duration": ["P1D", "PT2H"],
+        }
+    )
+
+    # converted by `point()` and `duration()` in the Cypher, so sent as they are
+    cast = cast_columns(rows, {"point": "Point", "duration": "Duration"})
+
+    assert cast["point"].tolist() == rows["point"].tolist()
+    assert cast["duration"].tolist() == rows["duration"].tolist()
+
+
+def test_load_csv_casts_columns(
+    local_server: LocalServer, executed: List[Tuple[str, Dict[str, Any]]]
+) -> None:
+    local_server.column_types = {"age": "float"}
+
+    local_server.load_csv(
+        {
+            "url": "$BASE/tests/resources/data/pets.csv",
+            "cql": "WITH $dict.rows AS rows UNWIND rows AS row MERGE (n:Pet {name: row.name, age: row.age})",
+            "chunk_size": 100,
+            # entry types take precedence over those of the data model
+            "column_types": {"age": "int"},
+        }
+    )
+
+    ((_, params),) = executed
+    ages = [row["age"] for row in params["dict"]["rows"] if "age" in row]
+    assert ages and all(isinstance(age, int) for age in ages)
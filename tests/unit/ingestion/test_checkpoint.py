@@ -0,0 +1,79 @@
+from typing import Any, Dict, List, Set, Tuple
+
+import pytest
+from neo4j.exceptions import Neo4jError
+
+from neo4j_runway.ingestion.checkpoint import Checkpoint, get_config_hash
+from neo4j_runway.ingestion.pyingest import LocalServer
+
+file = {
+    "url": "$BASE/tests/resources/data/pets.csv",
+    "cql": "WITH $dict.rows AS rows UNWIND rows AS row MERGE (n:Pet {name: row.pet_name})",
+    "chunk_size": 2,
+}
+
+
+def test_checkpoint_persists_progress(tmp_path: Any) -> None:
+    file_path = str(tmp_path / "checkpoint.json")
+    config_hash = get_config_hash([file])
+
+    checkpoint = Checkpoint(file_path, config_hash=config_hash)
+    checkpoint.commit("a", url="a.csv", rows=10)
+    checkpoint.commit("a", url="a.csv", rows=5)
+    checkpoint.complete("b", url="b.csv")
+
+    resumed = Checkpoint(file_path, config_hash=config_hash, resume=True)
+    assert resumed.get_committed_rows("a") == 15
+    assert not resumed.is_completed("a")
+    assert resumed.is_completed("b")
+
+    assert Checkpoint(file_path, config_hash=config_hash).get_committed_rows("a") == 0
+
+
+def test_checkpoint_discards_other_config(tmp_path: Any) -> None:
+    file_path = str(tmp_path / "checkpoint.json")
+    Checkpoint(file_path, config_hash="abc").commit("a", url="a.csv", rows=10)
+
+    with pytest.warns(UserWarning):
+        resumed = Checkpoint(file_path, config_hash="xyz", resume=True)
+
+    assert resumed.get_committed_rows("a") == 0
+
+
+def test_load_csv_resumes_after_failure(
+    local_server: LocalServer,
+    executed: List[Tuple[str, Dict[str, Any]]],
+    fail_on: Set[Any],
+    tmp_path: Any,
+) -> None:
+    file_path = str(tmp_path / "checkpoint.json")
+    config_hash = get_config_hash([file])
+    local_server.checkpoint = Checkpoint(file_path, config_hash=config_hash)
+
+    # rows 5 and 6 hold "Mia", so the third chunk fails
+    fail_on.add("Mia")
+    with pytest.raises(Neo4jError):
+        local_server.load_csv(file)
+    assert (
+        local_server.checkpoint.get_committed_rows(
+            local_server._get_statement_key([local_server.get_params(file)])
+        )
+        == 4
+    )
+
+    executed.clear()
+    fail_on.clear()
+    local_server.checkpoint = Checkpoint(
+        file_path, config_hash=config_hash, resume=True
+    )
+    local_server.load_csv(file)
+
+    loaded = [
+        row["pet_name"] for _, params in executed for row in params["dict"]["rows"]
+    ]
+    assert loaded == ["Mia", "Mia", "Donald", "Gerald", "Gerald"]
+
+    # a completed file is skipped entirely
+    executed.clear()
+    local_server.load_csv(file)
+    assert executed == list()
@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+
+from neo4j_runway.ingestion.conversion import (
+    get_referenced_columns,
+    to_parameter_rows,
+)
+
+node_cql = """WITH $dict.rows AS rows
+UNWIND rows AS row
+MERGE (n:Person {name: row.name})
+SET n.age = toIntegerOrNull(row.age), n.nickname = row.`nick name`, n.alias = row.name"""
+
+
+def test_get_referenced_columns() -> None:
+    assert get_referenced_columns(node_cql) == ["name", "age", "nick name"]
+
+
+def test_get_referenced_columns_whole_row() -> None:
+    cql = """WITH $dict.rows AS rows
+UNWIND rows AS row
+MERGE (n:Person {name: row.name})
+SET n += row"""
+
+    assert get_referenced_columns(cql) is None
+
+
+def test_to_parameter_rows_projects_and_drops_nulls() -> None:
+    rows = pd.DataFrame(
+        {
+            "name": ["a", "b", None],
+            "age": ["1", np.nan, "3"],
+            "unused": ["x", "y", "z"],
+        }
+    )
+
+    assert to_parameter_rows(rows, columns=["name", "age", "missing"]) == [
+        {"name": "a", "age": "1"},
+        {"name": "b"},
+        {"age": "3"},
+    ]
+
+
+def test_to_parameter_rows_all_columns() -> None:
+    rows = pd.DataFrame({"name": ["a"], "age": [1]})
+
+    result = to_parameter_rows(rows)
+
+    assert result == [{"name": "a", "age": 1}]
+    assert isinstance(result[0]["age"], int)
+
+
+def test_to_parameter_rows_no_columns() -> None:
+    rows = pd.DataFrame({"name": ["a", "b"]})
+
+    assert to_parameter_rows(rows, columns=[]) == [dict(), dict()]
@@ -0,0 +1,102 @@
+from typing import Any, Dict, List, Tuple
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+from neo4j_runway.ingestion.pyingest import (
+    LocalServer,
+    PyIngest,
+    get_source_dataframe,
+)
+from neo4j_runway.utils.data import Table, TableCollection
+from neo4j_runway.utils.data.data_dictionary.data_dictionary import DataDictionary
+
+people = pd.DataFrame({"name": ["Bob", "Ben"]})
+pets = pd.DataFrame({"pet_name": ["Benny", "Spike", "Mia"]})
+
+config = """
+server_uri: bolt://localhost:7687
+admin_user: neo4j
+admin_pass: password
+files:
+- url: $BASE/data/people.csv
+  cql: |-
+    WITH $dict.rows AS rows UNWIND rows AS row
+    MERGE (n:Person {name: row.name})
+- url: $BASE/data/pets.csv
+  cql: |-
+    WITH $dict.rows AS rows UNWIND rows AS row
+    MERGE (n:Pet {name: row.pet_name})
+"""
+
+
+def test_get_source_dataframe_by_url_file_name_or_stem() -> None:
+    assert get_source_dataframe(people, "$BASE/data/people.csv") is people
+    assert (
+        get_source_dataframe({"$BASE/data/people.csv": people}, "$BASE/data/people.csv")
+        is people
+    )
+    assert (
+        get_source_dataframe({"people.csv": people}, "$BASE/data/people.csv") is people
+    )
+    assert get_source_dataframe({"people": people}, "$BASE/data/people.csv") is people
+
+    with pytest.raises(ValueError):
+        get_source_dataframe({"pets.csv": pets}, "$BASE/data/people.csv")
+
+
+def test_get_source_dataframe_from_table_collection() -> None:
+    data_dictionary = DataDictionary(
+        table_schemas=[
+            {"name": "people.csv", "columns": [{"name": "name"}]},
+            {"name": "pets.csv", "columns": [{"name": "pet_name"}]},
+        ]
+    )
+    table_collection = TableCollection(
+        data_directory="data/",
+        data_dictionary=data_dictionary,
+        tables=[
+            Table(
+                name=name,
+                file_path=f"data/{name}",
+                dataframe=dataframe,
+                table_schema=data_dictionary.get_table_schema(name),
+            )
+            for name, dataframe in (("people.csv", people), ("pets.csv", pets))
+        ],
+    )
+
+    assert get_source_dataframe(table_collection, "$BASE/data/pets.csv") is pets
+
+
+def test_pyingest_routes_each_statement_to_its_dataframe(
+    local_server: LocalServer, executed: List[Tuple[str, Dict[str, Any]]]
+) -> None:
+    with patch(
+        "neo4j_runway.ingestion.pyingest.LocalServer", return_value=local_server
+    ):
+        PyIngest(config=config, dataframe={"people.csv": people, "pets": pets})
+
+    def sent(label: str) -> List[Dict[str, Any]]:
+        return [
+            row
+            for cql, params in executed
+            if f"(n:{label} " in cql
+            for row in params["dict"]["rows"]
+        ]
+
+    assert sent("Person") == people.to_dict(orient="records")
+    assert sent("Pet") == pets.to_dict(orient="records")
+
+
+def test_pyingest_missing_dataframe_fails_before_writing(
+    local_server: LocalServer, executed: List[Tuple[str, Dict[str, Any]]]
+) -> None:
+    with patch(
+        "neo4j_runway.ingestion.pyingest.LocalServer", return_value=local_server
+    ):
+        with pytest.raises(ValueError):
+            PyIngest(config=config, dataframe={"people.csv": people})
+
+    assert executed == list()
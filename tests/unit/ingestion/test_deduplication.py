@@ -0,0 +1,87 @@
+from typing import Any, Dict, List, Tuple
+
+import pandas as pd
+import pytest
+
+from neo4j_runway.ingestion.deduplication import (
+    NodeKeyDeduplicator,
+    get_node_key_columns,
+)
+from neo4j_runway.ingestion.pyingest import LocalServer
+
+node_cql = """WITH $dict.rows AS rows
+UNWIND rows AS row
+MERGE (n:Person {name: row.name})
+SET n.age = toIntegerOrNull(row.age)"""
+
+
+def test_get_node_key_columns() -> None:
+    assert get_node_key_columns(node_cql) == ["name"]
+    assert get_node_key_columns(
+        "WITH $dict.rows AS rows UNWIND rows AS row MERGE (target:Address{city: row.city, street: row.street})"
+    ) == ["city", "street"]
+    assert (
+        get_node_key_columns(
+            """WITH $dict.rows AS rows UNWIND rows AS row
+MATCH (source:Person {name: row.name})
+MATCH (target:Pet {name: row.pet_name})
+MERGE (source)-[n:HAS_PET]->(target)"""
+        )
+        is None
+    )
+    assert (
+        get_node_key_columns(
+            "WITH $dict.rows AS rows UNWIND rows AS row MERGE (n:Person {name: row.name}) MERGE (p:Pet {name: row.pet_name})"
+        )
+        is None
+    )
+
+
+@pytest.mark.parametrize("keep,expected_age", [("first", "1"), ("last", "3")])
+def test_deduplicate_chunk_keep(keep: str, expected_age: str) -> None:
+    rows = pd.DataFrame({"name": ["Bob", "Ben", "Bob"], "age": ["1", "2", "3"]})
+
+    deduplicated = NodeKeyDeduplicator(["name"], keep=keep).deduplicate(rows)
+
+    assert sorted(deduplicated["name"]) == ["Ben", "Bob"]
+    assert deduplicated.set_index("name")["age"]["Bob"] == expected_age
+
+
+def test_deduplicate_file_drops_keys_of_earlier_chunks() -> None:
+    deduplicator = NodeKeyDeduplicator(["name"], scope="file")
+
+    deduplicator.deduplicate(pd.DataFrame({"name": ["Bob", "Ben"]}))
+    second = deduplicator.deduplicate(pd.DataFrame({"name": ["Bob", "Amy"]}))
+
+    assert second["name"].tolist() == ["Amy"]
+
+
+def test_deduplicate_file_memory_budget_falls_back_to_chunks() -> None:
+    deduplicator = NodeKeyDeduplicator(["name"], scope="file", max_memory=1)
+
+    with pytest.warns(UserWarning):
+        deduplicator.deduplicate(pd.DataFrame({"name": ["Bob", "Ben"]}))
+    second = deduplicator.deduplicate(pd.DataFrame({"name": ["Bob", "Bob"]}))
+
+    assert second["name"].tolist() == ["Bob"]
+
+
+def test_load_csv_deduplicates_node_keys(
+    local_server: LocalServer, executed: List[Tuple[str, Dict[str, Any]]]
+) -> None:
+    local_server.deduplicate_nodes = "file"
+
+    local_server.load_csv(
+        {
+            "url": "$BASE/tests/resources/data/pets.csv",
+            "cql": node_cql,
+            "chunk_size": 4,
+        }
+    )
+
+    sent = [row["name"] for _, params in executed for row in params["dict"]["rows"]]
+    expected = pd.read_csv("tests/resources/data/pets.csv")["name"]
+    assert sent == expected.drop_duplicates().tolist()
+    (statement,) = local_server.metrics.statements.values()
+    assert statement.rows_read == len(expected)
+    assert statement.rows_sent == len(sent)
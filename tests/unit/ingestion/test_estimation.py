@@ -0,0 +1,130 @@
+from typing import Any, Callable, List
+from unittest.mock import MagicMock
+
+import pandas as pd
+import pytest
+
+from neo4j_runway.ingestion.estimation import (
+    StatementEstimate,
+    get_plan_operators,
+    get_scan_operators,
+    sample_chunks,
+)
+from neo4j_runway.ingestion.pyingest import Ingestor, split_dataframe
+
+config = {
+    "server_uri": "bolt://localhost:7687",
+    "admin_user": "neo4j",
+    "admin_pass": "password",
+    "files": [
+        {
+            "url": "people.csv",
+            "chunk_size": 10,
+            "cql": "WITH $dict.rows AS rows UNWIND rows AS row MERGE (n:Person {name: row.name})",
+        },
+        {
+            "url": "people.csv",
+            "chunk_size": 10,
+            "cql": """WITH $dict.rows AS rows UNWIND rows AS row
+MATCH (source:Person {name: row.name})
+MATCH (target:Person {name: row.friend})
+MERGE (source)-[n:KNOWS]->(target)""",
+        },
+    ],
+}
+
+seek_plan = {
+    "operatorType": "ProduceResults@neo4j",
+    "children": [{"operatorType": "NodeUniqueIndexSeek@neo4j", "children": []}],
+}
+scan_plan = {
+    "operatorType": "ProduceResults@neo4j",
+    "children": [
+        {"operatorType": "NodeUniqueIndexSeek@neo4j", "children": []},
+        {"operatorType": "NodeByLabelScan@neo4j", "children": []},
+    ],
+}
+
+
+def test_get_plan_operators() -> None:
+    assert get_plan_operators(scan_plan) == [
+        "ProduceResults",
+        "NodeUniqueIndexSeek",
+        "NodeByLabelScan",
+    ]
+    assert get_scan_operators(seek_plan) == list()
+    assert get_scan_operators(scan_plan) == ["NodeByLabelScan"]
+    assert get_plan_operators(None) == list()
+
+
+@pytest.mark.parametrize("total_rows", [5, 100, 1003])
+def test_sample_chunks_is_spread_across_source(total_rows: int) -> None:
+    source = pd.DataFrame({"position": range(total_rows)})
+
+    sample, counted = sample_chunks(split_dataframe(source, 7), sample_size=10)
+
+    assert counted == total_rows
+    assert len(sample) == min(10, total_rows)
+    positions = sample["position"].tolist()
+    assert positions == sorted(positions)
+    assert positions[0] == 0
+    # the last sampled row is in the last part of the source
+    assert positions[-1] >= total_rows * 0.8
+
+
+def test_statement_estimate_forecast() -> None:
+    estimate = StatementEstimate(
+        key="a",
+        url="a.csv",
+        cql="",
+        total_rows=1000,
+        sample_rows=10,
+        read_seconds=2.0,
+        conversion_seconds=0.1,
+        server_seconds=0.9,
+    )
+
+    assert estimate.rows_per_second == pytest.approx(10)
+    assert estimate.forecast_seconds == pytest.approx(102)
+
+
+def test_ingestor_estimate_rolls_back_and_flags_scans(
+    mock_graph_database: MagicMock,
+    create_session: Callable[[Callable[..., MagicMock]], MagicMock],
+    create_result: Callable[..., MagicMock],
+) -> None:
+    people = pd.DataFrame(
+        {"name": [f"p{i}" for i in range(100)], "friend": ["p0"] * 100}
+    )
+    executed: List[str] = list()
+
+    def run(cql: str, **params: Any) -> MagicMock:
+        executed.append(cql)
+        return create_result(
+            {"nodes-created": len(params["dict"]["rows"])},
+            result_available_after=1,
+            result_consumed_after=1,
+            plan=scan_plan if "KNOWS" in cql else seek_plan,
+        )
+
+    session = create_session(run)
+    mock_graph_database.driver.return_value.session.return_value = session
+    tx = session.begin_transaction.return_value
+
+    with Ingestor.from_config(config) as ingestor:
+        estimate = ingestor.estimate(config, dataframe=people, sample_size=20)
+
+    tx.rollback.assert_called_once()
+    tx.commit.assert_not_called()
+    session.execute_write.assert_not_called()
+    assert sum(cql.startswith("EXPLAIN") for cql in executed) == 2
+
+    node_statement, relationship_statement = estimate.statements.values()
+    assert node_statement.total_rows == 100
+    assert node_statement.sample_rows == 20
+    assert node_statement.counters["nodes_created"] == 20
+    assert node_statement.uses_index_seeks
+    assert not relationship_statement.uses_index_seeks
+    assert estimate.statements_without_index_seeks == [relationship_statement]
+    assert "no index seek (NodeByLabelScan)" in str(estimate)
+    assert estimate.forecast_seconds > 0
@@ -0,0 +1,164 @@
+import os
+from typing import Any, Dict, List, Tuple
+
+import pandas as pd
+import pytest
+
+from neo4j_runway.ingestion.fingerprints import (
+    FingerprintStore,
+    get_deletion_cql,
+    get_row_key_columns,
+)
+from neo4j_runway.ingestion.pyingest import LocalServer, get_params
+
+node_cql = """WITH $dict.rows AS rows
+UNWIND rows AS row
+MERGE (n:Person {name: row.name})
+SET n.age = toIntegerOrNull(row.age)"""
+
+relationship_cql = """WITH $dict.rows AS rows
+UNWIND rows AS row
+MATCH (source:Person {name: row.name})
+MATCH (target:Pet {name: row.pet_name})
+MERGE (source)-[n:HAS_PET]->(target)
+SET n.since = row.since"""
+
+
+def test_get_row_key_columns() -> None:
+    assert get_row_key_columns(get_params({"url": "a.csv", "cql": node_cql})) == [
+        "name"
+    ]
+    assert get_row_key_columns(
+        get_params({"url": "a.csv", "cql": relationship_cql})
+    ) == ["name", "pet_name"]
+    assert (
+        get_row_key_columns(
+            get_params({"url": "a.csv", "cql": "CREATE (n:Person {name: 'a'})"})
+        )
+        is None
+    )
+
+
+def test_get_deletion_cql() -> None:
+    assert (
+        get_deletion_cql(node_cql)
+        == """WITH $dict.rows AS rows
+UNWIND rows AS row
+MATCH (n:Person {name: row.name})
+DETACH DELETE n"""
+    )
+    assert (
+        get_deletion_cql(relationship_cql)
+        == """WITH $dict.rows AS rows
+UNWIND rows AS row
+MATCH (source:Person {name: row.name})
+MATCH (target:Pet {name: row.pet_name})
+MATCH (source)-[n:HAS_PET]->(target)
+DELETE n"""
+    )
+    assert get_deletion_cql("CREATE (n:Person {name: 'a'})") is None
+
+
+def test_fingerprint_store_changes_and_missing_keys(tmp_path: Any) -> None:
+    file_path = os.path.join(tmp_path, "fingerprints.db")
+    rows = pd.DataFrame({"name": ["Bob", "Ben", None], "age": ["1", "2", "3"]})
+
+    store = FingerprintStore(file_path)
+    changed, fingerprints = store.get_changes("people", rows, key_columns=["name"])
+    assert len(changed) == 3
+    assert len(fingerprints) == 2
+    store.record("people", fingerprints)
+    store.close()
+
+    store = FingerprintStore(file_path)
+    rows = pd.DataFrame({"name": ["Bob", None], "age": ["4", "3"]})
+    changed, fingerprints = store.get_changes("people", rows, key_columns=["name"])
+    # the row without a key can not be tracked, so it is always sent
+    assert changed["age"].tolist() == ["4", "3"]
+    store.record("people", fingerprints)
+
+    missing = store.get_missing_keys("people", key_columns=["name"])
+    assert missing == [{"name": "Ben"}]
+    store.remove("people", missing)
+    assert store.get_missing_keys("people", key_columns=["name"]) == list()
+    store.close()
+
+
+def test_fingerprint_store_hashes_list_and_map_columns(tmp_path: Any) -> None:
+    rows = pd.DataFrame(
+        {
+            "name": ["Bob", "Ben"],
+            "toys": [["ball", "rope"], ["bone"]],
+            "address": [{"city": "Chicago", "street": "Michigan Ave"}, None],
+        }
+    )
+
+    store = FingerprintStore(os.path.join(tmp_path, "fingerprints.db"))
+    changed, fingerprints = store.get_changes("people", rows, key_columns=["name"])
+    assert len(changed) == 2
+    store.record("people", fingerprints)
+
+    # only the keys of the map of Bob are reordered, while the list of Ben changes
+    rows.at[0, "address"] = {"street": "Michigan Ave", "city": "Chicago"}
+    rows.at[1, "toys"] = ["bone", "ball"]
+    changed, _ = store.get_changes("people", rows, key_columns=["name"])
+    assert changed["name"].tolist() == ["Ben"]
+    store.close()
+
+
+def test_load_dataframe_sends_changed_rows_and_deletes_missing(
+    local_server: LocalServer,
+    executed: List[Tuple[str, Dict[str, Any]]],
+    tmp_path: Any,
+) -> None:
+    file_path = os.path.join(tmp_path, "fingerprints.db")
+    file = {"url": "people.csv", "cql": node_cql, "chunk_size": 2}
+
+    local_server.fingerprints = FingerprintStore(file_path)
+    local_server.delete_missing = True
+    local_server.load_dataframe(
+        file,
+        dataframe=pd.DataFrame({"name": ["Bob", "Ben", "Amy"], "age": [1, 2, 3]}),
+    )
+    local_server.fingerprints.close()
+    assert sum(len(params["dict"]["rows"]) for _, params in executed) == 3
+
+    executed.clear()
+    local_server.fingerprints = FingerprintStore(file_path)
+    local_server.load_dataframe(
+        file,
+        dataframe=pd.DataFrame({"name": ["Bob", "Amy", "Joe"], "age": [1, 4, 5]}),
+    )
+    local_server.fingerprints.close()
+
+    writes = [params["dict"]["rows"] for cql, params in executed if cql == node_cql]
+    assert [row["name"] for rows in writes for row in rows] == ["Amy", "Joe"]
+    deletions = [params["dict"]["rows"] for cql, params in executed if cql != node_cql]
+    assert deletions == [[{"name": "Ben"}]]
+    (statement,) = local_server.metrics.statements.values()
+    assert statement.rows_sent == 5
+
+
+def test_load_dataframe_does_not_delete_untracked_rows(
+    local_server: LocalServer,
+    executed: List[Tuple[str, Dict[str, Any]]],
+    tmp_path: Any,
+) -> None:
+    file_path = os.path.join(tmp_path, "fingerprints.db")
+    file = {"url": "people.csv", "cql": node_cql}
+
+    local_server.fingerprints = FingerprintStore(file_path)
+    local_server.delete_missing = True
+    local_server.load_dataframe(
+        file, dataframe=pd.DataFrame({"name": ["Bob", "Ben"], "age": [1, 2]})
+    )
+    local_server.fingerprints.close()
+
+    executed.clear()
+    local_server.fingerprints = FingerprintStore(file_path)
+    # without the key column no row can be fingerprinted, so none of the recorded keys are known to be missing
+    with pytest.warns(UserWarning, match="lack the key columns"):
+        local_server.load_dataframe(file, dataframe=pd.DataFrame({"age": [1, 2]}))
+    local_server.fingerprints.close()
+
+    assert [cql for cql, _ in executed] == [node_cql]
@@ -0,0 +1,136 @@
+from typing import Any, Dict, List, Tuple
+
+import pytest
+
+from neo4j_runway.ingestion.indexes import (
+    get_index_class,
+    get_lookup_keys,
+    split_index_statements,
+)
+from neo4j_runway.ingestion.pyingest import LocalServer
+
+pre_ingest = [
+    "CREATE TEXT INDEX person_bio IF NOT EXISTS FOR (n:Person) ON (n.bio)",
+    "CREATE CONSTRAINT person_name IF NOT EXISTS FOR (n:Person) REQUIRE n.name IS UNIQUE",
+    "CREATE INDEX person_age IF NOT EXISTS FOR (n:Person) ON (n.age)",
+]
+
+
+@pytest.mark.parametrize(
+    "cql,index_class",
+    [
+        (pre_ingest[0], "index"),
+        (pre_ingest[1], "constraint"),
+        (pre_ingest[2], "index"),
+        ("create fulltext index names for (n:Person) on each [n.name]", "index"),
+        (
+            "\nCREATE RANGE INDEX rel_since FOR ()-[r:KNOWS]-() ON (r.since)",
+            "index",
+        ),
+        ("CALL db.awaitIndexes(300)", "other"),
+        ("MATCH (n:Temporary) DETACH DELETE n", "other"),
+    ],
+)
+def test_get_index_class(cql: str, index_class: str) -> None:
+    assert get_index_class(cql) == index_class
+
+
+def test_split_index_statements() -> None:
+    assert split_index_statements(pre_ingest) == (
+        [pre_ingest[0], pre_ingest[2]],
+        [pre_ingest[1]],
+    )
+
+
+def test_get_lookup_keys() -> None:
+    statements = [
+        "WITH $dict.rows AS rows UNWIND rows AS row MERGE (n:Person {name: row.name, `birth date`: date(row.born)}) SET n.age = row.age",
+        "UNWIND $rows AS row MATCH (source:Person:Adult {name: row.name}) MATCH (target:`Pet` {id: toIntegerOrNull(row.pet_id)}) MERGE (source)-[:HAS_PET {since: row.since}]->(target)",
+    ]
+
+    assert get_lookup_keys(statements) == {
+        ("Person", "name"),
+        ("Person", "birth date"),
+        ("Adult", "name"),
+        ("Pet", "id"),
+    }
+
+
+def test_split_index_statements_keeps_lookup_indexes() -> None:
+    lookup_keys = {("Person", "age")}
+
+    assert split_index_statements(pre_ingest, lookup_keys=lookup_keys) == (
+        [pre_ingest[0]],
+        [pre_ingest[1], pre_ingest[2]],
+    )
+
+
+def test_local_server_defers_indexes(
+    local_server: LocalServer, executed: List[Tuple[str, Dict[str, Any]]]
+) -> None:
+    local_server.config = {
+        **local_server.config,
+        "pre_ingest": pre_ingest,
+        "post_ingest": [
+            "MATCH (n:Person) SET n:Loaded",
+            "CREATE INDEX person_city FOR (n:Person) ON (n.city)",
+        ],
+    }
+    local_server.defer_indexes = True
+
+    local_server.pre_ingest()
+    assert [cql for cql, _ in executed] == [pre_ingest[1], "CALL db.awaitIndexes(300)"]
+
+    executed.clear()
+    local_server.post_ingest()
+    statements = [cql for cql, _ in executed]
+    # the indexes are built in parallel, so in any order, and awaited before the rest of post_ingest
+    assert sorted(statements[:3]) == sorted(
+        [
+            pre_ingest[0],
+            pre_ingest[2],
+            "CREATE INDEX person_city FOR (n:Person) ON (n.city)",
+        ]
+    )
+    assert statements[3:] == [
+        "CALL db.awaitIndexes(300)",
+        "MATCH (n:Person) SET n:Loaded",
+    ]
+
+
+def test_local_server_keeps_match_indexes_in_pre_ingest(
+    local_server: LocalServer, executed: List[Tuple[str, Dict[str, Any]]]
+) -> None:
+    local_server.config = {
+        **local_server.config,
+        "pre_ingest": pre_ingest,
+        "files": [
+            {
+                "url": "people.csv",
+                "cql": "WITH $dict.rows AS rows UNWIND rows AS row MATCH (n:Person {age: row.age}) SET n.bio = row.bio",
+            }
+        ],
+    }
+    local_server.defer_indexes = True
+
+    local_server.pre_ingest()
+    assert [cql for cql, _ in executed] == [
+        pre_ingest[1],
+        pre_ingest[2],
+        "CALL db.awaitIndexes(300)",
+    ]
+
+    executed.clear()
+    local_server.post_ingest()
+    assert [cql for cql, _ in executed] == [pre_ingest[0], "CALL db.awaitIndexes(300)"]
+
+
+def test_local_server_runs_pre_ingest_in_order_by_default(
+    local_server: LocalServer, executed: List[Tuple[str, Dict[str, Any]]]
+) -> None:
+    local_server.config = {**local_server.config, "pre_ingest": pre_ingest}
+
+    local_server.pre_ingest()
+    local_server.post_ingest()
+
+    assert [cql for cql, _ in executed] == pre_ingest
@@ -0,0 +1,184 @@
+import threading
+from typing import Any, Callable, Dict, List, Tuple
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+import pytest
+
+from neo4j_runway.ingestion import IngestOptions, pyingest
+from neo4j_runway.ingestion.pyingest import Ingestor, PyIngest
+
+people = pd.DataFrame({"name": ["Bob", "Ben", "Amy"]})
+pets = pd.DataFrame({"pet_name": ["Benny", "Spike"]})
+
+
+def get_config(label: str, column: str, database: str = "") -> str:
+    return f"""
+server_uri: bolt://localhost:7687
+admin_user: neo4j
+admin_pass: password
+{f"database: {database}" if database else ""}
+files:
+- url: $BASE/data/{label.lower()}.csv
+  chunk_size: 1
+  cql: |-
+    WITH $dict.rows AS rows UNWIND rows AS row
+    MERGE (n:{label} {{name: row.{column}}})
+"""
+
+
+@pytest.fixture(scope="function")
+def driver(
+    mock_graph_database: MagicMock,
+    create_session: Callable[[Callable[..., MagicMock]], MagicMock],
+    create_result: Callable[..., MagicMock],
+) -> Tuple[MagicMock, List[Tuple[str, Dict[str, Any]]]]:
+    """
+    A mocked driver recording the (cql, session config) of every statement it runs, from any thread.
+    """
+
+    executed: List[Tuple[str, Dict[str, Any]]] = list()
+    lock = threading.Lock()
+
+    def create_recording_session(**session_config: Any) -> MagicMock:
+        def run(cql: str, **params: Any) -> MagicMock:
+            with lock:
+                executed.append((cql, session_config))
+            return create_result()
+
+        return create_session(run)
+
+    mock_graph_database.driver.return_value.session.side_effect = (
+        create_recording_session
+    )
+    return mock_graph_database, executed
+
+
+def test_ingestor_shares_driver_across_concurrent_loads(
+    driver: Tuple[MagicMock, List[Tuple[str, Dict[str, Any]]]],
+) -> None:
+    mock_graph_database, executed = driver
+    results: Dict[str, Any] = dict()
+
+    with Ingestor(
+        uri="bolt://localhost:7687", username="neo4j", password="password"
+    ) as ingestor:
+
+        def load(label: str, column: str, dataframe: pd.DataFrame) -> None:
+            results[label] = ingestor.ingest(
+                get_config(label, column), dataframe=dataframe
+            )
+
+        threads = [
+            threading.Thread(target=load, args=("Person", "name", people)),
+            threading.Thread(target=load, args=("Pet", "pet_name", pets)),
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        mock_graph_database.driver.return_value.close.assert_not_called()
+
+    mock_graph_database.driver.assert_called_once()
+    mock_graph_database.driver.return_value.close.assert_called_once()
+    # each load keeps its own metrics
+    assert [s.rows_sent for s in results["Person"].statements.values()] == [3]
+    assert [s.rows_sent for s in results["Pet"].statements.values()] == [2]
+    assert sum("(n:Person " in cql for cql, _ in executed) == 3
+    assert sum("(n:Pet " in cql for cql, _ in executed) == 2
+
+
+def test_ingestor_database_is_used_when_config_has_none(
+    driver: Tuple[MagicMock, List[Tuple[str, Dict[str, Any]]]],
+) -> None:
+    _, executed = driver
+
+    with Ingestor(
+        uri="bolt://localhost:7687",
+        username="neo4j",
+        password="password",
+        database="people",
+    ) as ingestor:
+        ingestor.ingest(get_config("Person", "name"), dataframe=people)
+        ingestor.ingest(get_config("Pet", "pet_name", database="pets"), dataframe=pets)
+
+    assert {config["database"] for cql, config in executed if "Person" in cql} == {
+        "people"
+    }
+    assert {config["database"] for cql, config in executed if "Pet" in cql} == {"pets"}
+
+
+def test_pyingest_does_not_set_global_config(
+    driver: Tuple[MagicMock, List[Tuple[str, Dict[str, Any]]]],
+) -> None:
+    mock_graph_database, _ = driver
+    pyingest.global_config = dict()
+
+    PyIngest(config=get_config("Person", "name"), dataframe=people)
+
+    assert pyingest.global_config == dict()
+    mock_graph_database.driver.return_value.close.assert_called_once()
+
+
+def test_pyingest_forwards_options_and_keyword_overrides(
+    driver: Tuple[MagicMock, List[Tuple[str, Dict[str, Any]]]],
+) -> None:
+    options = IngestOptions(max_workers=2, deduplicate_nodes="chunk")
+
+    with patch.object(
+        pyingest, "run_scheduled", wraps=pyingest.run_scheduled
+    ) as run_scheduled:
+        PyIngest(
+            config=get_config("Person", "name"),
+            dataframe=people,
+            options=options,
+            group_by_source=True,
+        )
+
+    assert run_scheduled.call_args.kwargs["max_workers"] == 2
+    # grouped entries are scheduled as lists of entries
+    assert isinstance(run_scheduled.call_args.kwargs["tasks"][0], list)
+    # the options passed in are left unchanged
+    assert not options.group_by_source
+
+
+def test_ingestor_rejects_unknown_options(
+    driver: Tuple[MagicMock, List[Tuple[str, Dict[str, Any]]]],
+) -> None:
+    with Ingestor(
+        uri="bolt://localhost:7687", username="neo4j", password="password"
+    ) as ingestor:
+        with pytest.raises(TypeError):
+            ingestor.ingest(
+                get_config("Person", "name"), dataframe=people, max_wokers=2
+            )
+
+
+def test_ingestor_releases_resources_when_a_statement_fails(
+    driver: Tuple[MagicMock, List[Tuple[str, Dict[str, Any]]]],
+    tmp_path: Any,
+) -> None:
+    with Ingestor(
+        uri="bolt://localhost:7687", username="neo4j", password="password"
+    ) as ingestor:
+        with (
+            patch.object(
+                pyingest.LocalServer,
+                "load_dataframe",
+                side_effect=RuntimeError("failed"),
+            ),
+            patch.object(pyingest.LocalServer, "close") as close_server,
+            patch.object(
+                pyingest.FingerprintStore, "close", autospec=True
+            ) as close_fingerprints,
+        ):
+            with pytest.raises(RuntimeError):
+                ingestor.ingest(
+                    get_config("Person", "name"),
+                    dataframe=people,
+                    fingerprint_file=str(tmp_path / "fingerprints.db"),
+                )
+
+    close_server.assert_called_once()
+    close_fingerprints.assert_called_once()
@@ -0,0 +1,83 @@
+from typing import Any, List
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+from neo4j_runway.ingestion.metrics import BatchMetrics, IngestionMetrics
+from neo4j_runway.ingestion.pyingest import LocalServer, PyIngest
+from neo4j_runway.ingestion.rejects import RejectWriter
+from tests.resources.answers.people_pets import people_pets_yaml_string
+
+file = {
+    "url": "$BASE/tests/resources/data/pets.csv",
+    "cql": "WITH $dict.rows AS rows UNWIND rows AS row MERGE (n:Pet {name: row.pet_name})",
+    "chunk_size": 4,
+}
+
+
+def test_latency_percentiles() -> None:
+    metrics = IngestionMetrics()
+    for latency in range(1, 101):
+        metrics.record_batch(
+            BatchMetrics(key="a", url="a.csv", rows_read=10, server_seconds=latency),
+            cql="",
+        )
+
+    statement = metrics.statements["a"]
+    assert statement.batches == 100
+    assert statement.rows_read == 1000
+    assert statement.latency_p50 == pytest.approx(50.5)
+    assert statement.latency_p95 == pytest.approx(95.05)
+    assert statement.latency_p99 == pytest.approx(99.01)
+
+
+def test_load_csv_records_statement_metrics(local_server: LocalServer) -> None:
+    batches: List[BatchMetrics] = list()
+    local_server.metrics.callback = batches.append
+
+    local_server.load_csv(file)
+
+    assert [b.rows_read for b in batches] == [4, 4, 1]
+    (statement,) = local_server.metrics.statements.values()
+    assert statement.batches == 3
+    assert statement.rows_read == 9
+    assert statement.rows_sent == 9
+    assert statement.counters["nodes_created"] == 9
+    assert statement.parse_seconds > 0
+    assert statement.to_dict()["rows_per_second"] > 0
+
+
+def test_load_csv_records_rejected_rows(
+    local_server: LocalServer, fail_on: set, tmp_path: str
+) -> None:
+    local_server.reject_writer = RejectWriter(f"{tmp_path}/rejects.jsonl")
+    fail_on.add("Spike")
+
+    local_server.load_csv(file)
+
+    (statement,) = local_server.metrics.statements.values()
+    assert statement.rows_read == 9
+    assert statement.rows_sent == 7
+    assert statement.rows_rejected == 2
+
+
+def test_pyingest_returns_metrics(local_server: LocalServer) -> None:
+    def create_server(metrics: IngestionMetrics, **kwargs: Any) -> LocalServer:
+        local_server.metrics = metrics
+        return local_server
+
+    batches: List[BatchMetrics] = list()
+    with patch(
+        "neo4j_runway.ingestion.pyingest.LocalServer", side_effect=create_server
+    ):
+        metrics = PyIngest(
+            config=people_pets_yaml_string,
+            dataframe=pd.read_csv("tests/resources/data/people-pets.csv"),
+            metrics_callback=batches.append,
+        )
+
+    statement_count = people_pets_yaml_string.count("cql:")
+    assert len(metrics.statements) == statement_count
+    assert len(batches) == statement_count
+    assert all(m.rows_read == m.rows_sent for m in metrics.statements.values())
@@ -0,0 +1,94 @@
+from typing import Any, Dict, List, Set, Tuple
+
+import pandas as pd
+import pytest
+from neo4j.exceptions import Neo4jError
+
+from neo4j_runway.ingestion.parallel import get_byte_ranges, iter_parsed_batches
+from neo4j_runway.ingestion.pyingest import LocalServer, get_params
+
+file = {
+    "url": "$BASE/tests/resources/data/pets.csv",
+    "cql": "WITH $dict.rows AS rows UNWIND rows AS row MERGE (n:Pet {name: row.pet_name})",
+    "chunk_size": 2,
+}
+
+
+def test_get_byte_ranges_end_on_line_boundaries() -> None:
+    url = "tests/resources/data/pets.csv"
+    with open(url, "rb") as f:
+        header = f.readline()
+        data = f.read()
+
+    ranges = get_byte_ranges(url, start=len(header), partition_bytes=100)
+
+    assert ranges[0][0] == len(header)
+    assert ranges[-1][1] == len(header) + len(data)
+    for (_, end), (start, _) in zip(ranges, ranges[1:]):
+        assert end == start
+    with open(url, "rb") as f:
+        for _, end in ranges[:-1]:
+            f.seek(end - 1)
+            assert f.read(1) == b"\n"
+
+
+def test_iter_parsed_batches_reads_every_row_once() -> None:
+    params = get_params(file, basepath="./")
+    params["skip_records"] = 1
+
+    batches = list(
+        iter_parsed_batches(
+            params, columns_list=[["pet_name"], None], processes=3, partition_bytes=100
+        )
+    )
+
+    expected = pd.read_csv("tests/resources/data/pets.csv", dtype=str)
+    pet_names = [
+        row["pet_name"] for batch in batches for row in batch.rows_dicts[0]["rows"]
+    ]
+    assert sorted(pet_names) == sorted(expected["pet_name"].tolist()[1:])
+    assert sum(batch.rows for batch in batches) == len(expected) - 1
+    assert all(
+        list(batch.rows_dicts[1]["rows"][0]) == list(expected.columns)
+        for batch in batches
+    )
+
+
+def test_load_csv_with_parse_processes(
+    local_server: LocalServer, executed: List[Tuple[str, Dict[str, Any]]]
+) -> None:
+    local_server.parse_processes = 2
+    local_server.writer_threads = 2
+
+    local_server.load_csv(file)
+
+    loaded = [
+        row["pet_name"] for _, params in executed for row in params["dict"]["rows"]
+    ]
+    expected = pd.read_csv("tests/resources/data/pets.csv")["pet_name"].tolist()
+    assert sorted(loaded) == sorted(expected)
+    (statement,) = local_server.metrics.statements.values()
+    assert statement.rows_sent == len(expected)
+
+
+def test_load_csv_with_parse_processes_raises_write_error(
+    local_server: LocalServer, fail_on: Set[Any]
+) -> None:
+    local_server.parse_processes = 2
+    fail_on.add("Spike")
+
+    with pytest.raises(Neo4jError):
+        local_server.load_csv(file)
+
+
+def test_load_csv_with_parse_processes_warns_on_serial_only_options(
+    local_server: LocalServer, executed: List[Tuple[str, Dict[str, Any]]]
+) -> None:
+    local_server.parse_processes = 2
+    local_server.deduplicate_nodes = "file"
+    local_server.relationship_partitions = 4
+
+    with pytest.warns(UserWarning, match="deduplicate_nodes, relationship_partitions"):
+        local_server.load_csv(file)
+
+    assert executed
@@ -0,0 +1,79 @@
+from typing import Any, Dict, List, Tuple
+
+import pandas as pd
+
+from neo4j_runway.ingestion.partitioning import (
+    get_partition_rounds,
+    get_relationship_key_columns,
+    partition_rows,
+)
+from neo4j_runway.ingestion.pyingest import LocalServer
+
+relationship_cql = """WITH $dict.rows AS rows
+UNWIND rows as row
+MATCH (source:Person {name: row.name, age: toIntegerOrNull(row.age)})
+MATCH (target:Pet {name: row.pet_name})
+MERGE (source)-[n:HAS_PET]->(target)"""
+
+
+def test_get_relationship_key_columns() -> None:
+    assert get_relationship_key_columns(relationship_cql) == (
+        ["name", "age"],
+        ["pet_name"],
+    )
+    assert (
+        get_relationship_key_columns(
+            "WITH $dict.rows AS rows UNWIND rows AS row MERGE (n:Pet {name: row.pet_name})"
+        )
+        is None
+    )
+
+
+def test_get_partition_rounds_cover_grid_without_conflicts() -> None:
+    rounds = get_partition_rounds(4)
+
+    cells = [cell for partition_round in rounds for cell in partition_round]
+    assert sorted(cells) == [(i, j) for i in range(4) for j in range(4)]
+    for partition_round in rounds:
+        assert len({source for source, _ in partition_round}) == 4
+        assert len({target for _, target in partition_round}) == 4
+
+
+def test_partition_rows_keeps_each_key_in_one_bucket() -> None:
+    rows = pd.read_csv("tests/resources/data/pets.csv", dtype=str)
+
+    cells = partition_rows(
+        rows, source_columns=["name"], target_columns=["pet_name"], partitions=3
+    )
+
+    assert sum(len(cell) for cell in cells.values()) == len(rows)
+    source_buckets: Dict[str, int] = dict()
+    for (source, _), cell in cells.items():
+        for name in cell["name"]:
+            assert source_buckets.setdefault(name, source) == source
+
+
+def test_load_csv_with_relationship_partitions(
+    local_server: LocalServer, executed: List[Tuple[str, Dict[str, Any]]]
+) -> None:
+    local_server.relationship_partitions = 2
+
+    local_server.load_csv(
+        {
+            "url": "$BASE/tests/resources/data/pets.csv",
+            "cql": relationship_cql,
+            "chunk_size": 100,
+        }
+    )
+
+    sent = [row for _, params in executed for row in params["dict"]["rows"]]
+    expected = pd.read_csv("tests/resources/data/pets.csv", dtype=str)[
+        ["name", "age", "pet_name"]
+    ]
+    assert sorted(map(str, sent)) == sorted(
+        map(str, expected.to_dict(orient="records"))
+    )
+    assert len(executed) > 1
+    (statement,) = local_server.metrics.statements.values()
+    assert statement.batches == 1
+    assert statement.rows_sent == len(expected)
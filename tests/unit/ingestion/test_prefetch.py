@@ -0,0 +1,98 @@
+import time
+from typing import Any, Dict, Iterator, List, Tuple
+
+import pandas as pd
+import pytest
+
+from neo4j_runway.ingestion.prefetch import ChunkPrefetcher, iter_timed_chunks
+from neo4j_runway.ingestion.pyingest import LocalServer
+
+file = {
+    "url": "$BASE/tests/resources/data/pets.csv",
+    "cql": "WITH $dict.rows AS rows UNWIND rows AS row MERGE (n:Pet {name: row.pet_name})",
+    "chunk_size": 4,
+}
+
+
+def get_chunks(count: int, read: List[int]) -> Iterator[pd.DataFrame]:
+    for i in range(count):
+        read.append(i)
+        yield pd.DataFrame({"value": [i] * 10})
+
+
+def test_iter_timed_chunks_transforms_chunks() -> None:
+    chunks = list(
+        iter_timed_chunks(
+            get_chunks(3, list()), transform=lambda rows: rows.assign(value=0)
+        )
+    )
+
+    assert [chunk.rows["value"].sum() for chunk in chunks] == [0, 0, 0]
+    assert all(chunk.reader_blocked_seconds == 0 for chunk in chunks)
+
+
+def test_prefetcher_reads_ahead_up_to_max_chunks() -> None:
+    read: List[int] = list()
+    prefetcher = ChunkPrefetcher(get_chunks(10, read), max_chunks=2)
+
+    chunks = iter(prefetcher)
+    first = next(chunks)
+    time.sleep(0.05)
+
+    # one chunk is held by the writer, two are queued and one waits for room
+    assert first.rows["value"][0] == 0
+    assert read == [0, 1, 2, 3]
+    assert [chunk.rows["value"][0] for chunk in chunks] == list(range(1, 10))
+    assert prefetcher.reader_blocked_seconds > 0
+
+
+def test_prefetcher_memory_cap() -> None:
+    read: List[int] = list()
+    chunk_memory = int(pd.DataFrame({"value": [0] * 10}).memory_usage(deep=True).sum())
+    prefetcher = ChunkPrefetcher(
+        get_chunks(10, read), max_chunks=5, max_memory=chunk_memory
+    )
+
+    chunks = iter(prefetcher)
+    next(chunks)
+    time.sleep(0.05)
+
+    assert read == [0, 1, 2]
+    prefetcher.close()
+
+
+def test_prefetcher_raises_reader_errors_in_order() -> None:
+    def failing_chunks() -> Iterator[pd.DataFrame]:
+        yield pd.DataFrame({"value": [1]})
+        raise ValueError("bad source")
+
+    chunks = iter(ChunkPrefetcher(failing_chunks()))
+
+    assert next(chunks).rows["value"][0] == 1
+    with pytest.raises(ValueError, match="bad source"):
+        next(chunks)
+
+
+def test_prefetcher_close_stops_reader() -> None:
+    read: List[int] = list()
+    prefetcher = ChunkPrefetcher(get_chunks(100, read), max_chunks=1)
+
+    with prefetcher:
+        next(iter(prefetcher))
+
+    assert len(read) < 100
+    assert prefetcher._thread is not None and not prefetcher._thread.is_alive()
+
+
+def test_load_csv_with_prefetch(
+    local_server: LocalServer, executed: List[Tuple[str, Dict[str, Any]]]
+) -> None:
+    local_server.prefetch_chunks = 2
+
+    local_server.load_csv(file)
+
+    sent = [row["pet_name"] for _, params in executed for row in params["dict"]["rows"]]
+    assert sent == pd.read_csv("tests/resources/data/pets.csv")["pet_name"].tolist()
+    (statement,) = local_server.metrics.statements.values()
+    assert statement.batches == 3
+    assert statement.to_dict()["writer_blocked_seconds"] >= 0
@@ -0,0 +1,62 @@
+import asyncio
+from typing import Any, Dict, List
+from unittest.mock import MagicMock
+
+import pandas as pd
+import pytest
+
+from neo4j_runway.ingestion.pyingest_async import AsyncLocalServer, PyIngestAsync
+
+file = {
+    "url": "$BASE/tests/resources/data/pets.csv",
+    "cql": "WITH $dict.rows AS rows UNWIND rows AS row MERGE (n:Pet {name: row.name})",
+    "chunk_size": 1,
+}
+
+
+def test_load_csv_bounds_transactions_in_flight(
+    mock_async_graph_database: MagicMock, async_state: Dict[str, Any]
+) -> None:
+    server = AsyncLocalServer(max_in_flight=2)
+
+    asyncio.run(server.load_csv(file))
+
+    expected: List[str] = list(pd.read_csv("tests/resources/data/pets.csv")["name"])
+    assert sorted(r["name"] for r in async_state["rows"]) == sorted(expected)
+    assert async_state["max_open"] == 2
+
+
+def test_load_dataframe_raises_server_error(
+    mock_async_graph_database: MagicMock, async_state: Dict[str, Any]
+) -> None:
+    async_state["fail"] = True
+    server = AsyncLocalServer(max_in_flight=2)
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(
+            server.load_dataframe(
+                file, dataframe=pd.read_csv("tests/resources/data/pets.csv")
+            )
+        )
+
+
+def test_pyingest_async_reads_yaml_string(
+    mock_async_graph_database: MagicMock, async_state: Dict[str, Any]
+) -> None:
+    yaml_string = f"""
+server_uri: bolt://localhost:7687
+admin_user: neo4j
+admin_pass: password
+basepath: ./
+files:
+- url: {file["url"]}
+  chunk_size: 4
+  cql: |-
+    {file["cql"]}
+"""
+
+    with pytest.warns(UserWarning, match="yaml_string"):
+        asyncio.run(PyIngestAsync(config="", yaml_string=yaml_string))
+
+    expected: List[str] = list(pd.read_csv("tests/resources/data/pets.csv")["name"])
+    assert sorted(r["name"] for r in async_state["rows"]) == sorted(expected)
@@ -0,0 +1,148 @@
+import warnings
+from typing import Any, Dict, List, Tuple
+from unittest.mock import patch
+
+import pandas as pd
+from yaml import safe_load
+
+from neo4j_runway.ingestion import pyingest
+from neo4j_runway.ingestion.pyingest import LocalServer, PyIngest, group_files
+from neo4j_runway.ingestion.scheduler import (
+    build_dependency_graph,
+    collapse_dependency_graph,
+    run_scheduled,
+)
+from tests.resources.answers.people_pets import people_pets_yaml_string
+
+person = "WITH $dict.rows AS rows UNWIND rows AS row MERGE (n:Person {name: row.name})"
+pet = "WITH $dict.rows AS rows UNWIND rows AS row MERGE (n:Pet {name: row.pet_name})"
+has_pet = "WITH $dict.rows AS rows UNWIND rows AS row MATCH (source:Person {name: row.name}) MATCH (target:Pet {name: row.pet_name}) MERGE (source)-[:HAS_PET]->(target)"
+knows = "WITH $dict.rows AS rows UNWIND rows AS row MATCH (source:Person {name: row.name}) MATCH (target:Person {name: row.knows}) MERGE (source)-[:KNOWS]->(target)"
+
+files = [
+    {"url": "$BASE/tests/resources/data/pets.csv", "cql": has_pet, "chunk_size": 4},
+    {"url": "$BASE/tests/resources/data/pets.csv", "cql": person, "chunk_size": 5},
+    {"url": "$BASE/tests/resources/data/shelters.csv", "cql": pet},
+]
+
+
+def test_group_files_single_source() -> None:
+    file_list = safe_load(people_pets_yaml_string)["files"]
+    groups = group_files(
+        file_list, build_dependency_graph([f["cql"] for f in file_list])
+    )
+
+    assert groups == [[0, 1, 2, 3], [4, 5, 6, 7]]
+
+
+def test_group_files_orders_nodes_first() -> None:
+    dependencies = build_dependency_graph([f["cql"] for f in files])
+    groups = group_files(files, dependencies)
+
+    assert groups == [[1], [0], [2]]
+    assert collapse_dependency_graph(dependencies, groups) == {
+        0: set(),
+        1: {0, 2},
+        2: set(),
+    }
+
+
+def test_group_files_splits_flatten_settings() -> None:
+    url = "$BASE/tests/resources/data/pets.jsonl"
+    json_files = [
+        {"url": url, "cql": person},
+        {"url": url, "cql": pet, "flatten_separator": "."},
+        {"url": url, "cql": pet, "flatten_max_level": 1},
+        {"url": url, "cql": has_pet, "flatten_separator": "_"},
+    ]
+
+    groups = group_files(
+        json_files, build_dependency_graph([f["cql"] for f in json_files])
+    )
+
+    assert groups == [[0], [3], [1], [2]]
+
+
+def test_group_files_splits_same_label_relationships() -> None:
+    url = "$BASE/tests/resources/data/pets.csv"
+    csv_files = [{"url": url, "cql": knows}, {"url": url, "cql": person}]
+
+    groups = group_files(
+        csv_files, build_dependency_graph([f["cql"] for f in csv_files])
+    )
+
+    # the KNOWS target of an early chunk may only be MERGEd by a later chunk
+    assert groups == [[1], [0]]
+
+
+def test_group_files_does_not_create_cycles() -> None:
+    node_a = "WITH $dict.rows AS rows UNWIND rows AS row MERGE (n:A {id: row.id})"
+    node_b = "WITH $dict.rows AS rows UNWIND rows AS row MERGE (n:B {id: row.id})"
+    a_to_b = "WITH $dict.rows AS rows UNWIND rows AS row MATCH (source:A {id: row.id}) MATCH (target:B {id: row.b}) MERGE (source)-[:R1]->(target)"
+    b_to_a = "WITH $dict.rows AS rows UNWIND rows AS row MATCH (source:B {id: row.id}) MATCH (target:A {id: row.a}) MERGE (source)-[:R2]->(target)"
+    cycle_files = [
+        {"url": "$BASE/a.csv", "cql": node_a},
+        {"url": "$BASE/a.csv", "cql": a_to_b},
+        {"url": "$BASE/b.csv", "cql": node_b},
+        {"url": "$BASE/b.csv", "cql": b_to_a},
+    ]
+    dependencies = build_dependency_graph([f["cql"] for f in cycle_files])
+
+    groups = group_files(cycle_files, dependencies)
+    collapsed = collapse_dependency_graph(dependencies, groups)
+
+    assert groups == [[0], [1], [2], [3]]
+    started: List[int] = list()
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        run_scheduled(
+            tasks=groups, dependencies=collapsed, worker=lambda g: started.extend(g)
+        )
+    assert started.index(1) > started.index(2)
+    assert started.index(3) > started.index(0)
+
+
+def test_load_csv_group_reads_file_once(
+    local_server: LocalServer, executed: List[Tuple[str, Dict[str, Any]]]
+) -> None:
+    with patch(
+        "neo4j_runway.ingestion.pyingest.read_csv_chunks",
+        wraps=pyingest.read_csv_chunks,
+    ) as mock_read:
+        local_server.load_csv_group([files[1], files[0]])
+
+    mock_read.assert_called_once()
+    # 9 rows in chunks of 4 -> 3 chunks, each run against both statements in order
+    assert [cql for cql, _ in executed] == [person, has_pet] * 3
+    assert sum(len(params["dict"]["rows"]) for _, params in executed) == 2 * len(
+        pd.read_csv("tests/resources/data/pets.csv")
+    )
+
+
+def test_pyingest_grouped_loads_nodes_before_same_source_relationships(
+    local_server: LocalServer, executed: List[Tuple[str, Dict[str, Any]]]
+) -> None:
+    config = f"""
+server_uri: bolt://localhost:7687
+admin_user: neo4j
+admin_pass: password
+files:
+- url: $BASE/tests/resources/data/pets.csv
+  chunk_size: 2
+  cql: |-
+    {knows}
+- url: $BASE/tests/resources/data/pets.csv
+  chunk_size: 2
+  cql: |-
+    {person}
+"""
+
+    PyIngest(
+        config=config,
+        dataframe=pd.read_csv("tests/resources/data/pets.csv"),
+        group_by_source=True,
+    )
+
+    statements = [cql for cql, _ in executed]
+    assert statements == sorted(statements, key=lambda cql: cql == knows)
+    assert statements.count(person) == statements.count(knows) == 5
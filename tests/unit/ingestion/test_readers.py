@@ -0,0 +1,344 @@
+import bz2
+import decimal
+import gzip
+import json
+import lzma
+from typing import Any, Callable, Dict, List, Tuple
+
+import pandas as pd
+import pytest
+
+from neo4j_runway.ingestion.pyingest import LocalServer, get_params
+from neo4j_runway.ingestion.readers import (
+    flatten_record,
+    get_compression,
+    get_source_format,
+    open_source,
+    read_arrow_chunks,
+    read_json_chunks,
+    read_parquet_chunks,
+)
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+requires_pyarrow = pytest.mark.skipif(pa is None, reason="pyarrow is not installed")
+
+cql = "WITH $dict.rows AS rows UNWIND rows AS row MERGE (n:Pet {name: row.name, age: row.age})"
+
+
+@pytest.fixture(scope="module")
+def table() -> "pa.Table":
+    return pa.table(
+        {
+            "name": ["Benny", "Spike", "Mia", None, "Gerald", "Donald", "Otto"],
+            "age": [1, 2, None, 4, 5, 6, 7],
+            "notes": ["a", "b", "c", "d", "e", "f", "g"],
+        }
+    )
+
+
+def _get_params(url: str, chunk_size: int, skip_records: int = 0) -> Dict[str, Any]:
+    return get_params(
+        {"url": url, "cql": cql, "chunk_size": chunk_size, "skip_records": skip_records}
+    )
+
+
+def test_get_source_format() -> None:
+    assert get_source_format("data/pets.parquet") == "parquet"
+    assert get_source_format("data/pets.ARROW") == "arrow"
+    assert get_source_format("data/pets.feather") == "arrow"
+    assert get_source_format("data/pets.jsonl") == "jsonl"
+    assert get_source_format("data/pets.json") == "json"
+    assert get_source_format("data/pets.csv") == "csv"
+    assert (
+        get_params({"url": "pets.txt", "cql": cql, "format": "parquet"})["format"]
+        == "parquet"
+    )
+
+
+@requires_pyarrow
+def test_read_parquet_chunks_across_row_groups(
+    table: "pa.Table", tmp_path: Any
+) -> None:
+    url = str(tmp_path / "pets.parquet")
+    pq.write_table(table, url, row_group_size=3)
+
+    chunks = list(read_parquet_chunks(_get_params(url, chunk_size=2)))
+
+    assert [len(chunk) for chunk in chunks] == [2, 2, 2, 1]
+    assert list(chunks[0].columns) == ["name", "age"]
+    assert pd.concat(chunks)["name"].tolist()[:3] == ["Benny", "Spike", "Mia"]
+
+
+@requires_pyarrow
+def test_read_parquet_chunks_skips_records(table: "pa.Table", tmp_path: Any) -> None:
+    url = str(tmp_path / "pets.parquet")
+    pq.write_table(table, url, row_group_size=3)
+
+    chunks = list(read_parquet_chunks(_get_params(url, chunk_size=10, skip_records=4)))
+
+    assert pd.concat(chunks)["name"].tolist() == ["Gerald", "Donald", "Otto"]
+
+
+@requires_pyarrow
+def test_read_arrow_chunks_file_and_stream(table: "pa.Table", tmp_path: Any) -> None:
+    file_url = str(tmp_path / "pets.arrow")
+    with ipc.new_file(file_url, table.schema) as writer:
+        for batch in table.to_batches(max_chunksize=3):
+            writer.write_batch(batch)
+    stream_url = str(tmp_path / "pets.ipc")
+    with ipc.new_stream(stream_url, table.schema) as writer:
+        writer.write_table(table)
+
+    for url in (file_url, stream_url):
+        chunks = list(read_arrow_chunks(_get_params(url, chunk_size=4, skip_records=1)))
+        assert [len(chunk) for chunk in chunks] == [4, 2]
+        assert list(chunks[0].columns) == ["name", "age"]
+        assert chunks[0]["name"].tolist()[0] == "Spike"
+
+
+@requires_pyarrow
+def test_load_parquet_sends_native_values(
+    table: "pa.Table",
+    local_server: LocalServer,
+    executed: List[Tuple[str, Dict[str, Any]]],
+    tmp_path: Any,
+) -> None:
+    pq.write_table(table, str(tmp_path / "pets.parquet"), row_group_size=3)
+    local_server.basepath = str(tmp_path)
+
+    local_server.load_csv({"url": "$BASE/pets.parquet", "cql": cql, "chunk_size": 5})
+
+    rows = [row for _, params in executed for row in params["dict"]["rows"]]
+    assert rows[0] == {"name": "Benny", "age": 1}
+    assert isinstance(rows[0]["age"], int)
+    assert rows[2] == {"name": "Mia"}
+    assert rows[3] == {"age": 4}
+    assert len(rows) == 7
+
+
+@requires_pyarrow
+def test_read_parquet_chunks_converts_decimals(tmp_path: Any) -> None:
+    url = str(tmp_path / "prices.parquet")
+    pq.write_table(
+        pa.table(
+            {
+                "name": ["Benny", "Spike"],
+                "age": pa.array(
+                    [decimal.Decimal("1.25"), None], type=pa.decimal128(10, 2)
+                ),
+                "notes": pa.array(
+                    [[decimal.Decimal("0.5")], list()],
+                    type=pa.list_(pa.decimal128(3, 1)),
+                ),
+            }
+        ),
+        url,
+    )
+    params = get_params(
+        {
+            "url": url,
+            "cql": "WITH $dict.rows AS rows UNWIND rows AS row MERGE (n:Pet {name: row.name, age: row.age, notes: row.notes})",
+        }
+    )
+
+    (chunk,) = read_parquet_chunks(params)
+
+    assert chunk["age"][0] == 1.25 and isinstance(chunk["age"][0], float)
+    assert chunk["age"].isna().tolist() == [False, True]
+    assert chunk["notes"][0] == [0.5]
+
+
+@requires_pyarrow
+def test_read_parquet_and_arrow_chunks_reject_compression(
+    table: "pa.Table", tmp_path: Any
+) -> None:
+    url = str(tmp_path / "pets.parquet.gz")
+    with gzip.open(url, "wb") as file:
+        pq.write_table(table, file)
+
+    with pytest.raises(ValueError, match="gzip"):
+        list(read_parquet_chunks(_get_params(url, chunk_size=2)))
+    with pytest.raises(ValueError, match="gzip"):
+        list(read_arrow_chunks(_get_params(url.replace("parquet", "arrow"), 2)))
+
+
+@requires_pyarrow
+def test_load_parquet_group_projects_every_statement(
+    table: "pa.Table",
+    local_server: LocalServer,
+    executed: List[Tuple[str, Dict[str, Any]]],
+    tmp_path: Any,
+) -> None:
+    pq.write_table(table, str(tmp_path / "pets.parquet"), row_group_size=3)
+    local_server.basepath = str(tmp_path)
+    notes = (
+        "WITH $dict.rows AS rows UNWIND rows AS row MERGE (n:Note {text: row.notes})"
+    )
+
+    local_server.load_csv_group(
+        [
+            {"url": "$BASE/pets.parquet", "cql": cql, "chunk_size": 10},
+            {"url": "$BASE/pets.parquet", "cql": notes, "chunk_size": 10},
+        ]
+    )
+
+    (_, pet_params), (_, note_params) = executed
+    assert pet_params["dict"]["rows"][0] == {"name": "Benny", "age": 1}
+    assert note_params["dict"]["rows"] == [
+        {"notes": note} for note in table["notes"].to_pylist()
+    ]
+
+
+def test_flatten_record() -> None:
+    record = {"name": "Bob", "pet": {"name": "Benny", "toy": {"type": "ball"}}}
+
+    assert flatten_record(record) == {
+        "name": "Bob",
+        "pet_name": "Benny",
+        "pet_toy_type": "ball",
+    }
+    assert flatten_record(record, separator=".", max_level=1) == {
+        "name": "Bob",
+        "pet.name": "Benny",
+        "pet.toy": {"type": "ball"},
+    }
+    assert flatten_record(record, max_level=0) == record
+
+
+def test_read_json_chunks_flattens_and_projects(tmp_path: Any) -> None:
+    url = str(tmp_path / "pets.jsonl")
+    with open(url, "w") as f:
+        for i in range(5):
+            f.write(
+                json.dumps({"id": i, "pet": {"name": f"pet-{i}", "age": i}, "x": 1})
+                + "\n"
+            )
+    params = get_params(
+        {
+            "url": url,
+            "cql": "WITH $dict.rows AS rows UNWIND rows AS row MERGE (n:Pet {id: row.id, name: row.pet_name})",
+            "chunk_size": 2,
+            "skip_records": 1,
+        }
+    )
+
+    chunks = list(read_json_chunks(params))
+
+    assert [len(chunk) for chunk in chunks] == [2, 2]
+    assert list(chunks[0].columns) == ["id", "pet_name"]
+    assert chunks[0].iloc[0].tolist() == [1, "pet-1"]
+    assert isinstance(chunks[0].iloc[0]["id"], int)
+
+
+def test_load_jsonl_matches_csv(
+    local_server: LocalServer, executed: List[Tuple[str, Dict[str, Any]]]
+) -> None:
+    file = {
+        "url": "$BASE/tests/resources/data/pets.jsonl",
+        "cql": "WITH $dict.rows AS rows UNWIND rows AS row MERGE (n:Person {name: row.name, age: row.age})",
+        "chunk_size": 4,
+    }
+
+    local_server.load_csv(file)
+    jsonl_rows = [row for _, params in executed for row in params["dict"]["rows"]]
+    executed.clear()
+    local_server.load_csv({**file, "url": "$BASE/tests/resources/data/pets.json"})
+    json_rows = [row for _, params in executed for row in params["dict"]["rows"]]
+
+    expected = pd.read_csv("tests/resources/data/pets.csv")[["name", "age"]]
+    assert jsonl_rows == expected.to_dict(orient="records")
+    assert json_rows == jsonl_rows
+
+
+def test_load_jsonl_group_projects_every_statement(
+    local_server: LocalServer, executed: List[Tuple[str, Dict[str, Any]]]
+) -> None:
+    url = "$BASE/tests/resources/data/pets.jsonl"
+    ages = "WITH $dict.rows AS rows UNWIND rows AS row MERGE (n:Age {value: row.age})"
+
+    local_server.load_csv_group(
+        [
+            {"url": url, "cql": cql, "chunk_size": 100},
+            {"url": url, "cql": ages, "chunk_size": 100},
+        ]
+    )
+
+    (_, pet_params), (_, age_params) = executed
+    expected = pd.read_csv("tests/resources/data/pets.csv")
+    assert [row["name"] for row in pet_params["dict"]["rows"]] == expected[
+        "name"
+    ].tolist()
+    assert age_params["dict"]["rows"] == expected[["age"]].to_dict(orient="records")
+
+
+def test_get_compression() -> None:
+    assert get_compression("data/pets.csv.gz") == "gzip"
+    assert get_compression("data/pets.csv.BZ2") == "bz2"
+    assert get_compression("data/pets.jsonl.xz") == "xz"
+    assert get_compression("data/pets.csv.zst") == "zstd"
+    assert get_compression("data/pets.csv") == "none"
+    assert get_source_format("data/pets.csv.gz") == "csv"
+    assert get_source_format("data/pets.jsonl.zst") == "jsonl"
+
+
+@pytest.mark.parametrize(
+    "extension,compress",
+    [
+        (".gz", gzip.compress),
+        (".bz2", bz2.compress),
+        (".xz", lzma.compress),
+        pytest.param(
+            ".zst",
+            lambda data: zstandard.ZstdCompressor().compress(data)
+            if zstandard is not None
+            else data,
+            marks=pytest.mark.skipif(
+                zstandard is None, reason="zstandard is not installed"
+            ),
+        ),
+    ],
+)
+def test_load_compressed_csv(
+    local_server: LocalServer,
+    executed: List[Tuple[str, Dict[str, Any]]],
+    tmp_path: Any,
+    extension: str,
+    compress: Callable[[bytes], bytes],
+) -> None:
+    with open("tests/resources/data/pets.csv", "rb") as f:
+        data = f.read()
+    with open(tmp_path / f"pets.csv{extension}", "wb") as f:
+        f.write(compress(data))
+    local_server.basepath = str(tmp_path)
+
+    local_server.load_csv(
+        {
+            "url": f"$BASE/pets.csv{extension}",
+            "cql": "WITH $dict.rows AS rows UNWIND rows AS row MERGE (n:Pet {name: row.pet_name})",
+            "chunk_size": 4,
+            "skip_records": 1,
+        }
+    )
+
+    loaded = [
+        row["pet_name"] for _, params in executed for row in params["dict"]["rows"]
+    ]
+    assert (
+        loaded == pd.read_csv("tests/resources/data/pets.csv")["pet_name"].tolist()[1:]
+    )
+
+
+def test_open_source_unsupported_compression() -> None:
+    with pytest.raises(ValueError):
+        open_source("tests/resources/data/pets.csv", compression="rar")
@@ -0,0 +1,64 @@
+import json
+from typing import Any, Dict, List, Set, Tuple
+
+import pytest
+from neo4j.exceptions import Neo4jError
+
+from neo4j_runway.ingestion.pyingest import LocalServer
+from neo4j_runway.ingestion.rejects import RejectWriter, is_data_error
+from tests.unit.ingestion.conftest import create_neo4j_error
+
+file = {
+    "url": "$BASE/tests/resources/data/pets.csv",
+    "cql": "WITH $dict.rows AS rows UNWIND rows AS row MERGE (n:Pet {name: row.pet_name})",
+    "chunk_size": 4,
+}
+
+
+def test_is_data_error() -> None:
+    assert is_data_error(
+        create_neo4j_error("Neo.ClientError.Statement.SemanticError", "null")
+    )
+    assert is_data_error(
+        create_neo4j_error("Neo.ClientError.Schema.ConstraintValidationFailed", "dup")
+    )
+    assert not is_data_error(
+        create_neo4j_error("Neo.ClientError.Statement.SyntaxError", "typo")
+    )
+    assert not is_data_error(
+        create_neo4j_error("Neo.TransientError.Transaction.DeadlockDetected", "lock")
+    )
+
+
+def test_load_csv_bisects_to_offending_row(
+    local_server: LocalServer,
+    executed: List[Tuple[str, Dict[str, Any]]],
+    fail_on: Set[Any],
+    tmp_path: Any,
+) -> None:
+    reject_file = str(tmp_path / "rejects.jsonl")
+    local_server.reject_writer = RejectWriter(reject_file)
+    fail_on.add("Spike")
+
+    local_server.load_csv(file)
+
+    loaded = [
+        row["pet_name"] for _, params in executed for row in params["dict"]["rows"]
+    ]
+    assert "Spike" not in loaded
+    assert len(loaded) == 7
+
+    with open(reject_file) as f:
+        rejects = [json.loads(line) for line in f]
+    assert [r["row"]["pet_name"] for r in rejects] == ["Spike", "Spike"]
+    assert rejects[0]["url"].endswith("tests/resources/data/pets.csv")
+    assert local_server.reject_writer.rejected_count == 2
+
+
+def test_load_csv_without_reject_file_raises(
+    local_server: LocalServer, fail_on: Set[Any]
+) -> None:
+    fail_on.add("Spike")
+
+    with pytest.raises(Neo4jError):
+        local_server.load_csv(file)
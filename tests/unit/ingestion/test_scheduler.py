@@ -0,0 +1,132 @@
+import threading
+import time
+from typing import List
+
+import pytest
+from yaml import safe_load
+
+from neo4j_runway.ingestion.scheduler import (
+    build_dependency_graph,
+    get_matched_labels,
+    get_merged_labels,
+    run_scheduled,
+    topological_order,
+)
+from tests.resources.answers.people_pets import people_pets_yaml_string
+
+person = """WITH $dict.rows AS rows
+UNWIND rows AS row
+MERGE (n:Person {name: row.name})
+SET n.age = row.age"""
+
+address = """WITH $dict.rows AS rows
+UNWIND rows AS row
+MERGE (target:Address{city: row.city, street: row.street})"""
+
+has_address = """WITH $dict.rows AS rows
+UNWIND rows as row
+MATCH (source:Person{name: row.name})
+MATCH (target:Address{city: row.city, street: row.street})
+MERGE (source)-[n:HAS_ADDRESS]->(target)"""
+
+knows = """WITH $dict.rows AS rows
+UNWIND rows as row
+MATCH (source:`Person` {name: row.name})
+MATCH (target:`Person` {name: row.knows})
+MERGE (source)-[n:KNOWS]->(target)"""
+
+
+def test_get_merged_labels() -> None:
+    assert get_merged_labels(person) == {"Person"}
+    assert get_merged_labels(address) == {"Address"}
+    assert get_merged_labels(has_address) == set()
+
+
+def test_get_matched_labels() -> None:
+    assert get_matched_labels(person) == set()
+    assert get_matched_labels(has_address) == {"Person", "Address"}
+    assert get_matched_labels(knows) == {"Person"}
+
+
+def test_build_dependency_graph() -> None:
+    deps = build_dependency_graph([has_address, person, knows, address])
+
+    assert deps == {0: {1, 3}, 1: set(), 2: {1}, 3: set()}
+
+
+def test_build_dependency_graph_people_pets_config() -> None:
+    files = safe_load(people_pets_yaml_string)["files"]
+    deps = build_dependency_graph([f["cql"] for f in files])
+
+    assert all(len(deps[idx]) == 0 for idx in range(4))
+    assert deps[4] == {0, 1}
+    assert deps[7] == {0}
+
+
+def test_run_scheduled_respects_dependencies() -> None:
+    finished: List[int] = list()
+    lock = threading.Lock()
+
+    def worker(task: int) -> None:
+        # node tasks are slow, so relationship tasks would finish first if run early
+        time.sleep(0.05 if task < 2 else 0.0)
+        with lock:
+            finished.append(task)
+
+    run_scheduled(
+        tasks=[0, 1, 2, 3],
+        dependencies={0: set(), 1: set(), 2: {0}, 3: {0, 1}},
+        worker=worker,
+        max_workers=4,
+    )
+
+    assert finished.index(2) > finished.index(0)
+    assert finished.index(3) > max(finished.index(0), finished.index(1))
+
+
+def test_run_scheduled_single_worker_keeps_order() -> None:
+    finished: List[int] = list()
+
+    run_scheduled(
+        tasks=[0, 1, 2],
+        dependencies={0: {2}, 1: set(), 2: set()},
+        worker=finished.append,
+    )
+
+    assert finished == [1, 2, 0]
+
+
+def test_run_scheduled_cycle_falls_back_to_list_order() -> None:
+    # each statement MATCHes the label the other MERGEs
+    statements = [
+        "UNWIND $rows AS row MATCH (b:B {id: row.b}) MERGE (a:A {id: row.a}) MERGE (a)-[:R]->(b)",
+        "UNWIND $rows AS row MATCH (a:A {id: row.a}) MERGE (b:B {id: row.b}) MERGE (b)-[:R]->(a)",
+        "UNWIND $rows AS row MERGE (c:C {id: row.c})",
+    ]
+    dependencies = build_dependency_graph(statements)
+    assert dependencies == {0: {1}, 1: {0}, 2: set()}
+    started: List[int] = list()
+
+    with pytest.warns(UserWarning, match="cycle"):
+        run_scheduled(tasks=[0, 1, 2], dependencies=dependencies, worker=started.append)
+
+    assert started == [2, 0, 1]
+
+
+def test_topological_order_cycle_falls_back_to_index_order() -> None:
+    with pytest.warns(UserWarning, match="cycle"):
+        assert topological_order({0: {2}, 1: set(), 2: {0}}) == [1, 0, 2]
+
+
+def test_run_scheduled_raises_worker_error() -> None:
+    started: List[int] = list()
+
+    def worker(task: int) -> None:
+        started.append(task)
+        if task == 0:
+            raise RuntimeError("failed")
+
+    with pytest.raises(RuntimeError):
+        run_scheduled(tasks=[0, 1], dependencies={0: set(), 1: {0}}, worker=worker)
+
+    assert started == [0]
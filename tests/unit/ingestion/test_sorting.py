@@ -0,0 +1,118 @@
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from neo4j_runway.ingestion.pyingest import LocalServer, split_dataframe
+from neo4j_runway.ingestion.sorting import get_sort_keys, sort_chunks
+
+relationship_cql = """WITH $dict.rows AS rows
+UNWIND rows AS row
+MATCH (source:Person {name: row.name})
+MATCH (target:Pet {name: row.pet_name})
+MERGE (source)-[n:HAS_PET]->(target)"""
+
+
+def create_rows(num_rows: int) -> pd.DataFrame:
+    rng = np.random.default_rng(7)
+    return pd.DataFrame(
+        {
+            "name": rng.integers(0, 50, num_rows).astype(str),
+            "position": range(num_rows),
+        }
+    )
+
+
+@pytest.mark.parametrize("max_memory", [10**9, 1])
+def test_sort_chunks_is_sorted_and_stable(max_memory: int) -> None:
+    rows = create_rows(1000)
+
+    # a memory budget of 1 byte spills every chunk to its own sorted run
+    chunks = list(
+        sort_chunks(
+            split_dataframe(rows, 64),
+            key_columns=["name"],
+            chunk_size=100,
+            max_memory=max_memory,
+        )
+    )
+
+    assert [len(chunk) for chunk in chunks] == [100] * 10
+    result = pd.concat(chunks, ignore_index=True)
+    expected = rows.sort_values("name", kind="stable", ignore_index=True)
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_sort_chunks_skips_sorted_rows() -> None:
+    rows = create_rows(300)
+
+    chunks = sort_chunks(
+        split_dataframe(rows, 50),
+        key_columns=["name"],
+        chunk_size=100,
+        max_memory=1,
+        skip_rows=120,
+    )
+
+    result = pd.concat(chunks, ignore_index=True)
+    expected = rows.sort_values("name", kind="stable", ignore_index=True)
+    assert result["position"].tolist() == expected["position"].tolist()[120:]
+
+
+def test_get_sort_keys_composite() -> None:
+    rows = pd.DataFrame({"a": ["x", "x", "w"], "b": [2, 1, 3]})
+
+    assert get_sort_keys(rows, ["a", "b"]).tolist() == ["x\x1f2", "x\x1f1", "w\x1f3"]
+
+
+def test_local_server_sorts_relationship_rows(
+    local_server: LocalServer, executed: List[Tuple[str, Dict[str, Any]]]
+) -> None:
+    local_server.sort_relationships = True
+    local_server.max_sort_memory = 1
+
+    local_server.load_csv(
+        {
+            "url": "$BASE/tests/resources/data/pets.csv",
+            "cql": relationship_cql,
+            "chunk_size": 4,
+        }
+    )
+
+    sent = [row["name"] for _, params in executed for row in params["dict"]["rows"]]
+    names = pd.read_csv("tests/resources/data/pets.csv")["name"]
+    assert sent == names.sort_values(kind="stable").tolist()
+
+
+def test_local_server_does_not_sort_node_rows(
+    local_server: LocalServer, executed: List[Tuple[str, Dict[str, Any]]]
+) -> None:
+    local_server.sort_relationships = True
+
+    local_server.load_dataframe(
+        {
+            "url": "people.csv",
+            "cql": "WITH $dict.rows AS rows UNWIND rows AS row MERGE (n:Person {name: row.name})",
+        },
+        dataframe=pd.DataFrame({"name": ["b", "a", "c"]}),
+    )
+
+    sent = [row["name"] for _, params in executed for row in params["dict"]["rows"]]
+    assert sent == ["b", "a", "c"]
+
+
+def test_local_server_sorts_relationship_dataframe(
+    local_server: LocalServer, executed: List[Tuple[str, Dict[str, Any]]]
+) -> None:
+    local_server.sort_relationships = True
+
+    local_server.load_dataframe(
+        {"url": "pets.csv", "cql": relationship_cql, "chunk_size": 2},
+        dataframe=pd.DataFrame(
+            {"name": ["b", "a", "b", "a"], "pet_name": ["p1", "p2", "p3", "p4"]}
+        ),
+    )
+
+    sent = [row["pet_name"] for _, params in executed for row in params["dict"]["rows"]]
+    assert sent == ["p2", "p4", "p1", "p3"]
@@ -0,0 +1,46 @@
+import tracemalloc
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from neo4j_runway.ingestion.pyingest import split_dataframe, to_rows_dict
+
+
+def test_split_dataframe_chunk_sizes() -> None:
+    dataframe = pd.DataFrame({"a": range(10)})
+
+    assert [len(c) for c in split_dataframe(dataframe, chunk_size=4)] == [4, 4, 2]
+    assert [len(c) for c in split_dataframe(dataframe.iloc[:0], chunk_size=4)] == []
+    assert pd.concat(split_dataframe(dataframe, chunk_size=3)).equals(dataframe)
+
+
+def test_split_dataframe_does_not_warn() -> None:
+    dataframe = pd.DataFrame({"a": range(10), "b": [str(i) for i in range(10)]})
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        list(split_dataframe(dataframe, chunk_size=3))
+
+
+def test_split_dataframe_peak_memory_is_one_chunk() -> None:
+    rows, chunk_size = 200_000, 1_000
+    dataframe = pd.DataFrame(
+        {
+            "a": np.arange(rows, dtype="int64"),
+            "b": np.arange(rows, dtype="float64"),
+            "c": np.arange(rows, dtype="int64") % 7,
+        }
+    )
+    frame_bytes = int(dataframe.memory_usage(deep=True).sum())
+
+    tracemalloc.start()
+    try:
+        for chunk in split_dataframe(dataframe, chunk_size=chunk_size):
+            to_rows_dict(chunk)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    # the whole frame is about 5 MB, converting a single chunk allocates well under 1 MB
+    assert peak < frame_bytes / 10